@@ -0,0 +1,39 @@
+#!/usr/bin/env python3
+"""
+TextForensics Data Preprocessing Script
+
+Tokenize the raw corpus once into memory-mapped shards under ``data.cache_dir``.
+
+Examples:
+    # Preprocess the default dataset
+    python scripts/data/preprocess.py
+
+    # Rebuild shards even if the cache is up to date
+    python scripts/data/preprocess.py +force=true
+"""
+
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+import hydra
+from omegaconf import DictConfig
+
+from textforensics.data import preprocess_corpus
+
+
+@hydra.main(version_base=None, config_path="../../conf", config_name="config")
+def preprocess(cfg: DictConfig) -> None:
+    """Main preprocessing function"""
+
+    print(f"📦 Preprocessing dataset: {cfg.data.name}")
+    cache_dir = preprocess_corpus(
+        cfg.data, seed=cfg.get("seed", 42), force=cfg.get("force", False)
+    )
+    print(f"✅ Token shards written to: {cache_dir}")
+
+
+if __name__ == "__main__":
+    preprocess()
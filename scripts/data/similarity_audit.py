@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+All-pairs style similarity audit over a document collection
+
+Embeds every document with a saved model (or reads precomputed embeddings
+from an ``.npy`` file) and computes each document's nearest neighbours and
+every pair above a similarity threshold, without building the full N x N
+matrix. Scores use the model's ``similarity_scoring`` metric and
+temperature. Results are written to the output directory and the most
+similar pairs are printed.
+
+Examples:
+    python scripts/data/similarity_audit.py --model outputs/model \\
+        --input submissions.jsonl --output audit/ --threshold 0.9
+
+    # Reuse embeddings computed earlier
+    python scripts/data/similarity_audit.py --embeddings audit/embeddings.npy \\
+        --output audit/ --k 20 --block-size 4096
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+import numpy as np
+
+from textforensics.index import SimilarityEngine
+from textforensics.pipelines.analysis import read_documents
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="All-pairs similarity audit")
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument("--input", type=str, help="JSONL or CSV documents")
+    source.add_argument("--embeddings", type=str, help="Precomputed .npy embeddings")
+    parser.add_argument("--model", type=str, default=None, help="Saved model dir")
+    parser.add_argument("--text-field", type=str, default="text")
+    parser.add_argument("--id-field", type=str, default=None)
+    parser.add_argument("--output", type=str, required=True, help="Output directory")
+    parser.add_argument("--k", type=int, default=10, help="Neighbours per document")
+    parser.add_argument("--threshold", type=float, default=None)
+    parser.add_argument("--metric", type=str, default="cosine")
+    parser.add_argument("--temperature", type=float, default=1.0)
+    parser.add_argument("--block-size", type=int, default=2048)
+    parser.add_argument("--num-workers", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--show", type=int, default=10, help="Top pairs to print")
+    args = parser.parse_args()
+
+    output = Path(args.output)
+    output.mkdir(parents=True, exist_ok=True)
+    engine_kwargs = {"block_size": args.block_size, "num_workers": args.num_workers}
+
+    if args.input:
+        if not args.model:
+            sys.exit("❌ --model is required with --input")
+        from textforensics.pipelines import InferencePipeline
+
+        documents = list(
+            read_documents(Path(args.input), args.text_field, args.id_field)
+        )
+        ids = [doc_id for doc_id, _ in documents]
+        pipeline = InferencePipeline.from_pretrained(
+            args.model, batch_size=args.batch_size
+        )
+        print(f"📊 Embedding {len(documents)} documents...")
+        start = time.perf_counter()
+        embeddings = pipeline.embed([text for _, text in documents]).float().numpy()
+        print(f"⏱️  Embedded in {time.perf_counter() - start:.1f}s")
+        np.save(output / "embeddings.npy", embeddings)
+        with open(output / "ids.json", "w") as f:
+            json.dump(ids, f)
+        engine = SimilarityEngine.from_config(pipeline.model.config, **engine_kwargs)
+    else:
+        embeddings = np.load(args.embeddings, mmap_mode="r")
+        ids_path = Path(args.embeddings).with_name("ids.json")
+        ids = json.loads(ids_path.read_text()) if ids_path.exists() else None
+        engine = SimilarityEngine(
+            metric=args.metric, temperature=args.temperature, **engine_kwargs
+        )
+
+    print(
+        f"🔍 All-pairs {engine.metric} similarity over {len(embeddings)} documents "
+        f"(block size {engine.block_size}, {engine.num_workers} workers)"
+    )
+    start = time.perf_counter()
+    result = engine.all_pairs(
+        embeddings, k=args.k, threshold=args.threshold, output=output
+    )
+    print(f"⏱️  Done in {time.perf_counter() - start:.1f}s")
+
+    if args.threshold is not None:
+        print(f"🚩 {len(result.pairs)} pairs with similarity >= {args.threshold}")
+        scores = np.asarray(result.pair_scores)
+        for row in np.argsort(-scores)[: args.show]:
+            i, j = result.pairs[row]
+            a, b = (ids[i], ids[j]) if ids else (i, j)
+            print(f"   {a} <-> {b}: {scores[row]:.4f}")
+    print(f"\n✅ Results saved to: {output}")
+
+
+if __name__ == "__main__":
+    main()
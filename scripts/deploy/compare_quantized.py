@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Compare dynamic int8 quantized inference against fp32
+
+Runs a saved model in fp32 and with int8 dynamic quantization over the
+held-out test split and reports task-head agreement, output drift, latency
+and model size. Exits non-zero if agreement falls below the given minimum.
+
+Examples:
+    python scripts/deploy/compare_quantized.py --model outputs/model \\
+        --limit 1000 --output quantization_report.json
+
+    # Gate a deployment on >= 99% classification agreement
+    python scripts/deploy/compare_quantized.py --model outputs/model \\
+        --min-agreement 0.99
+"""
+
+import argparse
+import json
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Sequence
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+import numpy as np
+import torch
+import torch.nn.functional as F
+from omegaconf import OmegaConf
+
+from textforensics.data import read_split
+from textforensics.pipelines import InferencePipeline
+from textforensics.serving import serialized_size_mb
+
+DATA_CONFIG = Path(__file__).parent.parent.parent / "conf/data/spooky_authors.yaml"
+
+
+def load_test_split(args: argparse.Namespace) -> Dict[str, Any]:
+    """Rebuild the held-out test split exactly as preprocessing does"""
+    texts, labels = read_split(
+        OmegaConf.load(args.data_config),
+        "test",
+        seed=args.seed,
+        data_path=args.data_path,
+    )
+    return {
+        "texts": texts[: args.limit],
+        "labels": torch.tensor(labels[: args.limit]),
+    }
+
+
+def time_predict(
+    predict: Callable[[Sequence[str]], Any], texts: List[str], repeats: int
+) -> Dict[str, float]:
+    """Wall-clock time of full passes over ``texts`` after one warmup pass"""
+    predict(texts[: max(1, len(texts) // 10)])
+    durations = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        predict(texts)
+        durations.append(time.perf_counter() - start)
+    mean_s = float(np.mean(durations))
+    return {
+        "mean_s": mean_s,
+        "ms_per_text": mean_s * 1000 / len(texts),
+        "texts_per_sec": len(texts) / mean_s,
+    }
+
+
+def compare_outputs(
+    reference: Dict[str, torch.Tensor],
+    quantized: Dict[str, torch.Tensor],
+    labels: torch.Tensor,
+) -> Dict[str, Dict[str, float]]:
+    """Per-output drift of the quantized model against fp32"""
+    report: Dict[str, Dict[str, float]] = {}
+    for name, ref in reference.items():
+        ref, quant = ref.float(), quantized[name].float()
+        diff = (quant - ref).abs()
+        entry = {
+            "max_abs_diff": float(diff.max()),
+            "mean_abs_diff": float(diff.mean()),
+        }
+
+        if name == "style_classification_output":
+            ref_pred, quant_pred = ref.argmax(-1), quant.argmax(-1)
+            entry["agreement"] = float((ref_pred == quant_pred).float().mean())
+            entry["fp32_accuracy"] = float((ref_pred == labels).float().mean())
+            entry["int8_accuracy"] = float((quant_pred == labels).float().mean())
+        elif name == "anomaly_detection_output":
+            entry["agreement"] = float(((ref > 0.5) == (quant > 0.5)).float().mean())
+        elif ref.dim() == 2 and ref.shape[-1] > 1:
+            cosine = F.cosine_similarity(ref, quant, dim=-1)
+            entry["min_cosine"] = float(cosine.min())
+            entry["mean_cosine"] = float(cosine.mean())
+
+        report[name] = entry
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Compare int8 quantized inference against fp32"
+    )
+    parser.add_argument("--model", type=str, required=True, help="Saved model dir")
+    parser.add_argument("--data-config", type=str, default=str(DATA_CONFIG))
+    parser.add_argument(
+        "--data-path", type=str, default=None, help="Override the data config path"
+    )
+    parser.add_argument("--seed", type=int, default=42, help="Split seed")
+    parser.add_argument("--limit", type=int, default=1000)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--threads", type=int, default=torch.get_num_threads())
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--min-agreement", type=float, default=None)
+    parser.add_argument("--output", type=str, default="quantization_report.json")
+    args = parser.parse_args()
+
+    torch.set_num_threads(args.threads)
+    data = load_test_split(args)
+    print(f"📊 Held-out texts: {len(data['texts'])}")
+
+    kwargs = {"batch_size": args.batch_size, "device": torch.device("cpu")}
+    fp32 = InferencePipeline.from_pretrained(args.model, **kwargs)
+    int8 = InferencePipeline.from_pretrained(args.model, quantize=True, **kwargs)
+
+    print("🔍 Comparing task-head outputs...")
+    outputs = compare_outputs(
+        fp32.predict(data["texts"]), int8.predict(data["texts"]), data["labels"]
+    )
+
+    print("⏱️  Timing inference...")
+    latency = {
+        "fp32": time_predict(fp32.predict, data["texts"], args.repeats),
+        "int8": time_predict(int8.predict, data["texts"], args.repeats),
+    }
+    size = {
+        "fp32_mb": serialized_size_mb(fp32.model),
+        "int8_mb": serialized_size_mb(int8.model),
+    }
+
+    for name, entry in outputs.items():
+        details = ", ".join(f"{k}={v:.4f}" for k, v in entry.items())
+        print(f"   {name}: {details}")
+    speedup = latency["fp32"]["mean_s"] / latency["int8"]["mean_s"]
+    print(
+        f"   latency: fp32 {latency['fp32']['ms_per_text']:.2f} ms/text, "
+        f"int8 {latency['int8']['ms_per_text']:.2f} ms/text ({speedup:.2f}x)"
+    )
+    print(f"   size: fp32 {size['fp32_mb']:.1f} MB, int8 {size['int8_mb']:.1f} MB")
+
+    report = {
+        "metadata": {
+            "timestamp": datetime.now().isoformat(),
+            "torch_version": torch.__version__,
+            "model": args.model,
+            "num_texts": len(data["texts"]),
+            "threads": args.threads,
+            "quantized_engine": torch.backends.quantized.engine,
+        },
+        "outputs": outputs,
+        "latency": latency,
+        "speedup": speedup,
+        "size": size,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✅ Report saved to: {args.output}")
+
+    if args.min_agreement is not None:
+        failing = [
+            name
+            for name, entry in outputs.items()
+            if entry.get("agreement", 1.0) < args.min_agreement
+        ]
+        if failing:
+            print(f"❌ Agreement below {args.min_agreement:.2%}: {failing}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Export a TextForensics model as a compiled inference artifact
+
+The ``export`` command writes a TorchScript (or torch.export) artifact with
+the selected task heads, the model config, the tokenizer and the warmup
+buckets. The ``benchmark`` command measures cold start (load + warmup +
+first request) and steady-state latency of the artifact against the eager
+model it was exported from.
+
+Examples:
+    python scripts/deploy/export_model.py export --model outputs/model \\
+        --output outputs/model_compiled --tasks style_classification
+
+    python scripts/deploy/export_model.py benchmark --model outputs/model \\
+        --artifact outputs/model_compiled --output export_benchmark.json
+"""
+
+import argparse
+import json
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+import numpy as np
+import torch
+
+from textforensics.models import OutputSpec, TextForensicsUnifiedModel
+from textforensics.serving import ExportedModel, export_model
+
+
+def parse_buckets(values: List[str]) -> List[Tuple[int, int]]:
+    """Parse ``BATCHxSEQ`` strings such as ``8x128``"""
+    buckets = []
+    for value in values:
+        batch_size, seq_len = value.lower().split("x")
+        buckets.append((int(batch_size), int(seq_len)))
+    return buckets
+
+
+def export(args: argparse.Namespace) -> None:
+    from transformers import AutoTokenizer
+
+    model = TextForensicsUnifiedModel.from_pretrained(args.model)
+    tokenizer = AutoTokenizer.from_pretrained(args.model)
+    print(f"📦 Exporting {args.model} as {args.format}")
+    path = export_model(
+        model,
+        args.output,
+        tasks=args.tasks,
+        tokenizer=tokenizer,
+        export_format=args.format,
+        warmup_buckets=parse_buckets(args.buckets) if args.buckets else None,
+    )
+    print(f"✅ Artifact saved to: {path}")
+
+
+def time_calls(fn: Callable[[], Any], repeats: int) -> Dict[str, float]:
+    latencies = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        latencies.append((time.perf_counter() - start) * 1000)
+    values = np.array(latencies)
+    return {
+        "mean": float(values.mean()),
+        "p50": float(np.percentile(values, 50)),
+        "p99": float(np.percentile(values, 99)),
+    }
+
+
+def benchmark(args: argparse.Namespace) -> None:
+    """Compare cold start and steady-state latency of eager vs compiled"""
+    with open(Path(args.artifact) / "export.json") as f:
+        metadata = json.load(f)
+    buckets = (
+        parse_buckets(args.buckets) if args.buckets else metadata["warmup_buckets"]
+    )
+    spec = OutputSpec(tasks=metadata["tasks"])
+    first_batch, first_seq = buckets[0]
+
+    def first_request(model: Any) -> None:
+        input_ids = torch.ones((first_batch, first_seq), dtype=torch.long)
+        with torch.inference_mode():
+            model(input_ids, torch.ones_like(input_ids), output_spec=spec)
+
+    # Cold start: everything a fresh process does before answering a request
+    start = time.perf_counter()
+    eager = TextForensicsUnifiedModel.from_pretrained(args.model).eval()
+    eager_load = time.perf_counter() - start
+    start = time.perf_counter()
+    first_request(eager)
+    eager_first = time.perf_counter() - start
+
+    compiled = ExportedModel.load(args.artifact, warmup_buckets=buckets)
+    start = time.perf_counter()
+    first_request(compiled)
+    compiled_first = time.perf_counter() - start
+
+    cold_start = {
+        "eager": {"load_s": eager_load, "first_request_s": eager_first},
+        "compiled": {**compiled.cold_start, "first_request_s": compiled_first},
+    }
+    print("🧊 Cold start (s):")
+    for name, entry in cold_start.items():
+        print(f"   {name:<9} " + ", ".join(f"{k}={v:.3f}" for k, v in entry.items()))
+
+    results = []
+    print(
+        f"\n📊 {'batch':>5} {'seq':>5} {'eager p50':>10} {'compiled p50':>13} {'speedup':>8}"
+    )
+    for batch_size, seq_len in buckets:
+        input_ids = torch.randint(1, eager.config.vocab_size, (batch_size, seq_len))
+        attention_mask = torch.ones_like(input_ids)
+        timings = {}
+        for name, model in (("eager", eager), ("compiled", compiled)):
+
+            def call(model: Any = model) -> None:
+                with torch.inference_mode():
+                    model(input_ids, attention_mask, output_spec=spec)
+
+            for _ in range(args.warmup):
+                call()
+            timings[name] = time_calls(call, args.repeats)
+
+        speedup = timings["eager"]["p50"] / timings["compiled"]["p50"]
+        results.append(
+            {
+                "batch_size": batch_size,
+                "seq_length": seq_len,
+                "latency_ms": timings,
+                "speedup": speedup,
+            }
+        )
+        print(
+            f"   {batch_size:>5} {seq_len:>5} {timings['eager']['p50']:>10.2f} "
+            f"{timings['compiled']['p50']:>13.2f} {speedup:>7.2f}x"
+        )
+
+    report = {
+        "metadata": {
+            "timestamp": datetime.now().isoformat(),
+            "torch_version": torch.__version__,
+            "threads": torch.get_num_threads(),
+            "artifact": metadata,
+        },
+        "cold_start": cold_start,
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✅ Results saved to: {args.output}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Export compiled inference artifacts")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    export_parser = subparsers.add_parser("export", help="Write an artifact")
+    export_parser.add_argument("--model", type=str, required=True)
+    export_parser.add_argument("--output", type=str, required=True)
+    export_parser.add_argument(
+        "--tasks", nargs="*", default=None, help="Task heads to keep (default: all)"
+    )
+    export_parser.add_argument(
+        "--format",
+        type=str,
+        default="torchscript",
+        choices=["torchscript", "torch_export"],
+    )
+    export_parser.add_argument(
+        "--buckets", nargs="+", default=None, help="Warmup shapes, e.g. 1x128 8x256"
+    )
+
+    bench_parser = subparsers.add_parser("benchmark", help="Compare with eager mode")
+    bench_parser.add_argument("--model", type=str, required=True)
+    bench_parser.add_argument("--artifact", type=str, required=True)
+    bench_parser.add_argument("--buckets", nargs="+", default=None)
+    bench_parser.add_argument("--warmup", type=int, default=3)
+    bench_parser.add_argument("--repeats", type=int, default=20)
+    bench_parser.add_argument("--output", type=str, default="export_benchmark.json")
+
+    args = parser.parse_args()
+    if args.command == "export":
+        export(args)
+    else:
+        benchmark(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,78 +1,265 @@
 #!/usr/bin/env python3
-"""Real-time GPU monitoring for TextForensics training"""
+"""Real-time training monitor for TextForensics
+
+Tails the per-step telemetry stream written by ``TrainingPipeline``
+(``<log_dir>/telemetry.jsonl``) and reports it next to host CPU and memory
+usage of the trainer and its dataloader workers. GPU stats are added when
+``nvidia-smi`` is available. The share of each step spent waiting on the
+dataloader tells whether the run is input-bound or compute-bound.
+"""
 
 import argparse
 import json
+import shutil
 import subprocess
 import time
+from collections import deque
 from datetime import datetime
+from pathlib import Path
+
+import psutil
+
+# Share of step time blocked on the dataloader above which a run is input-bound
+INPUT_BOUND_WAIT = 0.2
+
+
+def find_telemetry(root="outputs"):
+    """Most recently modified telemetry stream under ``root``"""
+    candidates = list(Path(root).glob("**/telemetry*.jsonl"))
+    if not candidates:
+        return None
+    return max(candidates, key=lambda p: p.stat().st_mtime)
+
+
+class TelemetryTail:
+    """Incremental reader of an append-only JSONL file"""
+
+    def __init__(self, path, from_start=False):
+        self.path = Path(path)
+        self.offset = 0
+        self.partial = ""
+        if not from_start and self.path.exists():
+            self.offset = self.path.stat().st_size
+
+    def read(self):
+        """Records appended since the last call"""
+        if not self.path.exists():
+            return []
+        size = self.path.stat().st_size
+        if size < self.offset:
+            # Truncated or replaced: start over
+            self.offset, self.partial = 0, ""
+        with open(self.path, encoding="utf-8") as f:
+            f.seek(self.offset)
+            chunk = f.read()
+            self.offset = f.tell()
+
+        lines = (self.partial + chunk).split("\n")
+        # The last element is an incomplete line (or empty)
+        self.partial = lines.pop()
+        records = []
+        for line in lines:
+            if line.strip():
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+        return records
 
 
 def get_gpu_stats():
-    """Get current GPU statistics"""
+    """Get current GPU statistics, or ``None`` without ``nvidia-smi``"""
+    if shutil.which("nvidia-smi") is None:
+        return None
     try:
         result = subprocess.run(
             [
                 "nvidia-smi",
-                "--query-gpu=name,temperature.gpu,utilization.gpu,memory.used,memory.total,power.draw",
+                "--query-gpu=utilization.gpu,memory.used,memory.total,temperature.gpu",
                 "--format=csv,noheader,nounits",
             ],
             capture_output=True,
             text=True,
         )
-
         if result.returncode == 0:
-            stats = result.stdout.strip().split(", ")
+            stats = result.stdout.strip().splitlines()[0].split(", ")
             return {
-                "name": stats[0],
-                "temperature": int(stats[1]),
-                "utilization": int(stats[2]),
-                "memory_used": int(stats[3]),
-                "memory_total": int(stats[4]),
-                "power_draw": float(stats[5]),
-                "timestamp": datetime.now().isoformat(),
+                "utilization": int(stats[0]),
+                "memory_used": int(stats[1]),
+                "memory_total": int(stats[2]),
+                "temperature": int(stats[3]),
             }
     except Exception as e:
         print(f"Error getting GPU stats: {e}")
     return None
 
 
-def monitor_training(interval=2, log_file=None):
-    """Monitor GPU usage during training"""
-    print("🖥️  GPU Monitoring for TextForensics")
+class TrainerProcess:
+    """CPU usage of the training process and its dataloader workers"""
+
+    def __init__(self, pid):
+        self.process = psutil.Process(pid)
+        self.children = {}
+        self.process.cpu_percent()
+
+    def cpu_percent(self):
+        """``(trainer, workers)`` CPU percent since the previous call"""
+        trainer = self.process.cpu_percent()
+        workers = 0.0
+        for child in self.process.children(recursive=True):
+            if child.pid not in self.children:
+                # First reading only primes the counter
+                self.children[child.pid] = child
+                child.cpu_percent()
+                continue
+            try:
+                workers += self.children[child.pid].cpu_percent()
+            except psutil.NoSuchProcess:
+                self.children.pop(child.pid, None)
+        return trainer, workers
+
+
+def attach(pid):
+    """Track ``pid`` if it is still running on this host"""
+    try:
+        return TrainerProcess(pid)
+    except psutil.Error:
+        return None
+
+
+def summarize(steps):
+    """Averages over the recent ``step`` records"""
+    step_time = sum(s["step_time"] for s in steps)
+    data_wait = sum(s["data_wait"] for s in steps)
+    losses = {}
+    for s in steps:
+        for name, value in s.get("losses", {}).items():
+            losses.setdefault(name, []).append(value)
+    last = steps[-1]
+    return {
+        "epoch": last["epoch"],
+        "step": last["step"],
+        "global_step": last["global_step"],
+        "step_time": step_time / len(steps),
+        "data_wait_ratio": data_wait / step_time if step_time > 0 else 0.0,
+        "samples_per_sec": sum(s["samples"] for s in steps) / step_time,
+        "tokens_per_sec": sum(s["tokens"] for s in steps) / step_time,
+        "loss": sum(s["loss"] for s in steps) / len(steps),
+        "losses": {k: sum(v) / len(v) for k, v in losses.items()},
+        "lr": last.get("lr"),
+        "rss_mb": last.get("rss_mb"),
+    }
+
+
+def monitor_training(
+    telemetry=None, interval=2, log_file=None, window=50, from_start=False
+):
+    """Monitor training throughput, host resources and GPU usage"""
+    print("🖥️  Training Monitor for TextForensics")
     print("=" * 60)
 
+    path = Path(telemetry) if telemetry else find_telemetry()
+    if path is None:
+        print("⚠️  No telemetry stream found under outputs/, pass --telemetry")
+        return
+    print(f"📄 Telemetry: {path}")
+
+    tail = TelemetryTail(path, from_start)
+    steps = deque(maxlen=window)
+    trainer = None
     stats_history = []
+    psutil.cpu_percent()
 
     try:
         while True:
-            stats = get_gpu_stats()
-            if stats:
-                # Display current stats
-                print(
-                    f"\r🌡️  {stats['temperature']}°C | "
-                    f"📊 GPU: {stats['utilization']}% | "
-                    f"💾 VRAM: {stats['memory_used']}/{stats['memory_total']}MB | "
-                    f"⚡ {stats['power_draw']}W",
-                    end="",
-                    flush=True,
+            for record in tail.read():
+                kind = record.get("type")
+                if kind == "step":
+                    steps.append(record)
+                    if trainer is None or trainer.process.pid != record["pid"]:
+                        trainer = attach(record["pid"])
+                elif kind == "start":
+                    steps.clear()
+                    trainer = attach(record["pid"])
+                    print(
+                        f"🚀 Run started: rank {record['rank']}/"
+                        f"{record['world_size']} on {record['device']}, "
+                        f"{record['num_workers']} dataloader workers"
+                    )
+                elif kind == "epoch":
+                    metrics = " ".join(
+                        f"{k}={v:.4f}"
+                        for k, v in record.items()
+                        if k.startswith(("train_", "val_")) and isinstance(v, float)
+                    )
+                    print(f"📈 Epoch {record['epoch'] + 1}: {metrics}")
+                elif kind == "end":
+                    steps.clear()
+                    trainer = None
+                    print(
+                        f"🏁 Run finished: best_val_loss={record['best_val_loss']:.4f}"
+                    )
+
+            memory = psutil.virtual_memory()
+            stats = {
+                "timestamp": datetime.now().isoformat(),
+                "host_cpu": psutil.cpu_percent(),
+                "host_memory": memory.percent,
+            }
+            if trainer is not None:
+                try:
+                    stats["trainer_cpu"], stats["worker_cpu"] = trainer.cpu_percent()
+                except psutil.NoSuchProcess:
+                    trainer = None
+
+            line = f"🧮 CPU {stats['host_cpu']:.0f}% | 💾 RAM {memory.percent:.0f}%"
+            if "trainer_cpu" in stats:
+                line += (
+                    f" | trainer {stats['trainer_cpu']:.0f}%"
+                    f" workers {stats['worker_cpu']:.0f}%"
+                )
+
+            gpu = get_gpu_stats()
+            if gpu:
+                stats["gpu"] = gpu
+                line += (
+                    f" | 📊 GPU {gpu['utilization']}%"
+                    f" VRAM {gpu['memory_used']}/{gpu['memory_total']}MB"
+                    f" {gpu['temperature']}°C"
                 )
 
-                # Log to file if specified
-                if log_file:
-                    stats_history.append(stats)
-                    if len(stats_history) % 30 == 0:  # Save every minute
-                        with open(log_file, "w") as f:
-                            json.dump(stats_history, f, indent=2)
+            if steps:
+                summary = summarize(list(steps))
+                stats["training"] = summary
+                bound = (
+                    "⏳ input-bound"
+                    if summary["data_wait_ratio"] > INPUT_BOUND_WAIT
+                    else "⚙️  compute-bound"
+                )
+                losses = " ".join(f"{k}={v:.4f}" for k, v in summary["losses"].items())
+                line = (
+                    f"[e{summary['epoch'] + 1} s{summary['step'] + 1}] "
+                    f"{summary['step_time'] * 1000:.0f}ms/step "
+                    f"(data {summary['data_wait_ratio']:.0%}) {bound} | "
+                    f"{summary['samples_per_sec']:.1f} samples/s "
+                    f"{summary['tokens_per_sec']:.0f} tok/s | "
+                    f"loss={summary['loss']:.4f} {losses} | "
+                    f"RSS {summary['rss_mb']:.0f}MB\n    " + line
+                )
+            print(line, flush=True)
 
-                # Alert on high temperature
-                if stats["temperature"] > 80:
-                    print(f"\n⚠️  High temperature: {stats['temperature']}°C")
+            # Log to file if specified
+            if log_file:
+                stats_history.append(stats)
+                if len(stats_history) % 30 == 0:
+                    with open(log_file, "w") as f:
+                        json.dump(stats_history, f, indent=2)
 
-                # Alert on high memory usage
-                memory_percent = (stats["memory_used"] / stats["memory_total"]) * 100
-                if memory_percent > 90:
-                    print(f"\n⚠️  High VRAM usage: {memory_percent:.1f}%")
+            # Alert on high host memory usage
+            if memory.percent > 90:
+                print(f"⚠️  High RAM usage: {memory.percent:.1f}%")
+            if gpu and gpu["memory_used"] / gpu["memory_total"] > 0.9:
+                print(f"⚠️  High VRAM usage: {gpu['memory_used']}MB")
 
             time.sleep(interval)
 
@@ -85,11 +272,26 @@ def monitor_training(interval=2, log_file=None):
 
 
 if __name__ == "__main__":
-    parser = argparse.ArgumentParser(description="Monitor GPU usage")
+    parser = argparse.ArgumentParser(description="Monitor a training run")
     parser.add_argument(
-        "--interval", type=int, default=2, help="Update interval in seconds"
+        "--telemetry",
+        type=str,
+        help="Telemetry stream (default: newest outputs/**/telemetry*.jsonl)",
+    )
+    parser.add_argument(
+        "--interval", type=float, default=2, help="Update interval in seconds"
     )
     parser.add_argument("--log", type=str, help="Log file path")
+    parser.add_argument(
+        "--window", type=int, default=50, help="Steps averaged per update"
+    )
+    parser.add_argument(
+        "--from-start",
+        action="store_true",
+        help="Replay the stream from the beginning instead of its end",
+    )
 
     args = parser.parse_args()
-    monitor_training(args.interval, args.log)
+    monitor_training(
+        args.telemetry, args.interval, args.log, args.window, args.from_start
+    )
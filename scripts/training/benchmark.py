@@ -0,0 +1,529 @@
+#!/usr/bin/env python3
+"""
+TextForensics benchmark suite
+
+Times the backbone, style encoder, each task head, end-to-end inference and
+a training step over a sweep of batch sizes, sequence lengths and thread
+counts. Runs on CPU by default; results are written as JSON and can be
+compared against a saved baseline.
+
+Examples:
+    # Full sweep with the base model config
+    python scripts/training/benchmark.py run --output bench.json
+
+    # Quick sweep with a reduced model
+    python scripts/training/benchmark.py run --layers 2 --batch-sizes 1 8 \\
+        --seq-lengths 64 128 --threads 1 4 --output bench.json
+
+    # Fail if any case got more than 10% slower than the baseline, or now
+    # needs more than 20% (and 16 MB) more memory
+    python scripts/training/benchmark.py compare baseline.json bench.json \\
+        --threshold 0.10 --memory-threshold 0.20
+
+    # Tokenization throughput and scaling over worker processes
+    python scripts/training/benchmark.py tokenize --input data/raw/spooky_authors \\
+        --workers 1 2 4 8
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+import numpy as np
+import psutil
+import torch
+import torch.nn as nn
+from omegaconf import OmegaConf
+
+from textforensics.models import (
+    OutputSpec,
+    TextForensicsConfig,
+    TextForensicsUnifiedModel,
+    scoring_tasks,
+)
+
+COMPONENTS = ["backbone", "style_encoder", "heads", "inference", "train_step"]
+MODEL_CONFIG = Path(__file__).parent.parent.parent / "conf/model/unified_base.yaml"
+
+
+def rss_mb() -> float:
+    """Current resident set size of this process"""
+    return psutil.Process().memory_info().rss / 2**20
+
+
+def sampled_peak_rss_mb(fn: Callable[[], Any], interval: float = 0.001) -> float:
+    """Highest RSS seen while ``fn`` runs, polled from a background thread"""
+    process = psutil.Process()
+    peak = process.memory_info().rss
+    done = threading.Event()
+
+    def poll() -> None:
+        nonlocal peak
+        while not done.wait(interval):
+            peak = max(peak, process.memory_info().rss)
+
+    sampler = threading.Thread(target=poll, daemon=True)
+    sampler.start()
+    try:
+        fn()
+    finally:
+        done.set()
+        sampler.join()
+    return max(peak, process.memory_info().rss) / 2**20
+
+
+def time_fn(
+    fn: Callable[[], Any], warmup: int, repeats: int, device: torch.device
+) -> List[float]:
+    """Return per-call latencies in milliseconds after ``warmup`` calls"""
+
+    def sync() -> None:
+        if device.type == "cuda":
+            torch.cuda.synchronize()
+
+    for _ in range(warmup):
+        fn()
+    sync()
+
+    latencies = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        sync()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+
+def summarize(
+    latencies: List[float],
+    batch_size: int,
+    seq_length: Optional[int],
+    rss_before_mb: float,
+    peak_rss: float,
+) -> Dict[str, Any]:
+    """
+    Latency percentiles, throughput and memory for one benchmark case.
+
+    ``rss_delta_mb`` is the case's own footprint: the peak RSS of one call
+    above the RSS measured before the case's first call (which, for
+    ``train_step``, allocates the optimizer state).
+    """
+    values = np.array(latencies)
+    mean_s = values.mean() / 1000
+    throughput = {"samples_per_sec": batch_size / mean_s}
+    if seq_length is not None:
+        throughput["tokens_per_sec"] = batch_size * seq_length / mean_s
+    return {
+        "latency_ms": {
+            "mean": float(values.mean()),
+            "p50": float(np.percentile(values, 50)),
+            "p90": float(np.percentile(values, 90)),
+            "p99": float(np.percentile(values, 99)),
+        },
+        "throughput": throughput,
+        "peak_rss_mb": peak_rss,
+        "rss_delta_mb": max(peak_rss - rss_before_mb, 0.0),
+    }
+
+
+def build_model(args: argparse.Namespace) -> TextForensicsUnifiedModel:
+    """Build the unified model from the base model config"""
+    overrides = {}
+    if args.layers is not None:
+        overrides["num_hidden_layers"] = args.layers
+    config = TextForensicsConfig.from_model_config(
+        OmegaConf.load(MODEL_CONFIG), **overrides
+    )
+    return TextForensicsUnifiedModel(config)
+
+
+def benchmark_cases(
+    model: TextForensicsUnifiedModel,
+    component: str,
+    batch_size: int,
+    seq_length: int,
+    device: torch.device,
+) -> Dict[str, Callable[[], Any]]:
+    """Callables to time for one component at one input shape"""
+    config = model.config
+    input_ids = torch.randint(0, config.vocab_size, (batch_size, seq_length))
+    input_ids = input_ids.to(device)
+    attention_mask = torch.ones_like(input_ids)
+
+    def no_grad(fn: Callable[[], Any]) -> Callable[[], Any]:
+        def wrapped() -> Any:
+            with torch.inference_mode():
+                return fn()
+
+        return wrapped
+
+    if component == "backbone":
+        return {"backbone": no_grad(lambda: model.backbone(input_ids, attention_mask))}
+
+    if component == "style_encoder":
+        pooled = torch.randn(batch_size, config.hidden_size, device=device)
+        return {"style_encoder": no_grad(lambda: model.style_encoder(pooled))}
+
+    if component == "heads":
+        style = torch.randn(batch_size, config.style_encoder_dim, device=device)
+        return {
+            f"head:{name}": no_grad(lambda head=head: head(style))
+            for name, head in model.task_heads.items()
+        }
+
+    if component == "inference":
+        # The heads InferencePipeline runs by default, without the decoder
+        spec = OutputSpec(tasks=scoring_tasks(model.task_heads))
+        return {
+            "inference": no_grad(
+                lambda: model(input_ids, attention_mask, output_spec=spec)
+            )
+        }
+
+    if component == "train_step":
+        optimizer = torch.optim.AdamW(model.parameters(), lr=1e-5)
+        loss_fn = nn.CrossEntropyLoss()
+        num_classes = config.task_heads["style_classification"]["num_classes"]
+        labels = torch.randint(0, num_classes, (batch_size,), device=device)
+        spec = OutputSpec(tasks=["style_classification"], style_embeddings=False)
+
+        def train_step() -> None:
+            model.train()
+            outputs = model(input_ids, attention_mask, output_spec=spec)
+            loss = loss_fn(outputs["style_classification_output"], labels)
+            optimizer.zero_grad(set_to_none=True)
+            loss.backward()
+            optimizer.step()
+            model.eval()
+
+        return {"train_step": train_step}
+
+    raise ValueError(f"Unknown component: {component}")
+
+
+def run(args: argparse.Namespace) -> None:
+    """Run the benchmark sweep and write results as JSON"""
+    device = torch.device(args.device)
+    torch.manual_seed(0)
+    model = build_model(args).to(device)
+    model.eval()
+
+    print(
+        f"🚀 Benchmarking on: {device} ({platform.processor() or platform.machine()})"
+    )
+    print(f"🧠 Model layers: {model.config.num_hidden_layers}")
+
+    results = []
+    header = (
+        f"{'case':<32} {'batch':>5} {'seq':>5} {'thr':>4} "
+        f"{'p50 ms':>9} {'p99 ms':>9} {'samples/s':>10} {'+MB':>7}"
+    )
+    print("\n📊 " + header)
+    print("-" * (len(header) + 3))
+
+    for threads in args.threads:
+        torch.set_num_threads(threads)
+        for component in args.components:
+            # Heads and the style encoder do not depend on sequence length
+            seq_lengths = (
+                [None] if component in ("heads", "style_encoder") else args.seq_lengths
+            )
+            for batch_size in args.batch_sizes:
+                for seq_length in seq_lengths:
+                    cases = benchmark_cases(
+                        model, component, batch_size, seq_length or 1, device
+                    )
+                    for name, fn in cases.items():
+                        # Release the previous case's tensors before the baseline
+                        gc.collect()
+                        rss_before = rss_mb()
+                        latencies = time_fn(fn, args.warmup, args.repeats, device)
+                        # One extra call under the sampler keeps timings clean
+                        peak_rss = sampled_peak_rss_mb(fn)
+                        summary = summarize(
+                            latencies, batch_size, seq_length, rss_before, peak_rss
+                        )
+                        results.append(
+                            {
+                                "case": name,
+                                "batch_size": batch_size,
+                                "seq_length": seq_length,
+                                "threads": threads,
+                                **summary,
+                            }
+                        )
+                        print(
+                            f"   {name:<32} {batch_size:>5} {seq_length or '-':>5} "
+                            f"{threads:>4} {summary['latency_ms']['p50']:>9.2f} "
+                            f"{summary['latency_ms']['p99']:>9.2f} "
+                            f"{summary['throughput']['samples_per_sec']:>10.1f} "
+                            f"{summary['rss_delta_mb']:>7.1f}"
+                        )
+                    del cases
+
+    report = {
+        "metadata": {
+            "timestamp": datetime.now().isoformat(),
+            "torch_version": torch.__version__,
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+            "device": str(device),
+            "warmup": args.warmup,
+            "repeats": args.repeats,
+            "model": model.config.to_dict(),
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2, default=str)
+    print(f"\n✅ Results saved to: {args.output}")
+
+
+def case_key(result: Dict[str, Any]) -> tuple:
+    return (
+        result["case"],
+        result["batch_size"],
+        result["seq_length"],
+        result["threads"],
+    )
+
+
+def compare(args: argparse.Namespace) -> int:
+    """Compare results against a baseline; return 1 on any regression"""
+    with open(args.baseline) as f:
+        baseline = {case_key(r): r for r in json.load(f)["results"]}
+    with open(args.current) as f:
+        current = {case_key(r): r for r in json.load(f)["results"]}
+
+    regressions = []
+    memory_regressions = []
+    print(
+        f"{'case':<32} {'batch':>5} {'seq':>5} {'thr':>4} {'base ms':>9} "
+        f"{'now ms':>9} {'change':>8} {'base MB':>8} {'now MB':>8}"
+    )
+    for key in sorted(set(baseline) & set(current), key=str):
+        before = baseline[key]["latency_ms"][args.metric]
+        after = current[key]["latency_ms"][args.metric]
+        change = after / before - 1.0
+        flag = "❌" if change > args.threshold else ""
+        if change > args.threshold:
+            regressions.append(key)
+
+        # Results written before per-case memory was recorded have no delta
+        memory = ""
+        rss_before = baseline[key].get("rss_delta_mb")
+        rss_after = current[key].get("rss_delta_mb")
+        if rss_before is not None and rss_after is not None:
+            memory = f" {rss_before:>8.1f} {rss_after:>8.1f}"
+            if (
+                args.memory_threshold is not None
+                and rss_after
+                > rss_before * (1 + args.memory_threshold) + args.memory_slack_mb
+            ):
+                memory_regressions.append(key)
+                flag = "❌"
+        print(
+            f"{key[0]:<32} {key[1]:>5} {key[2] or '-':>5} {key[3]:>4} "
+            f"{before:>9.2f} {after:>9.2f} {change:>+7.1%}{memory} {flag}"
+        )
+
+    missing = set(baseline) - set(current)
+    if missing:
+        print(f"\n⚠️  {len(missing)} baseline cases missing from current results")
+
+    if regressions:
+        print(
+            f"\n❌ {len(regressions)} cases regressed by more than "
+            f"{args.threshold:.0%} ({args.metric} latency)"
+        )
+    if memory_regressions:
+        print(
+            f"\n❌ {len(memory_regressions)} cases need more than "
+            f"{args.memory_threshold:.0%} + {args.memory_slack_mb:.0f} MB "
+            "more memory"
+        )
+    if regressions or memory_regressions:
+        return 1
+    print("\n✅ No regressions")
+    return 0
+
+
+def load_texts(args: argparse.Namespace) -> List[str]:
+    """Texts from ``--input`` (CSV/JSONL), or synthetic sentences"""
+    if args.input:
+        from textforensics.pipelines.analysis import read_documents
+
+        path = Path(args.input)
+        if path.is_dir():
+            path = path / "train.csv"
+        texts = [text for _, text in read_documents(path, args.text_field)]
+    else:
+        rng = np.random.default_rng(0)
+        words = (
+            "the night was dark and I could not tell whether the old house "
+            "they'd left behind wasn't watching us , said Mr. Poe ; it's late"
+        ).split()
+        lengths = rng.integers(10, 80, size=args.num_texts)
+        texts = [" ".join(rng.choice(words, size=n)) for n in lengths]
+    # Repeat small corpora so every worker count sees enough batches
+    while len(texts) < args.num_texts:
+        texts = texts + texts
+    return texts[: args.num_texts]
+
+
+def tokenize(args: argparse.Namespace) -> None:
+    """Measure normalization + tokenization throughput per worker count"""
+    from transformers import AutoTokenizer
+
+    from textforensics.data import BatchTokenizer, TextNormalizer
+
+    tokenizer = AutoTokenizer.from_pretrained(args.tokenizer)
+    normalizer = TextNormalizer(
+        lowercase=True, remove_special_chars=False, handle_contractions=True
+    )
+    texts = load_texts(args)
+    print(f"🚀 Tokenizing {len(texts)} texts with {args.tokenizer} ({normalizer})")
+
+    # In-process per-string calls, the baseline the batched stage replaces
+    sample = texts[: min(len(texts), 2000)]
+    start = time.perf_counter()
+    for text in sample:
+        tokenizer(normalizer(text), truncation=True, max_length=args.max_length)
+    per_string = len(sample) / (time.perf_counter() - start)
+    print(f"   per-string baseline: {per_string:>10.0f} texts/sec")
+
+    results = []
+    header = f"{'workers':>7} {'texts/s':>10} {'speedup':>8} {'efficiency':>10}"
+    print("\n📊 " + header)
+    print("-" * (len(header) + 3))
+    for workers in args.workers:
+        with BatchTokenizer(
+            tokenizer,
+            normalizer,
+            max_length=args.max_length,
+            batch_size=args.batch_size,
+            num_workers=workers,
+            min_parallel_texts=0,
+        ) as encoder:
+            if workers > 1:
+                # Start the pool and load the tokenizer in every worker first
+                encoder(texts[: workers * args.batch_size])
+                encoder.num_texts, encoder.seconds = 0, 0.0
+            for _ in encoder.iter_encoded(texts):
+                pass
+        rate = encoder.texts_per_sec
+        speedup = rate / results[0]["texts_per_sec"] if results else 1.0
+        base_workers = results[0]["workers"] if results else workers
+        efficiency = speedup * base_workers / workers
+        results.append(
+            {
+                "workers": workers,
+                "texts_per_sec": rate,
+                "speedup": speedup,
+                "efficiency": efficiency,
+            }
+        )
+        print(f"   {workers:>7} {rate:>10.0f} {speedup:>7.2f}x {efficiency:>10.0%}")
+
+    if args.output:
+        report = {
+            "metadata": {
+                "timestamp": datetime.now().isoformat(),
+                "platform": platform.platform(),
+                "cpu_count": os.cpu_count(),
+                "tokenizer": args.tokenizer,
+                "num_texts": len(texts),
+                "batch_size": args.batch_size,
+                "max_length": args.max_length,
+                "per_string_texts_per_sec": per_string,
+            },
+            "results": results,
+        }
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✅ Results saved to: {args.output}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="TextForensics benchmark suite")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Run benchmarks")
+    run_parser.add_argument("--output", type=str, default="benchmark.json")
+    run_parser.add_argument(
+        "--components", nargs="+", default=COMPONENTS, choices=COMPONENTS
+    )
+    run_parser.add_argument("--batch-sizes", nargs="+", type=int, default=[1, 8, 32])
+    run_parser.add_argument(
+        "--seq-lengths", nargs="+", type=int, default=[64, 128, 256, 512]
+    )
+    run_parser.add_argument(
+        "--threads", nargs="+", type=int, default=[torch.get_num_threads()]
+    )
+    run_parser.add_argument("--warmup", type=int, default=3)
+    run_parser.add_argument("--repeats", type=int, default=10)
+    run_parser.add_argument(
+        "--layers", type=int, default=None, help="Override num_hidden_layers"
+    )
+    run_parser.add_argument("--device", type=str, default="cpu")
+
+    compare_parser = subparsers.add_parser("compare", help="Compare to a baseline")
+    compare_parser.add_argument("baseline", type=str)
+    compare_parser.add_argument("current", type=str)
+    compare_parser.add_argument(
+        "--threshold", type=float, default=0.10, help="Allowed relative slowdown"
+    )
+    compare_parser.add_argument(
+        "--metric", type=str, default="p50", choices=["mean", "p50", "p90", "p99"]
+    )
+    compare_parser.add_argument(
+        "--memory-threshold",
+        type=float,
+        default=None,
+        help="Allowed relative growth of each case's RSS delta (default: unchecked)",
+    )
+    compare_parser.add_argument(
+        "--memory-slack-mb",
+        type=float,
+        default=16.0,
+        help="Absolute RSS growth always tolerated, for small noisy cases",
+    )
+
+    tokenize_parser = subparsers.add_parser(
+        "tokenize", help="Benchmark batched tokenization across processes"
+    )
+    tokenize_parser.add_argument("--tokenizer", type=str, default="bert-base-uncased")
+    tokenize_parser.add_argument(
+        "--input", type=str, default=None, help="CSV/JSONL corpus (default: synthetic)"
+    )
+    tokenize_parser.add_argument("--text-field", type=str, default="text")
+    tokenize_parser.add_argument("--num-texts", type=int, default=100000)
+    tokenize_parser.add_argument(
+        "--workers", nargs="+", type=int, default=[1, 2, 4, os.cpu_count() or 1]
+    )
+    tokenize_parser.add_argument("--batch-size", type=int, default=1000)
+    tokenize_parser.add_argument("--max-length", type=int, default=512)
+    tokenize_parser.add_argument("--output", type=str, default=None)
+
+    args = parser.parse_args()
+    if args.command == "run":
+        run(args)
+    elif args.command == "tokenize":
+        tokenize(args)
+    else:
+        sys.exit(compare(args))
+
+
+if __name__ == "__main__":
+    main()
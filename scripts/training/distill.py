@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+TextForensics Distillation Script
+
+Distill a trained model into a compact student with the Hydra config system.
+
+Examples:
+    # 4-layer student from a trained 12-layer teacher
+    python scripts/training/distill.py pipeline=distillation \
+        distillation.teacher_path=outputs/model
+
+    # Smaller hidden size, embedding-only distillation
+    python scripts/training/distill.py pipeline=distillation \
+        distillation.teacher_path=outputs/model \
+        +distillation.student.hidden_size=384 \
+        +distillation.student.intermediate_size=1536 \
+        distillation.init_from_teacher=false \
+        distillation.loss_weights.logits=0
+"""
+
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+import hydra
+from omegaconf import DictConfig, OmegaConf
+
+from textforensics.pipelines import DistillationPipeline, launch_distributed
+
+
+@hydra.main(version_base=None, config_path="../../conf", config_name="config")
+def distill(cfg: DictConfig) -> float:
+    """Main distillation function"""
+    if "distillation" not in cfg:
+        sys.exit("❌ Run with pipeline=distillation")
+
+    print("🚀 Starting TextForensics Distillation")
+    print("=" * 50)
+    print(OmegaConf.to_yaml(cfg))
+    print("=" * 50)
+
+    if OmegaConf.select(
+        cfg, "infrastructure.compute.compute.parallelism.distributed", default=False
+    ):
+        results = launch_distributed(cfg)
+    else:
+        results = DistillationPipeline(cfg).run()
+
+    print("✅ Distillation completed!")
+    print(f"Best validation loss: {results['best_val_loss']:.4f}")
+    if "speedup" in results:
+        print(f"Student speedup: {results['speedup']:.2f}x")
+        print(f"Accuracy retention: {results['accuracy_retention']:.1%}")
+        print(f"Embedding cosine to teacher: {results['embedding_cosine']:.3f}")
+        print(f"Student saved to: {results['student_path']}")
+
+    return results["best_val_loss"]
+
+
+if __name__ == "__main__":
+    distill()
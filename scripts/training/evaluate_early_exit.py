@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Evaluate confidence-based early exit for style classification
+
+Runs the held-out test split through the full model and through early-exit
+inference at a sweep of confidence thresholds, reporting accuracy,
+agreement with the full model, average encoder layers used and latency.
+The model must have been trained with ``model.early_exit.enabled=true``.
+
+Examples:
+    python scripts/training/evaluate_early_exit.py --model outputs/model \\
+        --thresholds 0.8 0.9 0.95 --output early_exit.json
+
+    # Fail if any threshold costs more than 1 point of accuracy
+    python scripts/training/evaluate_early_exit.py --model outputs/model \\
+        --max-accuracy-drop 0.01
+"""
+
+import argparse
+import json
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "src"))
+
+import torch
+from omegaconf import OmegaConf
+
+from textforensics.data import read_split
+from textforensics.pipelines import InferencePipeline
+
+DATA_CONFIG = Path(__file__).parent.parent.parent / "conf/data/spooky_authors.yaml"
+
+
+def timed(
+    fn: Callable[[], Dict[str, torch.Tensor]], repeats: int
+) -> Tuple[Dict[str, torch.Tensor], float]:
+    """Outputs of ``fn`` and its mean wall-clock time over ``repeats`` runs"""
+    durations = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        outputs = fn()
+        durations.append(time.perf_counter() - start)
+    return outputs, sum(durations) / len(durations)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Evaluate early-exit inference")
+    parser.add_argument("--model", type=str, required=True, help="Saved model dir")
+    parser.add_argument("--data-config", type=str, default=str(DATA_CONFIG))
+    parser.add_argument("--data-path", type=str, default=None)
+    parser.add_argument("--seed", type=int, default=42, help="Split seed")
+    parser.add_argument("--limit", type=int, default=1000)
+    parser.add_argument(
+        "--thresholds", nargs="+", type=float, default=[0.7, 0.8, 0.9, 0.95, 0.99]
+    )
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--max-accuracy-drop", type=float, default=None)
+    parser.add_argument("--output", type=str, default="early_exit.json")
+    args = parser.parse_args()
+
+    texts, labels = read_split(
+        OmegaConf.load(args.data_config),
+        "test",
+        seed=args.seed,
+        data_path=args.data_path,
+    )
+    texts, labels = texts[: args.limit], torch.tensor(labels[: args.limit])
+    pipeline = InferencePipeline.from_pretrained(
+        args.model, batch_size=args.batch_size, tasks=["style_classification"]
+    )
+    num_layers = pipeline.model.config.num_hidden_layers
+    if not pipeline.model.config.early_exit_layers:
+        sys.exit("❌ Model has no early-exit classifiers")
+    print(f"📊 Held-out texts: {len(texts)}")
+    print(f"🚪 Exit layers: {pipeline.model.config.early_exit_layers} of {num_layers}")
+
+    # Warm up allocator and kernels before timing anything
+    pipeline.predict(texts[: args.batch_size])
+
+    outputs, full_time = timed(lambda: pipeline.predict(texts), args.repeats)
+    full_pred = outputs["style_classification_output"].argmax(dim=-1)
+    full_accuracy = float((full_pred == labels).float().mean())
+
+    print(
+        f"\n{'threshold':>9} {'accuracy':>9} {'agree':>7} {'layers':>7} {'speedup':>8}"
+    )
+    print(
+        f"{'full':>9} {full_accuracy:>9.3f} {1.0:>7.3f} {num_layers:>7.2f} {1.0:>7.2f}x"
+    )
+    results: List[Dict[str, Any]] = []
+    for threshold in args.thresholds:
+        outputs, exit_time = timed(
+            lambda: pipeline.predict_early_exit(texts, threshold=threshold),
+            args.repeats,
+        )
+        pred = outputs["style_classification_output"].argmax(dim=-1)
+        exit_layers = outputs["exit_layers"]
+        layers, counts = exit_layers.unique(return_counts=True)
+        result = {
+            "threshold": threshold,
+            "accuracy": float((pred == labels).float().mean()),
+            "agreement": float((pred == full_pred).float().mean()),
+            "mean_layers": float(exit_layers.float().mean()),
+            "exit_distribution": {
+                int(layer): int(count) for layer, count in zip(layers, counts)
+            },
+            "latency_s": exit_time,
+            "speedup": full_time / exit_time,
+        }
+        results.append(result)
+        print(
+            f"{threshold:>9.2f} {result['accuracy']:>9.3f} "
+            f"{result['agreement']:>7.3f} {result['mean_layers']:>7.2f} "
+            f"{result['speedup']:>7.2f}x"
+        )
+
+    report = {
+        "metadata": {
+            "timestamp": datetime.now().isoformat(),
+            "torch_version": torch.__version__,
+            "model": args.model,
+            "num_texts": len(texts),
+            "num_hidden_layers": num_layers,
+            "early_exit_layers": pipeline.model.config.early_exit_layers,
+        },
+        "full": {"accuracy": full_accuracy, "latency_s": full_time},
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✅ Results saved to: {args.output}")
+
+    if args.max_accuracy_drop is not None:
+        failing = [
+            r["threshold"]
+            for r in results
+            if full_accuracy - r["accuracy"] > args.max_accuracy_drop
+        ]
+        if failing:
+            print(f"❌ Accuracy drop above {args.max_accuracy_drop:.1%} at {failing}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
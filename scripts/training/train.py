@@ -16,6 +16,10 @@ Examples:
 
     # Quick test
     python scripts/train.py +experiment=quick_test
+
+    # Data-parallel training in 4 CPU processes
+    python scripts/train.py infrastructure.compute.compute.parallelism.distributed=true \
+        infrastructure.compute.compute.parallelism.num_processes=4
 """
 
 import sys
@@ -27,7 +31,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
 import hydra
 from omegaconf import DictConfig, OmegaConf
 
-from textforensics.pipelines import TrainingPipeline
+from textforensics.pipelines import TrainingPipeline, launch_distributed
 
 
 @hydra.main(version_base=None, config_path="../conf", config_name="config")
@@ -42,8 +46,13 @@ def train(cfg: DictConfig) -> float:
     print("=" * 50)
 
     # Initialize and run training pipeline
-    pipeline = TrainingPipeline(cfg)
-    results = pipeline.run()
+    if OmegaConf.select(
+        cfg, "infrastructure.compute.compute.parallelism.distributed", default=False
+    ):
+        results = launch_distributed(cfg)
+    else:
+        pipeline = TrainingPipeline(cfg)
+        results = pipeline.run()
 
     # Print results
     print("✅ Training completed!")
@@ -3,30 +3,58 @@ TextForensics: Neural Text Forensics Platform
 
 A comprehensive platform for text forensics, including style analysis,
 plagiarism detection, and style transfer using unified neural architectures.
+
+Public names are resolved lazily, so ``import textforensics`` stays cheap
+until a model, pipeline or utility is actually used.
 """
 
+from typing import TYPE_CHECKING
+
+from ._lazy import attach
+
 __version__ = "0.1.0"
 
-# Core model imports (only import what actually exists)
-from .models import (
-    BaseTextForensicsModel,
-    TextForensicsConfig,
-    TextForensicsUnifiedModel,
-)
+if TYPE_CHECKING:
+    # Core models
+    from .models import (
+        BaseTextForensicsModel,
+        OutputSpec,
+        TextForensicsConfig,
+        TextForensicsUnifiedModel,
+    )
+
+    # Pipelines
+    from .pipelines import InferencePipeline, TrainingPipeline
 
-# Pipeline imports (only import what actually exists)
-from .pipelines import TrainingPipeline
+    # Utilities
+    from .utils import load_checkpoint, save_checkpoint, setup_logging
+
+_ATTRIBUTES = {
+    # Models
+    "TextForensicsUnifiedModel": ".models",
+    "TextForensicsConfig": ".models",
+    "BaseTextForensicsModel": ".models",
+    "OutputSpec": ".models",
+    # Pipelines
+    "TrainingPipeline": ".pipelines",
+    "InferencePipeline": ".pipelines",
+    # Utils
+    "setup_logging": ".utils",
+    "save_checkpoint": ".utils",
+    "load_checkpoint": ".utils",
+}
 
-# Utility imports (explicit imports instead of wildcard)
-from .utils import load_checkpoint, save_checkpoint, setup_logging
+__getattr__, __dir__ = attach(__name__, _ATTRIBUTES)
 
 __all__ = [
     # Models
     "TextForensicsUnifiedModel",
     "TextForensicsConfig",
     "BaseTextForensicsModel",
+    "OutputSpec",
     # Pipelines
     "TrainingPipeline",
+    "InferencePipeline",
     # Utils
     "setup_logging",
     "save_checkpoint",
@@ -0,0 +1,29 @@
+"""Lazy attribute resolution for package ``__init__`` modules"""
+
+import importlib
+from typing import Any, Callable, Dict, List, Tuple
+
+
+def attach(
+    package: str, attributes: Dict[str, str]
+) -> Tuple[Callable[[str], Any], Callable[[], List[str]]]:
+    """
+    Build module-level ``__getattr__`` and ``__dir__`` for ``package``.
+
+    ``attributes`` maps each public name to the submodule (relative to
+    ``package``) that defines it. The submodule is imported on first access
+    and the value is cached in the package namespace, so importing the
+    package itself does not pull in torch, transformers or numpy.
+    """
+
+    def __getattr__(name: str) -> Any:
+        if name not in attributes:
+            raise AttributeError(f"module {package!r} has no attribute {name!r}")
+        value = getattr(importlib.import_module(attributes[name], package), name)
+        setattr(importlib.import_module(package), name, value)
+        return value
+
+    def __dir__() -> List[str]:
+        return sorted(set(attributes) | set(vars(importlib.import_module(package))))
+
+    return __getattr__, __dir__
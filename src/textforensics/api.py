@@ -1,13 +1,214 @@
-from fastapi import FastAPI
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Dict, List, Optional
 
-app = FastAPI(title="TextForensics API")
+from fastapi import FastAPI, HTTPException, Request, Response
+from pydantic import BaseModel
+
+if TYPE_CHECKING:
+    import torch
+
+    from .index import EmbeddingCache
+    from .pipelines import InferencePipeline
+    from .serving.metrics import MetricsRegistry
+
+# torch and the model stack are imported when a model is loaded, so the
+# server answers /health without paying their import time
+
+# Serving settings
+MODEL_PATH = os.environ.get("TEXTFORENSICS_MODEL_PATH")
+MAX_BATCH_SIZE = int(os.environ.get("TEXTFORENSICS_MAX_BATCH_SIZE", "32"))
+MAX_WAIT_MS = float(os.environ.get("TEXTFORENSICS_MAX_WAIT_MS", "5"))
+QUANTIZE = os.environ.get("TEXTFORENSICS_QUANTIZE", "0").lower() in ("1", "true")
+# Request-path metrics on /metrics; module profiling adds per-module hooks
+METRICS = os.environ.get("TEXTFORENSICS_METRICS", "0").lower() in ("1", "true")
+PROFILE_MODULES = os.environ.get("TEXTFORENSICS_PROFILE_MODULES", "0").lower() in (
+    "1",
+    "true",
+)
+# Style embeddings of recently seen texts (0 disables), optionally kept on disk
+EMBEDDING_CACHE_SIZE = int(
+    os.environ.get("TEXTFORENSICS_EMBEDDING_CACHE_SIZE", "10000")
+)
+EMBEDDING_CACHE_DIR = os.environ.get("TEXTFORENSICS_EMBEDDING_CACHE_DIR")
+
+
+class TextRequest(BaseModel):
+    text: str
+
+
+class SimilarityRequest(BaseModel):
+    text_a: str
+    text_b: str
+
+
+def _build_scorer(
+    pipeline: "InferencePipeline", registry: Optional["MetricsRegistry"] = None
+) -> Callable[[List[str]], List[Dict[str, "torch.Tensor"]]]:
+    """Wrap the inference pipeline as a batch function returning per-text rows"""
+    batch_sizes = None
+    if registry is not None:
+        from .serving.metrics import SIZE_BUCKETS
+
+        batch_sizes = registry.histogram(
+            "textforensics_microbatch_size", "Requests per micro-batch", SIZE_BUCKETS
+        )
+
+    def score(texts: List[str]) -> List[Dict[str, "torch.Tensor"]]:
+        if batch_sizes is not None:
+            batch_sizes.observe(len(texts))
+        outputs = pipeline.predict(texts)
+        return [{k: v[i] for k, v in outputs.items()} for i in range(len(texts))]
+
+    return score
+
+
+def _build_embedding_cache(pipeline: "InferencePipeline") -> "EmbeddingCache":
+    """Cache keyed by the served weights and the tokenization settings"""
+    from .index import EmbeddingCache, model_fingerprint
+
+    fingerprint = model_fingerprint(
+        pipeline.model,
+        tokenizer=getattr(pipeline.tokenizer, "name_or_path", None),
+        max_length=pipeline.max_length,
+    )
+    return EmbeddingCache(
+        pipeline.model.config.style_encoder_dim,
+        fingerprint=fingerprint,
+        capacity=EMBEDDING_CACHE_SIZE,
+        path=EMBEDDING_CACHE_DIR,
+    )
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    app.state.batcher = None
+    app.state.metrics = None
+    if METRICS:
+        from .serving.metrics import MetricsRegistry
+
+        app.state.metrics = MetricsRegistry()
+    if MODEL_PATH:
+        from .pipelines import InferencePipeline
+        from .serving import MicroBatcher, is_exported
+
+        if is_exported(MODEL_PATH):
+            pipeline = InferencePipeline.from_exported(
+                MODEL_PATH, batch_size=MAX_BATCH_SIZE
+            )
+        else:
+            pipeline = InferencePipeline.from_pretrained(
+                MODEL_PATH, quantize=QUANTIZE, batch_size=MAX_BATCH_SIZE
+            )
+            # Repeated texts (e.g. both sides of /similarity) skip the backbone
+            if EMBEDDING_CACHE_SIZE > 0:
+                pipeline.embedding_cache = _build_embedding_cache(pipeline)
+        if app.state.metrics is not None:
+            from .serving.metrics import InferenceMetrics, ModuleProfiler
+
+            pipeline.metrics = InferenceMetrics(app.state.metrics)
+            if PROFILE_MODULES:
+                ModuleProfiler(pipeline.model, app.state.metrics).enable()
+        app.state.batcher = MicroBatcher(
+            _build_scorer(pipeline, app.state.metrics),
+            max_batch_size=MAX_BATCH_SIZE,
+            max_wait_ms=MAX_WAIT_MS,
+        )
+        await app.state.batcher.start()
+
+    yield
+
+    if app.state.batcher is not None:
+        await app.state.batcher.stop()
+
+
+app = FastAPI(title="TextForensics API", lifespan=lifespan)
+
+if METRICS:
+
+    @app.middleware("http")
+    async def record_request_latency(request: Request, call_next: Any) -> Response:
+        start = time.perf_counter()
+        response: Response = await call_next(request)
+        registry = getattr(request.app.state, "metrics", None)
+        if registry is not None:
+            # Route templates keep label cardinality bounded
+            route = request.scope.get("route")
+            endpoint = getattr(route, "path", "unmatched")
+            registry.histogram(
+                "textforensics_request_latency_seconds", "HTTP request latency"
+            ).observe(
+                time.perf_counter() - start,
+                endpoint=endpoint,
+                status=str(response.status_code),
+            )
+        return response
+
+
+async def _score(text: str) -> Dict[str, "torch.Tensor"]:
+    batcher = getattr(app.state, "batcher", None)
+    if batcher is None:
+        raise HTTPException(status_code=503, detail="No model loaded")
+    result: Dict[str, "torch.Tensor"] = await batcher.submit(text)
+    return result
+
+
+def _require(outputs: Dict[str, "torch.Tensor"], task: str) -> "torch.Tensor":
+    key = f"{task}_output"
+    if key not in outputs:
+        raise HTTPException(status_code=404, detail=f"Task not enabled: {task}")
+    return outputs[key]
 
 
 @app.get("/")
-def root():
+def root() -> Dict[str, str]:
     return {"message": "TextForensics API"}
 
 
 @app.get("/health")
-def health():
+def health() -> Dict[str, str]:
     return {"status": "healthy"}
+
+
+@app.get("/metrics")
+def metrics() -> Response:
+    registry = getattr(app.state, "metrics", None)
+    if registry is None:
+        raise HTTPException(status_code=404, detail="Metrics are disabled")
+    return Response(
+        registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
+
+
+@app.post("/classify")
+async def classify(request: TextRequest) -> Dict[str, Any]:
+    import torch
+
+    logits = _require(await _score(request.text), "style_classification")
+    probabilities = torch.softmax(logits.float(), dim=-1)
+    return {
+        "label": int(probabilities.argmax()),
+        "probabilities": probabilities.tolist(),
+    }
+
+
+@app.post("/anomaly")
+async def anomaly(request: TextRequest) -> Dict[str, Any]:
+    score = _require(await _score(request.text), "anomaly_detection")
+    return {"score": float(score.squeeze())}
+
+
+@app.post("/similarity")
+async def similarity(request: SimilarityRequest) -> Dict[str, Any]:
+    import torch.nn.functional as F
+
+    # Both texts join the shared queue together, so they share a batch
+    outputs_a, outputs_b = await asyncio.gather(
+        _score(request.text_a), _score(request.text_b)
+    )
+    embedding_a = _require(outputs_a, "similarity_scoring")
+    embedding_b = _require(outputs_b, "similarity_scoring")
+    score = F.cosine_similarity(embedding_a.float(), embedding_b.float(), dim=-1)
+    return {"similarity": float(score)}
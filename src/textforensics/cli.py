@@ -27,6 +27,49 @@ def main() -> None:
     eval_parser = subparsers.add_parser("evaluate", help="Evaluate models")
     eval_parser.add_argument("--model-path", type=str, required=True, help="Model path")
 
+    # Analyze command
+    analyze_parser = subparsers.add_parser(
+        "analyze", help="Score JSONL/CSV document dumps offline"
+    )
+    analyze_parser.add_argument("inputs", nargs="+", help="JSONL or CSV files")
+    analyze_parser.add_argument("--model-path", type=str, required=True)
+    analyze_parser.add_argument("--output", type=str, required=True, help="JSONL")
+    analyze_parser.add_argument("--workers", type=int, default=1)
+    analyze_parser.add_argument("--threads-per-worker", type=int, default=None)
+    analyze_parser.add_argument("--batch-size", type=int, default=32)
+    analyze_parser.add_argument("--chunk-size", type=int, default=256)
+    analyze_parser.add_argument(
+        "--tasks",
+        nargs="*",
+        default=None,
+        help="Task heads to run (default: all except style_transfer)",
+    )
+    analyze_parser.add_argument("--text-field", type=str, default="text")
+    analyze_parser.add_argument("--id-field", type=str, default=None)
+    analyze_parser.add_argument("--embeddings", action="store_true")
+    analyze_parser.add_argument("--quantize", action="store_true")
+    analyze_parser.add_argument(
+        "--no-resume", action="store_true", help="Start over instead of resuming"
+    )
+
+    # Plagiarism command
+    plagiarism_parser = subparsers.add_parser(
+        "plagiarism", help="Find near-duplicate documents (MinHash LSH + model)"
+    )
+    plagiarism_parser.add_argument("inputs", nargs="+", help="JSONL or CSV files")
+    plagiarism_parser.add_argument("--model-path", type=str, required=True)
+    plagiarism_parser.add_argument("--output", type=str, required=True, help="JSONL")
+    plagiarism_parser.add_argument(
+        "--threshold", type=float, default=0.5, help="LSH Jaccard threshold"
+    )
+    plagiarism_parser.add_argument("--min-jaccard", type=float, default=None)
+    plagiarism_parser.add_argument("--num-perm", type=int, default=128)
+    plagiarism_parser.add_argument("--shingle-size", type=int, default=5)
+    plagiarism_parser.add_argument("--char-level", action="store_true")
+    plagiarism_parser.add_argument("--batch-size", type=int, default=32)
+    plagiarism_parser.add_argument("--text-field", type=str, default="text")
+    plagiarism_parser.add_argument("--id-field", type=str, default=None)
+
     # API command
     api_parser = subparsers.add_parser("api", help="Start API server")
     api_parser.add_argument("--port", type=int, default=8000, help="Port number")
@@ -41,6 +84,72 @@ def main() -> None:
         print(f"🔍 Evaluating model: {args.model_path}")
         # Would call evaluation pipeline
 
+    elif args.command == "analyze":
+        print(f"🔍 Analyzing {len(args.inputs)} files with {args.workers} workers")
+        from textforensics.pipelines.analysis import BulkAnalyzer
+
+        analyzer = BulkAnalyzer(
+            args.model_path,
+            num_workers=args.workers,
+            threads_per_worker=args.threads_per_worker,
+            batch_size=args.batch_size,
+            chunk_size=args.chunk_size,
+            tasks=args.tasks,
+            quantize=args.quantize,
+            include_embeddings=args.embeddings,
+            text_field=args.text_field,
+            id_field=args.id_field,
+        )
+        results = analyzer.run(
+            [Path(p) for p in args.inputs],
+            Path(args.output),
+            resume=not args.no_resume,
+        )
+        print(
+            f"✅ {results['documents']} documents analyzed "
+            f"({results['docs_per_sec']:.1f} docs/sec): {results['output']}"
+        )
+
+    elif args.command == "plagiarism":
+        import json
+
+        from textforensics.pipelines import InferencePipeline, PlagiarismDetector
+        from textforensics.pipelines.analysis import read_documents
+
+        documents = [
+            document
+            for path in args.inputs
+            for document in read_documents(Path(path), args.text_field, args.id_field)
+        ]
+        print(f"🔍 Checking {len(documents)} documents for near-duplicates")
+        detector = PlagiarismDetector(
+            InferencePipeline.from_pretrained(
+                args.model_path, batch_size=args.batch_size
+            ),
+            threshold=args.threshold,
+            min_jaccard=args.min_jaccard,
+            num_perm=args.num_perm,
+            shingle_size=args.shingle_size,
+            char_level=args.char_level,
+        )
+        results = detector.detect([text for _, text in documents])
+        with open(args.output, "w") as f:
+            for (i, j), jaccard, similarity in zip(
+                results["pairs"], results["jaccard"], results["similarity"]
+            ):
+                record = {
+                    "id_a": documents[i][0],
+                    "id_b": documents[j][0],
+                    "jaccard": round(float(jaccard), 4),
+                    "similarity": round(float(similarity), 4),
+                }
+                f.write(json.dumps(record) + "\n")
+        stats = results["stats"]
+        print(
+            f"✅ {stats['candidate_pairs']} candidate pairs of {stats['total_pairs']} "
+            f"({stats['documents_embedded']} documents embedded): {args.output}"
+        )
+
     elif args.command == "api":
         print(f"🌐 Starting API server on port {args.port}")
         import uvicorn
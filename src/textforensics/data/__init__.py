@@ -1 +1,49 @@
-# Data handling utilities
+"""TextForensics Data Package"""
+
+from typing import TYPE_CHECKING
+
+from .._lazy import attach
+
+if TYPE_CHECKING:
+    from .collate import PaddingCollator
+    from .preprocessing import (
+        preprocess_corpus,
+        read_labeled_csv,
+        read_split,
+        split_indices,
+    )
+    from .sampling import LengthBucketBatchSampler, MultiTaskBatchSampler
+    from .shards import TaskDataset, TokenShardDataset, write_token_shards
+    from .tokenization import BatchTokenizer, TextNormalizer
+
+_ATTRIBUTES = {
+    "BatchTokenizer": ".tokenization",
+    "LengthBucketBatchSampler": ".sampling",
+    "MultiTaskBatchSampler": ".sampling",
+    "PaddingCollator": ".collate",
+    "TaskDataset": ".shards",
+    "TextNormalizer": ".tokenization",
+    "TokenShardDataset": ".shards",
+    "preprocess_corpus": ".preprocessing",
+    "read_labeled_csv": ".preprocessing",
+    "read_split": ".preprocessing",
+    "split_indices": ".preprocessing",
+    "write_token_shards": ".shards",
+}
+
+__getattr__, __dir__ = attach(__name__, _ATTRIBUTES)
+
+__all__ = [
+    "BatchTokenizer",
+    "LengthBucketBatchSampler",
+    "MultiTaskBatchSampler",
+    "PaddingCollator",
+    "TaskDataset",
+    "TextNormalizer",
+    "TokenShardDataset",
+    "preprocess_corpus",
+    "read_labeled_csv",
+    "read_split",
+    "split_indices",
+    "write_token_shards",
+]
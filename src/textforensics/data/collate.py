@@ -0,0 +1,74 @@
+"""Batch collation for TextForensics data loaders"""
+
+from typing import Dict, List, Optional, Tuple
+
+import torch
+
+
+class PaddingCollator:
+    """
+    Pad variable-length examples into ``input_ids``/``attention_mask`` batches.
+
+    By default batches are padded dynamically to their longest example
+    (rounded up to ``pad_to_multiple_of``); ``pad_to`` forces a fixed width.
+    The second text of a pair (``pair_input_ids``, with its own
+    ``pair_attention_mask``) and decoder sequences (``decoder_input_ids``,
+    and ``decoder_labels`` padded with ``-100``) are padded the same way.
+    Any other per-example tensors, such as ``labels``, are stacked.
+    """
+
+    # Variable-length keys besides ``input_ids``; ``None`` pads with the pad id
+    SEQUENCE_KEYS: Dict[str, Optional[int]] = {
+        "pair_input_ids": None,
+        "decoder_input_ids": None,
+        "decoder_labels": -100,
+    }
+
+    def __init__(
+        self,
+        pad_token_id: int = 0,
+        pad_to: Optional[int] = None,
+        pad_to_multiple_of: Optional[int] = None,
+    ) -> None:
+        self.pad_token_id = pad_token_id
+        self.pad_to = pad_to
+        self.pad_to_multiple_of = pad_to_multiple_of
+
+    def _pad(
+        self, sequences: List[torch.Tensor], value: int
+    ) -> Tuple[torch.Tensor, torch.Tensor]:
+        """Padded ``(values, mask)`` of one variable-length key"""
+        lengths = [len(sequence) for sequence in sequences]
+        width = self.pad_to or max(lengths)
+        if self.pad_to is None and self.pad_to_multiple_of:
+            width = -(-width // self.pad_to_multiple_of) * self.pad_to_multiple_of
+
+        values = torch.full((len(sequences), width), value, dtype=torch.long)
+        mask = torch.zeros((len(sequences), width), dtype=torch.long)
+        for row, (sequence, length) in enumerate(zip(sequences, lengths)):
+            length = min(length, width)
+            values[row, :length] = sequence[:length]
+            mask[row, :length] = 1
+        return values, mask
+
+    def __call__(
+        self, examples: List[Dict[str, torch.Tensor]]
+    ) -> Dict[str, torch.Tensor]:
+        input_ids, attention_mask = self._pad(
+            [example["input_ids"] for example in examples], self.pad_token_id
+        )
+        batch = {"input_ids": input_ids, "attention_mask": attention_mask}
+        for key in examples[0]:
+            if key == "input_ids":
+                continue
+            values = [example[key] for example in examples]
+            if key in self.SEQUENCE_KEYS:
+                pad_value = self.SEQUENCE_KEYS[key]
+                batch[key], mask = self._pad(
+                    values, self.pad_token_id if pad_value is None else pad_value
+                )
+                if key == "pair_input_ids":
+                    batch["pair_attention_mask"] = mask
+            else:
+                batch[key] = torch.stack(values)
+        return batch
@@ -0,0 +1,186 @@
+"""Offline corpus preprocessing for TextForensics"""
+
+import csv
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any, Dict, List, Sequence, Tuple, Union
+
+import numpy as np
+from omegaconf import DictConfig, OmegaConf
+
+from .shards import read_manifest, write_token_shards
+from .tokenization import BatchTokenizer, TextNormalizer
+
+logger = logging.getLogger("textforensics")
+
+SPLITS = ("train", "validation", "test")
+
+# Launch directory handed to processes that run without Hydra's context
+LAUNCH_DIR_ENV = "TEXTFORENSICS_LAUNCH_DIR"
+
+
+def launch_dir() -> Path:
+    """Directory the run was started from, before Hydra's chdir"""
+    try:
+        from hydra.core.hydra_config import HydraConfig
+        from hydra.utils import get_original_cwd
+
+        if HydraConfig.initialized():
+            return Path(get_original_cwd())
+    except ImportError:
+        pass
+    return Path(os.environ.get(LAUNCH_DIR_ENV) or os.getcwd())
+
+
+def resolve_path(path: Union[str, Path]) -> Path:
+    """Resolve a config path against the launch directory under Hydra's chdir"""
+    path = Path(path)
+    return path if path.is_absolute() else launch_dir() / path
+
+
+def read_labeled_csv(
+    path: Union[str, Path],
+    label_names: Sequence[str],
+    text_column: str = "text",
+    label_column: str = "author",
+) -> Tuple[List[str], List[int]]:
+    """Read a labeled CSV corpus such as the Spooky Authors ``train.csv``"""
+    path = Path(path)
+    if path.is_dir():
+        path = path / "train.csv"
+
+    label_ids = {name: i for i, name in enumerate(label_names)}
+    texts: List[str] = []
+    labels: List[int] = []
+    with open(path, newline="", encoding="utf-8") as f:
+        for row in csv.DictReader(f):
+            texts.append(row[text_column])
+            labels.append(label_ids[row[label_column]])
+    return texts, labels
+
+
+def split_indices(
+    labels: Sequence[int],
+    fractions: Dict[str, float],
+    stratify: bool = True,
+    seed: int = 42,
+) -> Dict[str, np.ndarray]:
+    """Shuffle example indices into splits, optionally per label"""
+    rng = np.random.default_rng(seed)
+    labels_array = np.asarray(labels)
+    groups = (
+        [np.flatnonzero(labels_array == label) for label in np.unique(labels_array)]
+        if stratify
+        else [np.arange(len(labels_array))]
+    )
+
+    splits: Dict[str, List[np.ndarray]] = {name: [] for name in fractions}
+    for group in groups:
+        group = rng.permutation(group)
+        start = 0
+        for name, fraction in fractions.items():
+            end = start + int(round(fraction * len(group)))
+            splits[name].append(group[start:end])
+            start = end
+
+    return {name: np.sort(np.concatenate(parts)) for name, parts in splits.items()}
+
+
+def _settings_fingerprint(settings: Dict[str, Any]) -> str:
+    encoded = json.dumps(settings, sort_keys=True, default=str).encode()
+    return hashlib.sha1(encoded).hexdigest()
+
+
+def read_split(
+    data_config: DictConfig,
+    split: str = "test",
+    seed: int = 42,
+    data_path: Union[str, Path, None] = None,
+) -> Tuple[List[str], List[int]]:
+    """Raw texts and labels of one split, as assigned by ``preprocess_corpus``"""
+    texts, labels = read_labeled_csv(
+        resolve_path(data_path or data_config.data_path),
+        data_config.parameters.authors,
+    )
+    fractions = {name: float(data_config.splits[name]) for name in SPLITS}
+    rows = split_indices(
+        labels, fractions, stratify=data_config.splits.get("stratify", True), seed=seed
+    )[split]
+    return [texts[i] for i in rows], [labels[i] for i in rows]
+
+
+def preprocess_corpus(
+    data_config: DictConfig, seed: int = 42, force: bool = False
+) -> Path:
+    """
+    Tokenize the raw corpus once into per-split shards under ``cache_dir``.
+
+    Texts are normalized as configured in ``preprocessing`` and tokenized in
+    batches, fanned out over ``preprocessing.num_workers`` processes (all
+    cores by default) for splits large enough to benefit. Shards are reused
+    as long as the tokenizer, normalization, length limits, splits and seed
+    are unchanged; otherwise (or with ``force``) they are rebuilt.
+    """
+    from transformers import AutoTokenizer
+
+    cache_dir = resolve_path(data_config.cache_dir)
+    params = data_config.parameters
+    fractions = {name: float(data_config.splits[name]) for name in SPLITS}
+
+    settings = {
+        "data_path": str(data_config.data_path),
+        "tokenizer": data_config.preprocessing.tokenizer,
+        "normalization": TextNormalizer.from_config(
+            data_config.preprocessing
+        ).to_dict(),
+        "max_length": params.max_length,
+        "min_length": params.min_length,
+        "authors": list(params.authors),
+        "splits": OmegaConf.to_container(data_config.splits, resolve=True),
+        "seed": seed,
+    }
+    fingerprint = _settings_fingerprint(settings)
+
+    manifests = [read_manifest(cache_dir / name) for name in SPLITS]
+    if not force and all(
+        m is not None and m.get("fingerprint") == fingerprint for m in manifests
+    ):
+        logger.info(f"Using cached token shards in {cache_dir}")
+        return cache_dir
+
+    logger.info(f"Tokenizing {data_config.data_path} into {cache_dir}")
+    tokenizer = AutoTokenizer.from_pretrained(settings["tokenizer"])
+    texts, labels = read_labeled_csv(
+        resolve_path(data_config.data_path), params.authors
+    )
+    split_rows = split_indices(
+        labels, fractions, stratify=data_config.splits.get("stratify", True), seed=seed
+    )
+
+    with BatchTokenizer.from_config(data_config, tokenizer) as encoder:
+        for name, rows in split_rows.items():
+            manifest = write_token_shards(
+                [texts[i] for i in rows],
+                (labels[i] for i in rows),
+                tokenizer,
+                cache_dir / name,
+                min_length=params.min_length,
+                metadata={
+                    "fingerprint": fingerprint,
+                    "label_names": list(params.authors),
+                },
+                encoder=encoder,
+            )
+            logger.info(
+                f"{name}: {manifest['num_examples']} examples "
+                f"({manifest['num_dropped']} shorter than min_length)"
+            )
+    logger.info(
+        f"Tokenized {encoder.num_texts} texts at {encoder.texts_per_sec:.0f} "
+        f"texts/sec ({encoder.normalizer}, up to {encoder.num_workers} processes)"
+    )
+
+    return cache_dir
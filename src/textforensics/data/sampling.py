@@ -0,0 +1,195 @@
+"""Batch samplers for TextForensics data loaders"""
+
+from typing import Iterator, List, Mapping, Optional, Sequence, Union
+
+import numpy as np
+from torch.utils.data import Sampler
+
+
+class LengthBucketBatchSampler(Sampler[List[int]]):
+    """
+    Batch sampler grouping examples of similar token length.
+
+    With ``shuffle``, indices are shuffled and cut into buckets of
+    ``batch_size * bucket_size_multiplier`` examples. Each bucket is sorted
+    by length and split into batches, and the batches of all buckets are
+    shuffled again, so batches stay length-homogeneous without a fixed
+    short-to-long order. Without ``shuffle``, batches follow a global sort
+    by length. Call ``set_epoch`` to draw a new permutation every epoch.
+
+    For data-parallel training, every rank builds the same batch list from
+    the shared seed and keeps every ``num_replicas``-th batch starting at
+    ``rank``. The list is truncated (``drop_last``) or cyclically padded so
+    that all ranks run the same number of steps.
+    """
+
+    def __init__(
+        self,
+        lengths: Union[Sequence[int], np.ndarray],
+        batch_size: int,
+        shuffle: bool = True,
+        drop_last: bool = False,
+        bucket_size_multiplier: int = 100,
+        seed: int = 42,
+        num_replicas: int = 1,
+        rank: int = 0,
+    ) -> None:
+        self.lengths = np.asarray(lengths)
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.drop_last = drop_last
+        self.bucket_size = batch_size * bucket_size_multiplier
+        self.seed = seed
+        self.epoch = 0
+        self.num_replicas = num_replicas
+        self.rank = rank
+
+    def set_epoch(self, epoch: int) -> None:
+        self.epoch = epoch
+
+    def _batches(self, indices: np.ndarray) -> List[np.ndarray]:
+        # Stable sort keeps the shuffled order among equal lengths
+        ordered = indices[np.argsort(self.lengths[indices], kind="stable")]
+        batches = [
+            ordered[start : start + self.batch_size]
+            for start in range(0, len(ordered), self.batch_size)
+        ]
+        if self.drop_last and batches and len(batches[-1]) < self.batch_size:
+            batches.pop()
+        return batches
+
+    def _all_batches(self) -> List[np.ndarray]:
+        indices = np.arange(len(self.lengths))
+        if not self.shuffle:
+            return self._batches(indices)
+
+        rng = np.random.default_rng(self.seed + self.epoch)
+        indices = rng.permutation(indices)
+        batches: List[np.ndarray] = []
+        for start in range(0, len(indices), self.bucket_size):
+            batches.extend(self._batches(indices[start : start + self.bucket_size]))
+        return [batches[i] for i in rng.permutation(len(batches))]
+
+    def _shard(self, batches: List[np.ndarray]) -> List[np.ndarray]:
+        if self.num_replicas == 1 or not batches:
+            return batches
+        per_rank = self._per_rank(len(batches))
+        total = per_rank * self.num_replicas
+        # Pad by repeating batches from the start so every rank gets a full share
+        repeats = -(-total // len(batches))
+        return (batches * repeats)[:total][self.rank :: self.num_replicas]
+
+    def _per_rank(self, num_batches: int) -> int:
+        if self.drop_last:
+            return num_batches // self.num_replicas
+        return -(-num_batches // self.num_replicas)
+
+    def __iter__(self) -> Iterator[List[int]]:
+        for batch in self._shard(self._all_batches()):
+            yield batch.tolist()
+
+    def _num_batches(self, n: int) -> int:
+        return n // self.batch_size if self.drop_last else -(-n // self.batch_size)
+
+    def __len__(self) -> int:
+        n = len(self.lengths)
+        if not self.shuffle:
+            num_batches = self._num_batches(n)
+        else:
+            # Full buckets are a multiple of batch_size; only the last can be ragged
+            full_buckets, remainder = divmod(n, self.bucket_size)
+            num_batches = full_buckets * self._num_batches(
+                self.bucket_size
+            ) + self._num_batches(remainder)
+        if self.num_replicas == 1 or num_batches == 0:
+            return num_batches
+        return self._per_rank(num_batches)
+
+
+SAMPLING_METHODS = ("proportional", "temperature")
+# Keeps the per-pass epochs of refilled task samplers apart across epochs
+_PASSES_PER_EPOCH = 10000
+
+
+class MultiTaskBatchSampler(Sampler[List[int]]):
+    """
+    Task-grouped batches drawn from one batch sampler per task.
+
+    Each task's sampler yields indices into that task's dataset; they are
+    offset by ``sizes`` into the ``ConcatDataset`` of all task datasets (in
+    ``samplers`` order), so every batch holds examples of a single task.
+
+    ``proportional`` interleaves one full pass over every task in a random
+    order, so each task contributes its share of batches exactly.
+    ``temperature`` draws the task of every batch with probability
+    proportional to ``num_batches ** (1 / temperature)``: ``1`` matches the
+    proportional mix, larger values flatten it towards small tasks. A task
+    whose sampler runs out starts a new pass, so small tasks are revisited
+    rather than exhausted. The epoch has ``num_batches`` batches (by default
+    the total over all tasks).
+
+    Task order depends only on ``seed`` and the epoch, so data-parallel
+    ranks built with sharded per-task samplers run the same task at every
+    step and the same number of steps.
+    """
+
+    def __init__(
+        self,
+        samplers: Mapping[str, LengthBucketBatchSampler],
+        sizes: Sequence[int],
+        method: str = "proportional",
+        temperature: float = 1.0,
+        num_batches: Optional[int] = None,
+        seed: int = 42,
+    ) -> None:
+        if method not in SAMPLING_METHODS:
+            raise ValueError(f"Unknown task sampling method: {method}")
+        if temperature <= 0:
+            raise ValueError(f"temperature must be positive, got {temperature}")
+        self.tasks = list(samplers)
+        self.samplers = [samplers[task] for task in self.tasks]
+        self.offsets = np.concatenate([[0], np.cumsum(sizes)[:-1]]).astype(np.int64)
+        self.method = method
+        self.temperature = temperature
+        self.num_batches = num_batches
+        self.seed = seed
+        self.epoch = 0
+
+        counts = np.array([len(s) for s in self.samplers], dtype=np.float64)
+        self.task_batches = counts.astype(np.int64)
+        scaled = counts ** (1.0 / temperature)
+        self.probabilities = scaled / scaled.sum() if scaled.sum() else scaled
+
+    def set_epoch(self, epoch: int) -> None:
+        self.epoch = epoch
+
+    def task_sequence(self) -> np.ndarray:
+        """Task index of every batch of the current epoch"""
+        rng = np.random.default_rng(self.seed + self.epoch)
+        if self.method == "proportional" and self.num_batches is None:
+            return rng.permutation(
+                np.repeat(np.arange(len(self.tasks)), self.task_batches)
+            )
+        return rng.choice(len(self.tasks), size=len(self), p=self.probabilities)
+
+    def __iter__(self) -> Iterator[List[int]]:
+        passes = [0] * len(self.tasks)
+        iterators: List[Optional[Iterator[List[int]]]] = [None] * len(self.tasks)
+        for task in self.task_sequence():
+            iterator = iterators[task]
+            batch = next(iterator, None) if iterator is not None else None
+            if batch is None:
+                # Start a (new) pass over this task's data
+                self.samplers[task].set_epoch(
+                    self.epoch * _PASSES_PER_EPOCH + passes[task]
+                )
+                passes[task] += 1
+                iterator = iterators[task] = iter(self.samplers[task])
+                batch = next(iterator)
+            offset = int(self.offsets[task])
+            yield [offset + int(i) for i in batch]
+
+    def __len__(self) -> int:
+        if self.num_batches is not None:
+            return self.num_batches
+        return int(self.task_batches.sum())
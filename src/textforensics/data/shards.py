@@ -0,0 +1,212 @@
+"""Pre-tokenized, memory-mapped token shards"""
+
+import json
+import os
+import shutil
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+import torch
+from torch.utils.data import Dataset
+
+from .tokenization import BatchTokenizer
+
+MANIFEST_FILE = "manifest.json"
+
+
+def _token_dtype(vocab_size: int) -> np.dtype:
+    """Smallest fixed-width dtype that can hold every token id"""
+    return np.dtype(
+        np.uint16 if vocab_size <= np.iinfo(np.uint16).max + 1 else np.int32
+    )
+
+
+def write_token_shards(
+    texts: Iterable[str],
+    labels: Iterable[int],
+    tokenizer: Any,
+    output_dir: Union[str, Path],
+    max_length: int = 512,
+    min_length: int = 0,
+    shard_size: int = 100000,
+    batch_size: int = 1000,
+    metadata: Optional[Dict[str, Any]] = None,
+    encoder: Optional[BatchTokenizer] = None,
+) -> Dict[str, Any]:
+    """
+    Tokenize a corpus once and write it as memory-mappable shards.
+
+    Each shard holds a flat token array, an ``offsets`` array with one more
+    entry than examples, and a ``labels`` array, all saved as ``.npy``.
+    Texts with fewer than ``min_length`` tokens are dropped and longer ones
+    are truncated to ``max_length``. The directory is written under a
+    temporary name and renamed into place once the manifest is complete.
+
+    Texts are encoded by ``encoder`` when given (which then also sets the
+    truncation length and any text normalization), otherwise in-process
+    with ``tokenizer`` ``batch_size`` texts at a time.
+    """
+    output_dir = Path(output_dir)
+    tmp_dir = output_dir.with_name(output_dir.name + ".tmp")
+    if tmp_dir.exists():
+        shutil.rmtree(tmp_dir)
+    tmp_dir.mkdir(parents=True)
+
+    dtype = _token_dtype(len(tokenizer))
+    shards: List[Dict[str, Any]] = []
+    tokens: List[np.ndarray] = []
+    shard_labels: List[int] = []
+    num_dropped = 0
+
+    def flush() -> None:
+        if not tokens:
+            return
+        name = f"shard_{len(shards):05d}"
+        lengths = np.array([len(t) for t in tokens], dtype=np.int64)
+        offsets = np.concatenate([[0], np.cumsum(lengths)]).astype(np.int64)
+        np.save(tmp_dir / f"{name}.tokens.npy", np.concatenate(tokens).astype(dtype))
+        np.save(tmp_dir / f"{name}.offsets.npy", offsets)
+        np.save(tmp_dir / f"{name}.labels.npy", np.array(shard_labels, np.int64))
+        shards.append({"name": name, "num_examples": len(tokens)})
+        tokens.clear()
+        shard_labels.clear()
+
+    if encoder is None:
+        encoder = BatchTokenizer(
+            tokenizer, max_length=max_length, batch_size=batch_size
+        )
+    label_iter = iter(labels)
+    for ids, lengths in encoder.iter_encoded(texts):
+        batch_labels = list(islice(label_iter, len(lengths)))
+        ids = ids.astype(dtype, copy=False)
+        offsets = np.concatenate([[0], np.cumsum(lengths)])
+        for row, label in enumerate(batch_labels):
+            if lengths[row] < min_length:
+                num_dropped += 1
+                continue
+            tokens.append(ids[offsets[row] : offsets[row + 1]])
+            shard_labels.append(int(label))
+            if len(tokens) >= shard_size:
+                flush()
+    flush()
+
+    manifest = {
+        "token_dtype": dtype.name,
+        "max_length": encoder.max_length,
+        "min_length": min_length,
+        "pad_token_id": tokenizer.pad_token_id or 0,
+        "num_examples": sum(s["num_examples"] for s in shards),
+        "num_dropped": num_dropped,
+        "shards": shards,
+        **(metadata or {}),
+    }
+    with open(tmp_dir / MANIFEST_FILE, "w") as f:
+        json.dump(manifest, f, indent=2)
+
+    if output_dir.exists():
+        shutil.rmtree(output_dir)
+    os.replace(tmp_dir, output_dir)
+    return manifest
+
+
+def read_manifest(path: Union[str, Path]) -> Optional[Dict[str, Any]]:
+    """Return a shard directory's manifest, or ``None`` if it is incomplete"""
+    manifest_path = Path(path) / MANIFEST_FILE
+    if not manifest_path.exists():
+        return None
+    with open(manifest_path) as f:
+        manifest: Dict[str, Any] = json.load(f)
+    return manifest
+
+
+class TokenShardDataset(Dataset):
+    """
+    Map-style dataset over shards written by ``write_token_shards``.
+
+    Shards are opened with ``np.load(mmap_mode="r")``, so examples are read
+    straight from the page cache and nothing is tokenized at load time.
+    """
+
+    def __init__(self, path: Union[str, Path]) -> None:
+        self.path = Path(path)
+        manifest = read_manifest(self.path)
+        if manifest is None:
+            raise FileNotFoundError(f"No token shards found at {self.path}")
+        self.manifest = manifest
+        self.pad_token_id: int = manifest["pad_token_id"]
+
+        self._tokens: List[np.ndarray] = []
+        self._offsets: List[np.ndarray] = []
+        self._labels: List[np.ndarray] = []
+        for shard in manifest["shards"]:
+            prefix = self.path / shard["name"]
+            self._tokens.append(np.load(f"{prefix}.tokens.npy", mmap_mode="r"))
+            self._offsets.append(np.load(f"{prefix}.offsets.npy", mmap_mode="r"))
+            self._labels.append(np.load(f"{prefix}.labels.npy", mmap_mode="r"))
+
+        counts = [shard["num_examples"] for shard in manifest["shards"]]
+        self._starts = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+
+    def __len__(self) -> int:
+        return int(self._starts[-1])
+
+    def _locate(self, index: int) -> Tuple[int, int]:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError(f"Index {index} out of range for {len(self)} examples")
+        shard = int(np.searchsorted(self._starts, index, side="right")) - 1
+        return shard, index - int(self._starts[shard])
+
+    @property
+    def lengths(self) -> np.ndarray:
+        """Token length of every example, without touching the token arrays"""
+        if not self._offsets:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate([np.diff(offsets) for offsets in self._offsets])
+
+    def __getitem__(self, index: int) -> Dict[str, torch.Tensor]:
+        shard, row = self._locate(index)
+        start, end = self._offsets[shard][row], self._offsets[shard][row + 1]
+        return {
+            "input_ids": torch.from_numpy(
+                self._tokens[shard][start:end].astype(np.int64)
+            ),
+            "labels": torch.tensor(int(self._labels[shard][row])),
+        }
+
+
+class TaskDataset(Dataset):
+    """
+    A dataset whose ``labels`` are the targets of one task.
+
+    ``labels`` is renamed to the task's batch key (see
+    ``textforensics.losses.TASK_LABEL_KEYS``), so multi-task training runs
+    the matching head on its batches; ``dtype`` casts the targets, e.g. to
+    float for binary or regression losses.
+    """
+
+    def __init__(
+        self,
+        dataset: TokenShardDataset,
+        label_key: str,
+        dtype: Optional[torch.dtype] = None,
+    ) -> None:
+        self.dataset = dataset
+        self.label_key = label_key
+        self.dtype = dtype
+
+    def __len__(self) -> int:
+        return len(self.dataset)
+
+    @property
+    def lengths(self) -> np.ndarray:
+        return self.dataset.lengths
+
+    def __getitem__(self, index: int) -> Dict[str, torch.Tensor]:
+        example = dict(self.dataset[index])
+        labels = example.pop("labels")
+        example[self.label_key] = labels.to(self.dtype) if self.dtype else labels
+        return example
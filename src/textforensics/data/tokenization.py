@@ -0,0 +1,316 @@
+"""Text normalization and batched, multi-process tokenization"""
+
+import logging
+import multiprocessing as mp
+import os
+import re
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import chain, islice
+from typing import (
+    Any,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+import numpy as np
+
+logger = logging.getLogger("textforensics")
+
+Encoded = Tuple[np.ndarray, np.ndarray]
+
+# Irregular forms first; the suffix rules below would mangle them
+_IRREGULAR_CONTRACTIONS = {
+    "won't": "will not",
+    "can't": "cannot",
+    "shan't": "shall not",
+    "ain't": "is not",
+}
+_CONTRACTION_SUFFIXES = {
+    "n't": " not",
+    "'re": " are",
+    "'ve": " have",
+    "'ll": " will",
+    "'m": " am",
+    "'d": " would",
+}
+_IRREGULAR_PATTERN = re.compile(
+    r"\b(" + "|".join(re.escape(k) for k in _IRREGULAR_CONTRACTIONS) + r")\b",
+    re.IGNORECASE,
+)
+_SUFFIX_PATTERN = re.compile(
+    r"(?<=\w)(" + "|".join(re.escape(k) for k in _CONTRACTION_SUFFIXES) + r")\b",
+    re.IGNORECASE,
+)
+# Word characters, whitespace and the punctuation that carries style
+_SPECIAL_CHARS_PATTERN = re.compile(r"[^\w\s.,;:!?'\"()\-]")
+_WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+class TextNormalizer:
+    """
+    String-level preprocessing from the ``data.preprocessing`` config.
+
+    ``handle_contractions`` expands English contractions ("don't" becomes
+    "do not"; the possessive "'s" is left alone), ``remove_special_chars``
+    replaces everything except word characters, whitespace and common
+    punctuation with a space, and ``lowercase`` lowercases the result.
+    Curly apostrophes are treated as straight ones.
+    """
+
+    def __init__(
+        self,
+        lowercase: bool = False,
+        remove_special_chars: bool = False,
+        handle_contractions: bool = False,
+    ) -> None:
+        self.lowercase = lowercase
+        self.remove_special_chars = remove_special_chars
+        self.handle_contractions = handle_contractions
+
+    @classmethod
+    def from_config(cls, config: Optional[Mapping[str, Any]]) -> "TextNormalizer":
+        """Build from ``data.preprocessing`` or a model's ``text_preprocessing``"""
+        config = config or {}
+        return cls(
+            lowercase=bool(config.get("lowercase", False)),
+            remove_special_chars=bool(config.get("remove_special_chars", False)),
+            handle_contractions=bool(config.get("handle_contractions", False)),
+        )
+
+    def to_dict(self) -> Dict[str, bool]:
+        return {
+            "lowercase": self.lowercase,
+            "remove_special_chars": self.remove_special_chars,
+            "handle_contractions": self.handle_contractions,
+        }
+
+    @property
+    def enabled(self) -> bool:
+        return any(self.to_dict().values())
+
+    def __call__(self, text: str) -> str:
+        if self.handle_contractions and ("'" in text or "’" in text):
+            text = text.replace("’", "'")
+            text = _IRREGULAR_PATTERN.sub(
+                lambda m: _IRREGULAR_CONTRACTIONS[m.group(0).lower()], text
+            )
+            text = _SUFFIX_PATTERN.sub(
+                lambda m: _CONTRACTION_SUFFIXES[m.group(0).lower()], text
+            )
+        if self.remove_special_chars:
+            text = _SPECIAL_CHARS_PATTERN.sub(" ", text)
+            text = _WHITESPACE_PATTERN.sub(" ", text).strip()
+        if self.lowercase:
+            text = text.lower()
+        return text
+
+    def __repr__(self) -> str:
+        settings = ", ".join(f"{k}={v}" for k, v in self.to_dict().items())
+        return f"TextNormalizer({settings})"
+
+
+def _encode(
+    tokenizer: Any,
+    normalizer: Optional[TextNormalizer],
+    texts: Sequence[str],
+    max_length: Optional[int],
+) -> Encoded:
+    """Normalize and tokenize one batch into flat token ids and lengths"""
+    if normalizer is not None and normalizer.enabled:
+        texts = [normalizer(text) for text in texts]
+    encoded = tokenizer(
+        list(texts),
+        truncation=max_length is not None,
+        max_length=max_length,
+        padding=False,
+        return_attention_mask=False,
+        verbose=False,
+    )["input_ids"]
+    lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded))
+    # Flat arrays pickle far faster than nested lists on the way back from workers
+    ids = np.fromiter(
+        chain.from_iterable(encoded), dtype=np.int32, count=int(lengths.sum())
+    )
+    return ids, lengths
+
+
+# Per-process tokenizer and normalizer, set by ``_init_worker``
+_worker_tokenizer: Any = None
+_worker_normalizer: Optional[TextNormalizer] = None
+
+
+def _init_worker(tokenizer: Any, normalizer: Optional[TextNormalizer]) -> None:
+    global _worker_tokenizer, _worker_normalizer
+    # Parallelism comes from the processes; Rust threads would oversubscribe
+    os.environ["TOKENIZERS_PARALLELISM"] = "false"
+    _worker_tokenizer = tokenizer
+    _worker_normalizer = normalizer
+
+
+def _encode_chunk(texts: List[str], max_length: Optional[int]) -> Encoded:
+    return _encode(_worker_tokenizer, _worker_normalizer, texts, max_length)
+
+
+def split_encoded(ids: np.ndarray, lengths: np.ndarray) -> List[List[int]]:
+    """Nested token id lists from flat ids and per-text lengths"""
+    offsets = np.cumsum(lengths)[:-1]
+    return [part.tolist() for part in np.split(ids, offsets)] if len(lengths) else []
+
+
+class BatchTokenizer:
+    """
+    Normalize and tokenize texts in large batches, optionally across processes.
+
+    Texts go through the ``TextNormalizer`` and then the tokenizer's batch
+    API ``batch_size`` at a time, so per-call overhead is paid once per batch
+    instead of once per string. With ``num_workers > 1``, batches are fanned
+    out to a pool of spawned worker processes (each holding its own copy of
+    the tokenizer) with at most ``2 * num_workers`` batches in flight, and
+    results come back in input order. Calls with fewer than
+    ``min_parallel_texts`` texts stay in-process, since a small request does
+    not amortize the hand-off to workers. The pool is started on first use
+    and shut down by ``close``.
+
+    ``num_texts`` and ``seconds`` accumulate over all calls; ``texts_per_sec``
+    reports the resulting throughput.
+    """
+
+    def __init__(
+        self,
+        tokenizer: Any,
+        normalizer: Optional[TextNormalizer] = None,
+        max_length: Optional[int] = 512,
+        batch_size: int = 1000,
+        num_workers: int = 1,
+        min_parallel_texts: int = 10000,
+    ) -> None:
+        self.tokenizer = tokenizer
+        self.normalizer = normalizer
+        self.max_length = max_length
+        self.batch_size = batch_size
+        self.num_workers = max(1, num_workers)
+        self.min_parallel_texts = min_parallel_texts
+        self.num_texts = 0
+        self.seconds = 0.0
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @classmethod
+    def from_config(
+        cls, data_config: Any, tokenizer: Any = None, **kwargs: Any
+    ) -> "BatchTokenizer":
+        """Build from a ``conf/data/*.yaml`` entry"""
+        preprocessing = data_config.preprocessing
+        if tokenizer is None:
+            from transformers import AutoTokenizer
+
+            tokenizer = AutoTokenizer.from_pretrained(preprocessing.tokenizer)
+        num_workers = preprocessing.get("num_workers") or os.cpu_count() or 1
+        kwargs.setdefault("num_workers", num_workers)
+        kwargs.setdefault("batch_size", preprocessing.get("batch_size", 1000))
+        kwargs.setdefault("max_length", data_config.parameters.max_length)
+        return cls(tokenizer, TextNormalizer.from_config(preprocessing), **kwargs)
+
+    @property
+    def texts_per_sec(self) -> float:
+        return self.num_texts / self.seconds if self.seconds > 0 else 0.0
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.num_workers,
+                mp_context=mp.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(self.tokenizer, self.normalizer),
+            )
+        return self._executor
+
+    def _batches(self, texts: Iterable[str]) -> Iterator[List[str]]:
+        iterator = iter(texts)
+        while True:
+            batch = list(islice(iterator, self.batch_size))
+            if not batch:
+                return
+            yield batch
+
+    def iter_encoded(
+        self, texts: Iterable[str], truncation: bool = True
+    ) -> Iterator[Encoded]:
+        """
+        Yield ``(ids, lengths)`` per batch of ``batch_size`` texts, in order.
+
+        ``ids`` holds the batch's token ids back to back and ``lengths`` the
+        number of tokens of each text. Without ``truncation`` texts are
+        tokenized in full regardless of ``max_length``.
+        """
+        max_length = self.max_length if truncation else None
+        size = len(texts) if isinstance(texts, Sequence) else None
+        parallel = self.num_workers > 1 and (
+            size is None or size >= self.min_parallel_texts
+        )
+
+        # Time spent suspended at ``yield`` belongs to the consumer
+        elapsed = 0.0
+        start = time.perf_counter()
+        if not parallel:
+            for batch in self._batches(texts):
+                encoded = _encode(self.tokenizer, self.normalizer, batch, max_length)
+                self.num_texts += len(batch)
+                elapsed += time.perf_counter() - start
+                yield encoded
+                start = time.perf_counter()
+        else:
+            executor = self._pool()
+            pending: Deque[Tuple[Future, int]] = deque()
+            for batch in self._batches(texts):
+                future = executor.submit(_encode_chunk, batch, max_length)
+                pending.append((future, len(batch)))
+                if len(pending) >= 2 * self.num_workers:
+                    future, count = pending.popleft()
+                    encoded = future.result()
+                    self.num_texts += count
+                    elapsed += time.perf_counter() - start
+                    yield encoded
+                    start = time.perf_counter()
+            while pending:
+                future, count = pending.popleft()
+                encoded = future.result()
+                self.num_texts += count
+                elapsed += time.perf_counter() - start
+                yield encoded
+                start = time.perf_counter()
+        self.seconds += elapsed + time.perf_counter() - start
+
+    def __call__(
+        self, texts: Sequence[str], truncation: bool = True
+    ) -> List[List[int]]:
+        """Token ids of every text, without padding"""
+        input_ids: List[List[int]] = []
+        for ids, lengths in self.iter_encoded(texts, truncation):
+            input_ids.extend(split_encoded(ids, lengths))
+        return input_ids
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self) -> "BatchTokenizer":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # A live process pool cannot cross process boundaries
+        state = self.__dict__.copy()
+        state["_executor"] = None
+        return state
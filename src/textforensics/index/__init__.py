@@ -0,0 +1,34 @@
+"""TextForensics Vector Index Package"""
+
+from typing import TYPE_CHECKING
+
+from .._lazy import attach
+
+if TYPE_CHECKING:
+    from .cache import EmbeddingCache, model_fingerprint
+    from .ivf import IVFIndex
+    from .minhash import MinHashLSH
+    from .pq import ProductQuantizer
+    from .similarity import SimilarityEngine, SimilarityResult
+
+_ATTRIBUTES = {
+    "EmbeddingCache": ".cache",
+    "IVFIndex": ".ivf",
+    "MinHashLSH": ".minhash",
+    "ProductQuantizer": ".pq",
+    "SimilarityEngine": ".similarity",
+    "SimilarityResult": ".similarity",
+    "model_fingerprint": ".cache",
+}
+
+__getattr__, __dir__ = attach(__name__, _ATTRIBUTES)
+
+__all__ = [
+    "EmbeddingCache",
+    "IVFIndex",
+    "MinHashLSH",
+    "ProductQuantizer",
+    "SimilarityEngine",
+    "SimilarityResult",
+    "model_fingerprint",
+]
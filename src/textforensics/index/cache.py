@@ -0,0 +1,180 @@
+"""Content-addressed style-embedding cache"""
+
+import hashlib
+import json
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Union
+
+import numpy as np
+
+from .storage import AppendOnlyArray
+
+KEY_BYTES = 16
+
+
+def _hash_state(digest: Any, value: Any) -> None:
+    """Feed one ``state_dict`` entry into ``digest``"""
+    import torch
+
+    if isinstance(value, torch.Tensor):
+        if value.is_quantized:
+            # Int8 weights hash as their integer values plus quantization params
+            if value.qscheme() in (torch.per_tensor_affine, torch.per_tensor_symmetric):
+                digest.update(repr((value.q_scale(), value.q_zero_point())).encode())
+            else:
+                _hash_state(digest, value.q_per_channel_scales())
+                _hash_state(digest, value.q_per_channel_zero_points())
+            value = value.int_repr()
+        data = value.detach().cpu().contiguous().reshape(-1)
+        digest.update(data.view(torch.uint8).numpy().tobytes())
+    elif isinstance(value, (tuple, list)):
+        # Packed params of dynamically quantized layers: (weight, bias)
+        for item in value:
+            _hash_state(digest, item)
+    else:
+        # dtypes and other plain entries
+        digest.update(repr(value).encode())
+
+
+def model_fingerprint(model: Any, **extra: Any) -> str:
+    """
+    Fingerprint a model's config and weights, plus any extra settings.
+
+    Extra keyword arguments (tokenizer name, ``max_length``...) are mixed in
+    so that anything changing the produced embeddings changes the fingerprint.
+    Dynamically quantized models hash their int8 weights, so they never
+    share cache entries with the fp32 model they came from.
+    """
+    digest = hashlib.blake2b(digest_size=KEY_BYTES)
+    digest.update(model.config.to_json_string(use_diff=False).encode())
+    digest.update(json.dumps(extra, sort_keys=True, default=str).encode())
+
+    for name, value in model.state_dict().items():
+        digest.update(name.encode())
+        _hash_state(digest, value)
+
+    return digest.hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Two-tier cache of style embeddings keyed by text hash and model fingerprint.
+
+    The memory tier is a bounded LRU. The optional disk tier appends every
+    new embedding to a raw float32 file under ``path`` that is read back
+    memory-mapped; disk hits are promoted into the memory tier. The disk tier
+    assumes a single writing process.
+    """
+
+    def __init__(
+        self,
+        dim: int,
+        fingerprint: str = "",
+        capacity: int = 10000,
+        path: Optional[Union[str, Path]] = None,
+    ) -> None:
+        self.dim = dim
+        self.fingerprint = fingerprint
+        self.capacity = capacity
+        self._memory: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+        self.path: Optional[Path] = None
+        self._disk_rows: Dict[bytes, int] = {}
+        if path is not None:
+            # Each fingerprint gets its own directory, so stale entries are never read
+            self.path = Path(path) / (fingerprint or "default")
+            self.path.mkdir(parents=True, exist_ok=True)
+            self._keys = AppendOnlyArray(np.uint8, KEY_BYTES, self.path / "keys.u8")
+            self._vectors = AppendOnlyArray(
+                np.float32, dim, self.path / "embeddings.f32"
+            )
+            self._load_disk_index()
+
+    def _load_disk_index(self) -> None:
+        # Vectors are written before keys, so a key always has its vector
+        n = min(len(self._keys), len(self._vectors))
+        self._keys.truncate(n)
+        self._vectors.truncate(n)
+        self._disk_rows = {
+            key.tobytes(): row for row, key in enumerate(self._keys.array)
+        }
+
+    def key(self, text: str) -> bytes:
+        """Content address of ``text`` under this cache's fingerprint"""
+        digest = hashlib.blake2b(digest_size=KEY_BYTES)
+        digest.update(self.fingerprint.encode())
+        digest.update(b"\0")
+        digest.update(text.encode())
+        return digest.digest()
+
+    def __len__(self) -> int:
+        return max(len(self._memory), len(self._disk_rows))
+
+    def __contains__(self, text: str) -> bool:
+        key = self.key(text)
+        return key in self._memory or key in self._disk_rows
+
+    def _remember(self, key: bytes, embedding: np.ndarray) -> None:
+        self._memory[key] = embedding
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.capacity:
+            self._memory.popitem(last=False)
+
+    def get_many(self, texts: Sequence[str]) -> List[Optional[np.ndarray]]:
+        """Look up embeddings, returning ``None`` for misses"""
+        results: List[Optional[np.ndarray]] = []
+        for text in texts:
+            key = self.key(text)
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                results.append(self._memory[key])
+            elif key in self._disk_rows:
+                embedding = np.array(self._vectors.array[self._disk_rows[key]])
+                self._remember(key, embedding)
+                self.disk_hits += 1
+                results.append(embedding)
+            else:
+                self.misses += 1
+                results.append(None)
+        return results
+
+    def put_many(self, texts: Sequence[str], embeddings: np.ndarray) -> None:
+        """Store embeddings for texts in both tiers"""
+        embeddings = np.asarray(embeddings, dtype=np.float32).reshape(-1, self.dim)
+        keys = [self.key(text) for text in texts]
+
+        for key, embedding in zip(keys, embeddings):
+            self._remember(key, embedding.copy())
+
+        if self.path is not None:
+            new = [i for i, key in enumerate(keys) if key not in self._disk_rows]
+            # Duplicate texts within one call are written once
+            new = list({keys[i]: i for i in new}.values())
+            if new:
+                start = len(self._vectors)
+                self._vectors.append(embeddings[new])
+                self._keys.append(
+                    np.frombuffer(b"".join(keys[i] for i in new), dtype=np.uint8)
+                )
+                for offset, i in enumerate(new):
+                    self._disk_rows[keys[i]] = start + offset
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters"""
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": (
+                (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0
+            ),
+            "memory_entries": len(self._memory),
+            "disk_entries": len(self._disk_rows),
+        }
@@ -0,0 +1,249 @@
+"""Inverted-file (IVF) index over style embeddings"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple, Union
+
+import numpy as np
+
+from .kmeans import kmeans, nearest_centroids
+from .pq import ProductQuantizer
+from .storage import AppendOnlyArray
+
+
+def _normalize(x: np.ndarray) -> np.ndarray:
+    """L2-normalize rows so inner products become cosine similarities"""
+    x = np.atleast_2d(np.asarray(x, dtype=np.float32))
+    norms = np.linalg.norm(x, axis=1, keepdims=True)
+    normalized: np.ndarray = x / np.maximum(norms, 1e-12)
+    return normalized
+
+
+class IVFIndex:
+    """
+    Approximate nearest-neighbour index for cosine similarity.
+
+    Vectors are L2-normalized and assigned to the nearest of ``nlist`` coarse
+    centroids. Queries only scan the ``nprobe`` closest inverted lists, which
+    is the recall-vs-latency knob: ``nprobe == nlist`` is an exhaustive scan.
+    With ``pq_subvectors`` set, residuals to the coarse centroid are stored as
+    product-quantization codes instead of float32 vectors.
+
+    When created with a ``path``, vectors, ids and list assignments are
+    appended to raw files in that directory and read back memory-mapped, so
+    the index can grow beyond RAM and be reopened with ``IVFIndex.load``.
+    """
+
+    META_FILE = "meta.json"
+
+    def __init__(
+        self,
+        dim: int,
+        nlist: int = 1024,
+        nprobe: int = 8,
+        pq_subvectors: Optional[int] = None,
+        pq_nbits: int = 8,
+        path: Optional[Union[str, Path]] = None,
+    ) -> None:
+        self.dim = dim
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.pq = (
+            ProductQuantizer(dim, pq_subvectors, pq_nbits) if pq_subvectors else None
+        )
+        self.centroids: Optional[np.ndarray] = None
+
+        self.path = Path(path) if path is not None else None
+        if self.path is not None:
+            self.path.mkdir(parents=True, exist_ok=True)
+        self._init_storage()
+
+        # Inverted lists, rebuilt lazily after adds
+        self._list_order: Optional[np.ndarray] = None
+        self._list_offsets: Optional[np.ndarray] = None
+
+    def _init_storage(self) -> None:
+        def file(name: str) -> Optional[Path]:
+            return self.path / name if self.path is not None else None
+
+        if self.pq is not None:
+            self._data = AppendOnlyArray(
+                np.uint8, self.pq.num_subvectors, file("codes.u8")
+            )
+        else:
+            self._data = AppendOnlyArray(np.float32, self.dim, file("vectors.f32"))
+        self._ids = AppendOnlyArray(np.int64, 1, file("ids.i64"))
+        self._lists = AppendOnlyArray(np.int32, 1, file("lists.i32"))
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    @property
+    def is_trained(self) -> bool:
+        return self.centroids is not None and (self.pq is None or self.pq.is_trained)
+
+    def train(self, vectors: np.ndarray, n_iter: int = 20, seed: int = 0) -> None:
+        """Learn coarse centroids and, if enabled, PQ codebooks"""
+        x = _normalize(vectors)
+        self.centroids = kmeans(x, self.nlist, n_iter=n_iter, seed=seed)
+
+        if self.pq is not None:
+            assignment = nearest_centroids(x, self.centroids)[:, 0]
+            self.pq.train(x - self.centroids[assignment], n_iter=n_iter, seed=seed)
+
+        if self.path is not None:
+            self._save_quantizers()
+            self._save_meta()
+
+    def add(self, vectors: np.ndarray, ids: Optional[np.ndarray] = None) -> np.ndarray:
+        """Add vectors to the index, returning their ids"""
+        if not self.is_trained:
+            raise RuntimeError("IVFIndex must be trained before adding vectors")
+        assert self.centroids is not None
+
+        x = _normalize(vectors)
+        if ids is None:
+            ids = np.arange(len(self), len(self) + len(x), dtype=np.int64)
+        ids = np.asarray(ids, dtype=np.int64)
+        if len(ids) != len(x):
+            raise ValueError("ids and vectors must have the same length")
+
+        assignment = nearest_centroids(x, self.centroids)[:, 0]
+        if self.pq is not None:
+            self._data.append(self.pq.encode(x - self.centroids[assignment]))
+        else:
+            self._data.append(x)
+        self._ids.append(ids)
+        self._lists.append(assignment.astype(np.int32))
+
+        self._list_order = None
+        if self.path is not None:
+            self._save_meta()
+        return ids
+
+    def _inverted_lists(self) -> Tuple[np.ndarray, np.ndarray]:
+        """Row order grouped by list, and per-list start offsets"""
+        if self._list_order is None or self._list_offsets is None:
+            lists = self._lists.array[:, 0]
+            self._list_order = np.argsort(lists, kind="stable")
+            counts = np.bincount(lists, minlength=self.nlist)
+            self._list_offsets = np.concatenate([[0], np.cumsum(counts)])
+        return self._list_order, self._list_offsets
+
+    def search(
+        self, queries: np.ndarray, k: int = 10, nprobe: Optional[int] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return ``(scores, ids)`` of the top-``k`` cosine matches per query.
+
+        Missing results (fewer than ``k`` candidates) are padded with
+        ``-inf`` scores and ``-1`` ids.
+        """
+        if not self.is_trained:
+            raise RuntimeError("IVFIndex must be trained before searching")
+        assert self.centroids is not None
+
+        q = _normalize(queries)
+        nprobe = min(nprobe or self.nprobe, self.nlist)
+        probes = nearest_centroids(q, self.centroids, n=nprobe)
+        order, offsets = self._inverted_lists()
+        data, all_ids = self._data.array, self._ids.array[:, 0]
+
+        scores = np.full((len(q), k), -np.inf, dtype=np.float32)
+        result_ids = np.full((len(q), k), -1, dtype=np.int64)
+
+        for i, query in enumerate(q):
+            row_groups = [order[offsets[p] : offsets[p + 1]] for p in probes[i]]
+            rows = np.concatenate(row_groups)
+            if len(rows) == 0:
+                continue
+
+            if self.pq is not None:
+                # <q, c + r> = <q, c> + <q, r>, with <q, r> from the PQ table
+                table = self.pq.inner_product_table(query)
+                centroid_scores = self.centroids[probes[i]] @ query
+                base = np.repeat(centroid_scores, [len(g) for g in row_groups])
+                candidate_scores = base + self.pq.score(table, data[rows])
+            else:
+                candidate_scores = data[rows] @ query
+
+            top = min(k, len(rows))
+            best = np.argpartition(-candidate_scores, top - 1)[:top]
+            best = best[np.argsort(-candidate_scores[best])]
+            scores[i, :top] = candidate_scores[best]
+            result_ids[i, :top] = all_ids[rows[best]]
+
+        return scores, result_ids
+
+    def _meta(self) -> Dict[str, Any]:
+        return {
+            "dim": self.dim,
+            "nlist": self.nlist,
+            "nprobe": self.nprobe,
+            "pq_subvectors": self.pq.num_subvectors if self.pq else None,
+            "pq_nbits": self.pq.nbits if self.pq else 8,
+            "ntotal": len(self),
+        }
+
+    def _save_quantizers(self) -> None:
+        assert self.path is not None
+        if self.centroids is not None:
+            np.save(self.path / "centroids.npy", self.centroids)
+        if self.pq is not None and self.pq.codebooks is not None:
+            np.save(self.path / "codebooks.npy", self.pq.codebooks)
+
+    def _save_meta(self) -> None:
+        assert self.path is not None
+        tmp_path = self.path / (self.META_FILE + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(self._meta(), f, indent=2)
+        os.replace(tmp_path, self.path / self.META_FILE)
+
+    def save(self, path: Union[str, Path]) -> "IVFIndex":
+        """Write an index to ``path`` and return the disk-backed copy"""
+        saved = IVFIndex(
+            self.dim,
+            nlist=self.nlist,
+            nprobe=self.nprobe,
+            pq_subvectors=self.pq.num_subvectors if self.pq else None,
+            pq_nbits=self.pq.nbits if self.pq else 8,
+            path=path,
+        )
+        if len(saved):
+            raise FileExistsError(f"Index already exists at {path}")
+
+        saved.centroids = self.centroids
+        if saved.pq is not None and self.pq is not None:
+            saved.pq.codebooks = self.pq.codebooks
+        saved._data.append(self._data.array)
+        saved._ids.append(self._ids.array)
+        saved._lists.append(self._lists.array)
+        saved._save_quantizers()
+        saved._save_meta()
+        return saved
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "IVFIndex":
+        """Open a disk-backed index; stored vectors are memory-mapped"""
+        path = Path(path)
+        with open(path / cls.META_FILE) as f:
+            meta = json.load(f)
+
+        index = cls(
+            meta["dim"],
+            nlist=meta["nlist"],
+            nprobe=meta["nprobe"],
+            pq_subvectors=meta["pq_subvectors"],
+            pq_nbits=meta["pq_nbits"],
+            path=path,
+        )
+        if (path / "centroids.npy").exists():
+            index.centroids = np.load(path / "centroids.npy")
+        if index.pq is not None and (path / "codebooks.npy").exists():
+            index.pq.codebooks = np.load(path / "codebooks.npy")
+
+        # Drop rows written after the last successful add (e.g. after a crash)
+        for storage in (index._data, index._ids, index._lists):
+            storage.truncate(meta["ntotal"])
+        return index
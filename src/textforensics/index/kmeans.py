@@ -0,0 +1,58 @@
+"""K-means clustering for vector index training"""
+
+from typing import Optional
+
+import numpy as np
+
+
+def nearest_centroids(
+    x: np.ndarray, centroids: np.ndarray, n: int = 1, chunk_size: int = 8192
+) -> np.ndarray:
+    """Return indices of the ``n`` nearest centroids (L2) for each row of ``x``"""
+    centroid_norms = (centroids**2).sum(axis=1)
+    result = np.empty((len(x), n), dtype=np.int64)
+
+    for start in range(0, len(x), chunk_size):
+        block = x[start : start + chunk_size]
+        # ||x||^2 is constant per row and does not change the ranking
+        distances = centroid_norms[None, :] - 2.0 * block @ centroids.T
+        if n == 1:
+            result[start : start + len(block), 0] = distances.argmin(axis=1)
+        else:
+            top = np.argpartition(distances, n - 1, axis=1)[:, :n]
+            order = np.take_along_axis(distances, top, axis=1).argsort(axis=1)
+            result[start : start + len(block)] = np.take_along_axis(top, order, 1)
+
+    return result
+
+
+def kmeans(
+    x: np.ndarray,
+    k: int,
+    n_iter: int = 20,
+    seed: Optional[int] = 0,
+) -> np.ndarray:
+    """Lloyd's k-means, returning a ``(k, dim)`` float32 centroid matrix"""
+    x = np.ascontiguousarray(x, dtype=np.float32)
+    if len(x) < k:
+        raise ValueError(f"Need at least {k} training vectors, got {len(x)}")
+
+    rng = np.random.default_rng(seed)
+    centroids = x[rng.choice(len(x), size=k, replace=False)].copy()
+
+    for _ in range(n_iter):
+        assignment = nearest_centroids(x, centroids)[:, 0]
+        counts = np.bincount(assignment, minlength=k)
+
+        nonempty = counts > 0
+        order = np.argsort(assignment, kind="stable")
+        starts = np.concatenate([[0], np.cumsum(counts)[:-1]])
+        sums = np.add.reduceat(x[order], starts[nonempty], axis=0)
+        centroids[nonempty] = sums / counts[nonempty, None]
+
+        # Re-seed empty clusters from random training points
+        empty = np.flatnonzero(~nonempty)
+        if len(empty):
+            centroids[empty] = x[rng.choice(len(x), size=len(empty), replace=False)]
+
+    return centroids
@@ -0,0 +1,226 @@
+"""Shingling, MinHash signatures and LSH banding for near-duplicate text"""
+
+import re
+import zlib
+from pathlib import Path
+from typing import Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .storage import AppendOnlyArray
+
+_WORD = re.compile(r"\w+")
+# Odd multiplier used to roll token hashes into shingle hashes
+_ROLL = np.uint64(0x9E3779B97F4A7C15)
+SHINGLE_CHUNK = 8192
+# Signature value of texts without shingles; real MinHash values never fill
+# a whole signature with it
+EMPTY_VALUE = np.iinfo(np.uint32).max
+
+
+def shingle_hashes(text: str, size: int = 5, char_level: bool = False) -> np.ndarray:
+    """
+    Distinct 64-bit hashes of the ``size``-gram shingles of ``text``.
+
+    Word shingles are taken over lowercased ``\\w+`` tokens; character
+    shingles over the lowercased UTF-8 bytes. Texts shorter than one
+    shingle hash as a single shingle of everything they contain.
+    """
+    text = text.lower()
+    if char_level:
+        tokens = np.frombuffer(text.encode("utf-8"), dtype=np.uint8).astype(np.uint64)
+    else:
+        words = _WORD.findall(text)
+        tokens = np.fromiter(
+            (zlib.crc32(w.encode("utf-8")) for w in words),
+            dtype=np.uint64,
+            count=len(words),
+        )
+    if len(tokens) == 0:
+        return np.empty(0, dtype=np.uint64)
+
+    size = min(size, len(tokens))
+    powers = _ROLL ** np.arange(size, dtype=np.uint64)
+    windows = np.lib.stride_tricks.sliding_window_view(tokens, size)
+    # Polynomial rolling hash; uint64 arithmetic wraps modulo 2**64
+    return np.unique((windows * powers).sum(axis=1, dtype=np.uint64))
+
+
+def optimal_bands(threshold: float, num_perm: int) -> Tuple[int, int]:
+    """
+    ``(bands, rows)`` minimizing false positives plus false negatives.
+
+    A pair with Jaccard similarity ``s`` shares at least one band with
+    probability ``1 - (1 - s**rows)**bands``; the split of ``num_perm``
+    balances that curve around ``threshold``.
+    """
+    s = np.linspace(0.0, 1.0, 1001)
+    best, best_error = (1, num_perm), np.inf
+    for bands in range(1, num_perm + 1):
+        rows = num_perm // bands
+        collide = 1.0 - (1.0 - s**rows) ** bands
+        # Mean over a uniform grid approximates the integral over [0, 1]
+        error = np.where(s < threshold, collide, 1.0 - collide).mean()
+        if error < best_error:
+            best, best_error = (bands, rows), error
+    return best
+
+
+class MinHashLSH:
+    """
+    MinHash signatures with an LSH banding index over text shingles.
+
+    Each document is reduced to ``num_perm`` MinHash values computed with
+    vectorized multiply-shift hashing over its shingle hashes, so the
+    fraction of equal values estimates Jaccard similarity of the shingle
+    sets. Signatures are split into ``bands`` of ``rows`` values, and each
+    band is hashed to a single key; documents sharing any band key are
+    candidate pairs. The default banding is tuned so pairs above
+    ``threshold`` are very likely to collide and pairs well below it are
+    not.
+
+    When created with a ``path``, signatures and band keys are appended to
+    raw files in that directory and read back memory-mapped.
+
+    Texts without any shingle (empty, whitespace or punctuation only) all
+    get the same placeholder signature; they are kept in the index so ids
+    stay aligned with the input, but never collide with anything.
+    """
+
+    def __init__(
+        self,
+        num_perm: int = 128,
+        threshold: float = 0.5,
+        shingle_size: int = 5,
+        char_level: bool = False,
+        bands: Optional[int] = None,
+        seed: int = 0,
+        path: Optional[Union[str, Path]] = None,
+    ) -> None:
+        self.num_perm = num_perm
+        self.threshold = threshold
+        self.shingle_size = shingle_size
+        self.char_level = char_level
+        if bands is None:
+            self.bands, self.rows = optimal_bands(threshold, num_perm)
+        else:
+            self.bands, self.rows = bands, num_perm // bands
+        if self.bands * self.rows > num_perm or self.rows < 1:
+            raise ValueError(f"Cannot split {num_perm} permutations into {bands} bands")
+
+        rng = np.random.default_rng(seed)
+        # Multiply-shift hash family: odd multipliers, random offsets
+        self._a = rng.integers(0, 2**63, num_perm, dtype=np.uint64) * 2 + 1
+        self._b = rng.integers(0, 2**63, num_perm, dtype=np.uint64)
+        self._band_mix = rng.integers(0, 2**63, self.rows, dtype=np.uint64) * 2 + 1
+
+        self.path = Path(path) if path is not None else None
+        if self.path is not None:
+            self.path.mkdir(parents=True, exist_ok=True)
+        self._signatures = AppendOnlyArray(
+            np.uint32, num_perm, self.path / "signatures.u32" if self.path else None
+        )
+        self._band_keys = AppendOnlyArray(
+            np.uint64, self.bands, self.path / "band_keys.u64" if self.path else None
+        )
+
+    def __len__(self) -> int:
+        return len(self._signatures)
+
+    @property
+    def signatures(self) -> np.ndarray:
+        return self._signatures.array
+
+    def signature(self, text: str) -> np.ndarray:
+        """MinHash signature of one text (all-max for texts without shingles)"""
+        hashes = shingle_hashes(text, self.shingle_size, self.char_level)
+        if len(hashes) == 0:
+            return np.full(self.num_perm, EMPTY_VALUE, dtype=np.uint32)
+        signature = np.full(self.num_perm, np.iinfo(np.uint64).max, dtype=np.uint64)
+        # Bound the (num_perm, chunk) intermediate for very long documents
+        for start in range(0, len(hashes), SHINGLE_CHUNK):
+            chunk = hashes[None, start : start + SHINGLE_CHUNK]
+            values = (self._a[:, None] * chunk + self._b[:, None]) >> np.uint64(32)
+            np.minimum(signature, values.min(axis=1), out=signature)
+        return signature.astype(np.uint32)
+
+    @staticmethod
+    def is_empty(signatures: np.ndarray) -> np.ndarray:
+        """Mask of the rows of ``signatures`` that belong to texts without shingles"""
+        empty: np.ndarray = (signatures == EMPTY_VALUE).all(axis=-1)
+        return empty
+
+    def signatures_for(self, texts: Iterable[str]) -> np.ndarray:
+        rows = [self.signature(text) for text in texts]
+        if not rows:
+            return np.empty((0, self.num_perm), dtype=np.uint32)
+        return np.stack(rows)
+
+    def band_keys(self, signatures: np.ndarray) -> np.ndarray:
+        """One 64-bit key per band for each signature"""
+        bands = signatures[:, : self.bands * self.rows].astype(np.uint64)
+        bands = bands.reshape(len(signatures), self.bands, self.rows)
+        keys: np.ndarray = (bands * self._band_mix).sum(axis=2, dtype=np.uint64)
+        return keys
+
+    def add(self, texts: Iterable[str]) -> np.ndarray:
+        """Index ``texts`` and return their ids (consecutive from ``len(self)``)"""
+        start = len(self)
+        signatures = self.signatures_for(texts)
+        self._signatures.append(signatures)
+        self._band_keys.append(self.band_keys(signatures))
+        return np.arange(start, start + len(signatures))
+
+    def query(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        """``(ids, jaccard_estimates)`` of indexed documents colliding with ``text``"""
+        signature = self.signature(text)
+        if self.is_empty(signature):
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64)
+        keys = self.band_keys(signature[None, :])
+        ids = np.flatnonzero((self._band_keys.array == keys).any(axis=1))
+        ids = ids[~self.is_empty(self.signatures[ids])]
+        estimates = (self.signatures[ids] == signature).mean(axis=1)
+        order = np.argsort(-estimates, kind="stable")
+        return ids[order], estimates[order]
+
+    def candidate_pairs(
+        self, min_jaccard: Optional[float] = None
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        All ``(i, j)`` pairs with ``i < j`` sharing a band, with Jaccard estimates.
+
+        Pairs are found by sorting each band's keys and expanding every
+        bucket with more than one document. Texts without shingles are left
+        out. ``min_jaccard`` drops candidates whose estimated similarity is
+        below it.
+        """
+        n = len(self)
+        # Empty texts share one signature and would otherwise all collide
+        ids = np.flatnonzero(~self.is_empty(self.signatures))
+        band_keys = self._band_keys.array[ids]
+        found: List[np.ndarray] = []
+        for band in range(self.bands):
+            keys = band_keys[:, band]
+            local_order = np.argsort(keys, kind="stable")
+            sorted_keys = keys[local_order]
+            order = ids[local_order]
+            boundaries = np.flatnonzero(np.diff(sorted_keys)) + 1
+            starts = np.concatenate([[0], boundaries])
+            sizes = np.diff(np.concatenate([starts, [len(ids)]]))
+            for start, size in zip(starts[sizes > 1], sizes[sizes > 1]):
+                members = np.sort(order[start : start + size])
+                i, j = np.triu_indices(size, 1)
+                found.append(members[i] * n + members[j])
+
+        if not found:
+            return np.empty((0, 2), dtype=np.int64), np.empty(0, dtype=np.float32)
+        codes = np.unique(np.concatenate(found))
+        pairs = np.stack([codes // n, codes % n], axis=1).astype(np.int64)
+        signatures = self.signatures
+        estimates = (signatures[pairs[:, 0]] == signatures[pairs[:, 1]]).mean(
+            axis=1, dtype=np.float32
+        )
+        if min_jaccard is not None:
+            keep = estimates >= min_jaccard
+            pairs, estimates = pairs[keep], estimates[keep]
+        return pairs, estimates
@@ -0,0 +1,75 @@
+"""Product quantization for compressed vector storage"""
+
+from typing import Optional
+
+import numpy as np
+
+from .kmeans import kmeans, nearest_centroids
+
+
+class ProductQuantizer:
+    """
+    Product quantizer splitting vectors into ``num_subvectors`` sub-spaces.
+
+    Each sub-space gets its own codebook of ``2 ** nbits`` centroids, so a
+    vector is stored as ``num_subvectors`` one-byte codes.
+    """
+
+    def __init__(self, dim: int, num_subvectors: int, nbits: int = 8) -> None:
+        if dim % num_subvectors != 0:
+            raise ValueError(
+                f"dim ({dim}) must be divisible by num_subvectors ({num_subvectors})"
+            )
+        if not 1 <= nbits <= 8:
+            raise ValueError("nbits must be between 1 and 8")
+
+        self.dim = dim
+        self.num_subvectors = num_subvectors
+        self.nbits = nbits
+        self.ksub = 2**nbits
+        self.dsub = dim // num_subvectors
+        self.codebooks: Optional[np.ndarray] = None  # (M, ksub, dsub)
+
+    @property
+    def is_trained(self) -> bool:
+        return self.codebooks is not None
+
+    def _split(self, x: np.ndarray) -> np.ndarray:
+        return x.reshape(len(x), self.num_subvectors, self.dsub)
+
+    def train(self, x: np.ndarray, n_iter: int = 20, seed: Optional[int] = 0) -> None:
+        """Learn one codebook per sub-space"""
+        sub = self._split(np.asarray(x, dtype=np.float32))
+        self.codebooks = np.stack(
+            [
+                kmeans(sub[:, m], self.ksub, n_iter=n_iter, seed=seed)
+                for m in range(self.num_subvectors)
+            ]
+        )
+
+    def encode(self, x: np.ndarray) -> np.ndarray:
+        """Encode vectors as ``(n, num_subvectors)`` uint8 codes"""
+        assert self.codebooks is not None, "ProductQuantizer is not trained"
+        sub = self._split(np.asarray(x, dtype=np.float32))
+        codes = np.empty((len(x), self.num_subvectors), dtype=np.uint8)
+        for m in range(self.num_subvectors):
+            codes[:, m] = nearest_centroids(sub[:, m], self.codebooks[m])[:, 0]
+        return codes
+
+    def decode(self, codes: np.ndarray) -> np.ndarray:
+        """Reconstruct approximate vectors from codes"""
+        assert self.codebooks is not None, "ProductQuantizer is not trained"
+        parts = [self.codebooks[m][codes[:, m]] for m in range(self.num_subvectors)]
+        return np.concatenate(parts, axis=1)
+
+    def inner_product_table(self, query: np.ndarray) -> np.ndarray:
+        """Per-sub-space inner products between a query and every codeword"""
+        assert self.codebooks is not None, "ProductQuantizer is not trained"
+        sub = query.reshape(self.num_subvectors, 1, self.dsub)
+        table: np.ndarray = (self.codebooks * sub).sum(axis=2)  # (M, ksub)
+        return table
+
+    def score(self, table: np.ndarray, codes: np.ndarray) -> np.ndarray:
+        """Asymmetric inner-product scores of coded vectors against a table"""
+        scores: np.ndarray = table[np.arange(self.num_subvectors), codes].sum(axis=1)
+        return scores
@@ -0,0 +1,278 @@
+"""Blocked all-pairs similarity over style embeddings"""
+
+import json
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, Mapping, Optional, Tuple, Union, cast
+
+import numpy as np
+
+from .ivf import _normalize
+from .storage import AppendOnlyArray
+
+logger = logging.getLogger("textforensics")
+
+METRICS = ("cosine", "dot")
+META_FILE = "meta.json"
+TOPK_IDS_FILE = "topk_ids.npy"
+TOPK_SCORES_FILE = "topk_scores.npy"
+PAIRS_FILE = "pairs.i64"
+PAIR_SCORES_FILE = "pair_scores.f32"
+LOG_INTERVAL_S = 30.0
+
+
+class SimilarityResult:
+    """
+    Sparse all-pairs result.
+
+    ``topk_ids``/``topk_scores`` hold each row's ``k`` best matches, best
+    first, padded with ``-1``/``-inf`` when there are fewer candidates.
+    ``pairs`` lists every ``(i, j)`` with ``i < j`` whose similarity reached
+    the threshold, with their scores in ``pair_scores``. Arrays are
+    memory-mapped when the result was written to disk.
+    """
+
+    def __init__(
+        self,
+        topk_ids: np.ndarray,
+        topk_scores: np.ndarray,
+        pairs: np.ndarray,
+        pair_scores: np.ndarray,
+    ) -> None:
+        self.topk_ids = topk_ids
+        self.topk_scores = topk_scores
+        self.pairs = pairs
+        self.pair_scores = pair_scores
+
+    def __len__(self) -> int:
+        return len(self.topk_ids)
+
+    @classmethod
+    def load(cls, path: Union[str, Path]) -> "SimilarityResult":
+        """Open a result written by ``SimilarityEngine.all_pairs``"""
+        path = Path(path)
+        pairs = AppendOnlyArray(np.int64, 2, path / PAIRS_FILE)
+        pair_scores = AppendOnlyArray(np.float32, 1, path / PAIR_SCORES_FILE)
+        return cls(
+            np.load(path / TOPK_IDS_FILE, mmap_mode="r"),
+            np.load(path / TOPK_SCORES_FILE, mmap_mode="r"),
+            pairs.array,
+            pair_scores.array[:, 0],
+        )
+
+
+class SimilarityEngine:
+    """
+    All-pairs similarity that never materializes the N x N matrix.
+
+    Scores follow the ``similarity_scoring`` head: ``cosine`` L2-normalizes
+    the embeddings and ``dot`` uses raw inner products, and both are divided
+    by ``temperature``. Rows are split into blocks of ``block_size``; each
+    worker thread takes one row block and multiplies it against every column
+    block, folding each tile into the row's running top-k and collecting
+    pairs whose unscaled similarity is at least ``threshold``. Peak memory
+    is about ``num_workers * block_size**2`` floats on top of the embeddings
+    and the sparse result.
+
+    Matmuls and partial sorts release the GIL, so tiles run in parallel
+    across cores. Each worker also lets BLAS spawn its own threads; setting
+    ``OMP_NUM_THREADS=1`` avoids oversubscription when ``num_workers``
+    already matches the core count.
+    """
+
+    def __init__(
+        self,
+        metric: str = "cosine",
+        temperature: float = 1.0,
+        block_size: int = 2048,
+        num_workers: Optional[int] = None,
+    ) -> None:
+        if metric not in METRICS:
+            raise ValueError(f"Unknown similarity metric: {metric}")
+        if temperature <= 0:
+            raise ValueError(f"temperature must be positive, got {temperature}")
+        self.metric = metric
+        self.temperature = temperature
+        self.block_size = block_size
+        self.num_workers = num_workers or os.cpu_count() or 1
+
+    @classmethod
+    def from_config(cls, config: Any, **kwargs: Any) -> "SimilarityEngine":
+        """Build from a model config or its ``similarity_scoring`` head config"""
+        task_heads = getattr(config, "task_heads", None)
+        head: Mapping[str, Any] = (
+            task_heads.get("similarity_scoring", {}) if task_heads else config
+        )
+        return cls(
+            metric=head.get("metric", "cosine"),
+            temperature=head.get("temperature", 1.0),
+            **kwargs,
+        )
+
+    def _prepare(self, embeddings: np.ndarray) -> np.ndarray:
+        if self.metric == "cosine":
+            return _normalize(embeddings)
+        return np.ascontiguousarray(np.atleast_2d(embeddings), dtype=np.float32)
+
+    def score_pairs(self, embeddings: np.ndarray, pairs: np.ndarray) -> np.ndarray:
+        """Temperature-scaled scores of the given ``(i, j)`` row pairs"""
+        x = self._prepare(embeddings)
+        pairs = np.asarray(pairs, dtype=np.int64).reshape(-1, 2)
+        scores: np.ndarray = np.einsum("ij,ij->i", x[pairs[:, 0]], x[pairs[:, 1]])
+        return scores / np.float32(self.temperature)
+
+    def _row_block(
+        self,
+        x: np.ndarray,
+        start: int,
+        k: int,
+        threshold: Optional[float],
+        exclude_self: bool,
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """Top-k and above-threshold pairs for rows ``start:start+block_size``"""
+        rows = x[start : start + self.block_size]
+        n = len(rows)
+        best_scores = np.full((n, k), -np.inf, dtype=np.float32)
+        best_ids = np.full((n, k), -1, dtype=np.int64)
+        pairs, pair_scores = [], []
+
+        for col_start in range(0, len(x), self.block_size):
+            tile = rows @ x[col_start : col_start + self.block_size].T
+
+            if threshold is not None and col_start + tile.shape[1] > start + 1:
+                hits = tile >= threshold
+                if col_start < start + n:
+                    # Only keep i < j so every pair is reported once
+                    i = np.arange(n)[:, None] + start
+                    j = np.arange(tile.shape[1])[None, :] + col_start
+                    hits &= j > i
+                if hits.any():
+                    r, c = np.nonzero(hits)
+                    pairs.append(np.stack([r + start, c + col_start], axis=1))
+                    pair_scores.append(tile[r, c])
+
+            if exclude_self:
+                diagonal = np.arange(
+                    max(start, col_start), min(start + n, col_start + tile.shape[1])
+                )
+                tile[diagonal - start, diagonal - col_start] = -np.inf
+
+            # Only rows where the tile beats the current k-th best need a merge
+            update = np.flatnonzero(tile.max(axis=1) > best_scores.min(axis=1))
+            if len(update) == 0:
+                continue
+            tile = tile[update]
+            top = min(k, tile.shape[1])
+            candidates = np.argpartition(tile, -top, axis=1)[:, -top:]
+            merged_scores = np.concatenate(
+                [best_scores[update], np.take_along_axis(tile, candidates, axis=1)],
+                axis=1,
+            )
+            merged_ids = np.concatenate(
+                [best_ids[update], candidates + col_start], axis=1
+            )
+            keep = np.argpartition(merged_scores, -k, axis=1)[:, -k:]
+            best_scores[update] = np.take_along_axis(merged_scores, keep, axis=1)
+            best_ids[update] = np.take_along_axis(merged_ids, keep, axis=1)
+
+        order = np.argsort(-best_scores, axis=1, kind="stable")
+        best_scores = np.take_along_axis(best_scores, order, axis=1)
+        best_ids = np.take_along_axis(best_ids, order, axis=1)
+        best_ids[np.isneginf(best_scores)] = -1
+        best_scores /= self.temperature
+
+        if pairs:
+            block_pairs = np.concatenate(pairs)
+            block_pair_scores = np.concatenate(pair_scores) / self.temperature
+        else:
+            block_pairs = np.empty((0, 2), dtype=np.int64)
+            block_pair_scores = np.empty(0, dtype=np.float32)
+        return best_ids, best_scores, block_pairs, block_pair_scores
+
+    def all_pairs(
+        self,
+        embeddings: np.ndarray,
+        k: int = 10,
+        threshold: Optional[float] = None,
+        exclude_self: bool = True,
+        output: Optional[Union[str, Path]] = None,
+    ) -> SimilarityResult:
+        """
+        Compute each row's top-``k`` neighbours and all pairs above ``threshold``.
+
+        ``threshold`` is compared with the unscaled similarity (e.g. cosine in
+        ``[-1, 1]``); returned scores are divided by ``temperature``. With
+        ``output``, the result is written to that directory as it is computed
+        (top-k as ``.npy``, pairs as raw append-only files) and returned
+        memory-mapped; reopen it with ``SimilarityResult.load``.
+        """
+        x = self._prepare(embeddings)
+        n = len(x)
+        if k < 1:
+            raise ValueError(f"k must be at least 1, got {k}")
+
+        path = Path(output) if output is not None else None
+        topk_ids: np.ndarray
+        topk_scores: np.ndarray
+        if path is not None:
+            path.mkdir(parents=True, exist_ok=True)
+            for name in (PAIRS_FILE, PAIR_SCORES_FILE):
+                (path / name).unlink(missing_ok=True)
+            topk_ids = np.lib.format.open_memmap(
+                path / TOPK_IDS_FILE, mode="w+", dtype=np.int64, shape=(n, k)
+            )
+            topk_scores = np.lib.format.open_memmap(
+                path / TOPK_SCORES_FILE, mode="w+", dtype=np.float32, shape=(n, k)
+            )
+        else:
+            topk_ids = np.empty((n, k), dtype=np.int64)
+            topk_scores = np.empty((n, k), dtype=np.float32)
+        pairs = AppendOnlyArray(np.int64, 2, path / PAIRS_FILE if path else None)
+        pair_scores = AppendOnlyArray(
+            np.float32, 1, path / PAIR_SCORES_FILE if path else None
+        )
+
+        starts = range(0, n, self.block_size)
+        start_time = last_log = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=self.num_workers) as executor:
+            # ``map`` yields in row order, so pairs are appended sorted by row
+            blocks = executor.map(
+                lambda s: self._row_block(x, s, k, threshold, exclude_self), starts
+            )
+            for done, (start, block) in enumerate(zip(starts, blocks), start=1):
+                ids, scores, block_pairs, block_pair_scores = block
+                topk_ids[start : start + len(ids)] = ids
+                topk_scores[start : start + len(ids)] = scores
+                pairs.append(block_pairs)
+                pair_scores.append(block_pair_scores)
+                if time.perf_counter() - last_log > LOG_INTERVAL_S:
+                    last_log = time.perf_counter()
+                    logger.info(f"{done}/{len(starts)} row blocks done")
+
+        elapsed = time.perf_counter() - start_time
+        logger.info(
+            f"All-pairs similarity over {n} rows in {elapsed:.1f}s, "
+            f"{len(pairs)} pairs above threshold"
+        )
+        if path is None:
+            return SimilarityResult(
+                topk_ids, topk_scores, pairs.array, pair_scores.array[:, 0]
+            )
+
+        cast(np.memmap, topk_ids).flush()
+        cast(np.memmap, topk_scores).flush()
+        meta: Dict[str, Any] = {
+            "num_rows": n,
+            "k": k,
+            "threshold": threshold,
+            "exclude_self": exclude_self,
+            "metric": self.metric,
+            "temperature": self.temperature,
+            "num_pairs": len(pairs),
+        }
+        with open(path / META_FILE, "w") as f:
+            json.dump(meta, f, indent=2)
+        return SimilarityResult.load(path)
@@ -0,0 +1,59 @@
+"""Append-only array storage for vector indexes and caches"""
+
+from pathlib import Path
+from typing import Any, List, Optional
+
+import numpy as np
+
+
+class AppendOnlyArray:
+    """Append-only 2D array, kept in memory or in a raw memory-mapped file"""
+
+    def __init__(self, dtype: Any, width: int, path: Optional[Path] = None) -> None:
+        self.dtype: np.dtype = np.dtype(dtype)
+        self.width = width
+        self.path = path
+        self._chunks: List[np.ndarray] = []
+        self._view: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        if self.path is not None:
+            if not self.path.exists():
+                return 0
+            return self.path.stat().st_size // (self.dtype.itemsize * self.width)
+        return sum(len(chunk) for chunk in self._chunks)
+
+    def append(self, rows: np.ndarray) -> None:
+        rows = np.ascontiguousarray(rows, dtype=self.dtype).reshape(-1, self.width)
+        if self.path is not None:
+            with open(self.path, "ab") as f:
+                f.write(rows.tobytes())
+        else:
+            self._chunks.append(rows)
+        self._view = None
+
+    def truncate(self, n: int) -> None:
+        """Drop rows past ``n``, e.g. ones written by an interrupted append"""
+        if len(self) <= n:
+            return
+        if self.path is not None:
+            with open(self.path, "r+b") as f:
+                f.truncate(n * self.dtype.itemsize * self.width)
+        else:
+            self._chunks = [self.array[:n]]
+        self._view = None
+
+    @property
+    def array(self) -> np.ndarray:
+        if self._view is None:
+            n = len(self)
+            if n == 0:
+                self._view = np.empty((0, self.width), dtype=self.dtype)
+            elif self.path is not None:
+                self._view = np.memmap(
+                    self.path, dtype=self.dtype, mode="r", shape=(n, self.width)
+                )
+            else:
+                self._view = np.concatenate(self._chunks)
+                self._chunks = [self._view]
+        return self._view
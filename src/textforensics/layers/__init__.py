@@ -1 +1,10 @@
-# Custom layers will be implemented here
+"""TextForensics Layers Package"""
+
+from .decoder import KVCache, StyleTransferDecoder
+from .pooling import AttentionPooling
+
+__all__ = [
+    "AttentionPooling",
+    "KVCache",
+    "StyleTransferDecoder",
+]
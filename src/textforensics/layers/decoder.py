@@ -0,0 +1,465 @@
+"""Transformer decoder with key/value caching for style transfer"""
+
+from typing import List, Optional, Tuple, cast
+
+import torch
+import torch.nn as nn
+import torch.nn.functional as F
+
+
+class KVCache:
+    """
+    Key/value tensors of every decoder layer for incremental decoding.
+
+    Self-attention keys and values are written into buffers preallocated
+    for ``max_length`` positions, so each step appends in place instead of
+    concatenating. Cross-attention keys and values over the encoder output
+    are computed once and reused for every step.
+    """
+
+    def __init__(
+        self,
+        cross: List[Tuple[torch.Tensor, torch.Tensor]],
+        memory_mask: torch.Tensor,
+        num_heads: int,
+        head_dim: int,
+        max_length: int,
+    ) -> None:
+        batch_size = memory_mask.shape[0]
+        reference = cross[0][0]
+        shape = (len(cross), batch_size, num_heads, max_length, head_dim)
+        self.keys = reference.new_empty(shape)
+        self.values = reference.new_empty(shape)
+        self.cross = cross
+        self.memory_mask = memory_mask
+        self.length = 0
+
+    def __len__(self) -> int:
+        return self.length
+
+    def update(
+        self, layer: int, key: torch.Tensor, value: torch.Tensor
+    ) -> Tuple[torch.Tensor, torch.Tensor]:
+        """Store one step's ``(B, H, 1, D)`` key/value and return all so far"""
+        self.keys[layer, :, :, self.length] = key[:, :, 0]
+        self.values[layer, :, :, self.length] = value[:, :, 0]
+        end = self.length + 1
+        return self.keys[layer, :, :, :end], self.values[layer, :, :, :end]
+
+    def reorder(self, index: torch.Tensor) -> None:
+        """Keep (and reorder) batch rows, e.g. surviving beams or sequences"""
+        self.keys = self.keys.index_select(1, index)
+        self.values = self.values.index_select(1, index)
+        self.cross = [
+            (k.index_select(0, index), v.index_select(0, index)) for k, v in self.cross
+        ]
+        self.memory_mask = self.memory_mask.index_select(0, index)
+
+
+class MultiHeadAttention(nn.Module):
+    """Multi-head attention over ``scaled_dot_product_attention``"""
+
+    def __init__(self, hidden_size: int, num_heads: int, dropout: float) -> None:
+        super().__init__()
+        if hidden_size % num_heads:
+            raise ValueError(
+                f"hidden_size {hidden_size} is not divisible by {num_heads} heads"
+            )
+        self.num_heads = num_heads
+        self.head_dim = hidden_size // num_heads
+        self.dropout = dropout
+        self.query = nn.Linear(hidden_size, hidden_size)
+        self.key = nn.Linear(hidden_size, hidden_size)
+        self.value = nn.Linear(hidden_size, hidden_size)
+        self.output = nn.Linear(hidden_size, hidden_size)
+
+    def _split(self, x: torch.Tensor) -> torch.Tensor:
+        batch_size, length, _ = x.shape
+        return x.view(batch_size, length, self.num_heads, self.head_dim).transpose(1, 2)
+
+    def project_kv(self, x: torch.Tensor) -> Tuple[torch.Tensor, torch.Tensor]:
+        """``(B, H, L, D)`` keys and values of ``x``"""
+        return self._split(self.key(x)), self._split(self.value(x))
+
+    def attend(
+        self,
+        x: torch.Tensor,
+        key: torch.Tensor,
+        value: torch.Tensor,
+        mask: Optional[torch.Tensor] = None,
+        is_causal: bool = False,
+    ) -> torch.Tensor:
+        """Attend from ``x`` to precomputed keys/values; ``mask`` is True to keep"""
+        query = self._split(self.query(x))
+        context = F.scaled_dot_product_attention(
+            query,
+            key,
+            value,
+            attn_mask=mask,
+            dropout_p=self.dropout if self.training else 0.0,
+            is_causal=is_causal,
+        )
+        batch_size, _, length, _ = context.shape
+        output: torch.Tensor = self.output(
+            context.transpose(1, 2).reshape(batch_size, length, -1)
+        )
+        return output
+
+
+class DecoderLayer(nn.Module):
+    """Pre-norm decoder block: causal self-attention, cross-attention, FFN"""
+
+    def __init__(
+        self, hidden_size: int, num_heads: int, intermediate_size: int, dropout: float
+    ) -> None:
+        super().__init__()
+        self.self_attention = MultiHeadAttention(hidden_size, num_heads, dropout)
+        self.cross_attention = MultiHeadAttention(hidden_size, num_heads, dropout)
+        self.feed_forward = nn.Sequential(
+            nn.Linear(hidden_size, intermediate_size),
+            nn.GELU(),
+            nn.Linear(intermediate_size, hidden_size),
+        )
+        self.self_norm = nn.LayerNorm(hidden_size)
+        self.cross_norm = nn.LayerNorm(hidden_size)
+        self.output_norm = nn.LayerNorm(hidden_size)
+        self.dropout = nn.Dropout(dropout)
+
+    def forward(
+        self,
+        x: torch.Tensor,
+        cross_kv: Tuple[torch.Tensor, torch.Tensor],
+        memory_mask: torch.Tensor,
+        cache: Optional[KVCache] = None,
+        layer: int = 0,
+    ) -> torch.Tensor:
+        h = self.self_norm(x)
+        key, value = self.self_attention.project_kv(h)
+        if cache is None:
+            attended = self.self_attention.attend(h, key, value, is_causal=True)
+        else:
+            # One new position attends to everything cached before it
+            key, value = cache.update(layer, key, value)
+            attended = self.self_attention.attend(h, key, value)
+        x = x + self.dropout(attended)
+
+        h = self.cross_norm(x)
+        attended = self.cross_attention.attend(h, *cross_kv, mask=memory_mask)
+        x = x + self.dropout(attended)
+        output: torch.Tensor = x + self.dropout(self.feed_forward(self.output_norm(x)))
+        return output
+
+
+class _Hypotheses:
+    """Finished beam hypotheses of one batch item, best ``num_beams`` kept"""
+
+    def __init__(self, num_beams: int, length_penalty: float) -> None:
+        self.num_beams = num_beams
+        self.length_penalty = length_penalty
+        self.beams: List[Tuple[float, torch.Tensor]] = []
+
+    def add(self, tokens: torch.Tensor, log_prob: float) -> None:
+        score = log_prob / len(tokens) ** self.length_penalty
+        self.beams.append((score, tokens))
+        self.beams.sort(key=lambda beam: beam[0], reverse=True)
+        del self.beams[self.num_beams :]
+
+    def is_done(self, best_log_prob: float, length: int) -> bool:
+        """Whether no running beam can still beat the worst kept hypothesis"""
+        if len(self.beams) < self.num_beams:
+            return False
+        return bool(best_log_prob / length**self.length_penalty <= self.beams[-1][0])
+
+
+class StyleTransferDecoder(nn.Module):
+    """
+    Autoregressive transformer decoder conditioned on the encoder output.
+
+    Every decoder position cross-attends to the backbone's sequence output
+    and adds a projection of a (target) style embedding to its input, so
+    generation rewrites the source text towards that style. The output
+    projection is tied to the token embeddings.
+
+    ``forward`` runs teacher-forced over whole target sequences for
+    training. ``generate`` decodes incrementally with a ``KVCache``: each
+    step only computes the newest position, so the cost of a step no longer
+    grows with everything generated before it apart from the attention
+    itself.
+    """
+
+    def __init__(
+        self,
+        vocab_size: int,
+        hidden_size: int,
+        style_dim: int,
+        num_layers: int = 6,
+        num_heads: int = 12,
+        intermediate_size: int = 3072,
+        max_length: int = 512,
+        dropout: float = 0.1,
+        bos_token_id: int = 101,
+        eos_token_id: int = 102,
+        pad_token_id: int = 0,
+    ) -> None:
+        super().__init__()
+        self.max_length = max_length
+        self.bos_token_id = bos_token_id
+        self.eos_token_id = eos_token_id
+        self.pad_token_id = pad_token_id
+        self.num_heads = num_heads
+        self.head_dim = hidden_size // num_heads
+
+        self.token_embeddings = nn.Embedding(vocab_size, hidden_size)
+        self.position_embeddings = nn.Embedding(max_length, hidden_size)
+        self.style_projection = nn.Linear(style_dim, hidden_size)
+        self.embedding_dropout = nn.Dropout(dropout)
+        self.layers = nn.ModuleList(
+            DecoderLayer(hidden_size, num_heads, intermediate_size, dropout)
+            for _ in range(num_layers)
+        )
+        self.final_norm = nn.LayerNorm(hidden_size)
+
+    def _embed(
+        self, input_ids: torch.Tensor, style: torch.Tensor, offset: int = 0
+    ) -> torch.Tensor:
+        positions = torch.arange(
+            offset, offset + input_ids.shape[1], device=input_ids.device
+        )
+        x = self.token_embeddings(input_ids) + self.position_embeddings(positions)
+        embedded: torch.Tensor = self.embedding_dropout(
+            x + self.style_projection(style).unsqueeze(1)
+        )
+        return embedded
+
+    def _decoder_layers(self) -> List[DecoderLayer]:
+        return cast(List[DecoderLayer], list(self.layers))
+
+    def _logits(self, x: torch.Tensor) -> torch.Tensor:
+        return F.linear(self.final_norm(x), self.token_embeddings.weight)
+
+    @staticmethod
+    def _memory_mask(attention_mask: torch.Tensor) -> torch.Tensor:
+        return attention_mask[:, None, None, :].bool()
+
+    def forward(
+        self,
+        style: torch.Tensor,
+        memory: Optional[torch.Tensor] = None,
+        memory_mask: Optional[torch.Tensor] = None,
+        decoder_input_ids: Optional[torch.Tensor] = None,
+    ) -> torch.Tensor:
+        """
+        Teacher-forced ``(B, T, vocab)`` logits for ``decoder_input_ids``.
+
+        Without ``decoder_input_ids``, returns the ``(B, vocab)`` logits of
+        the first generated token.
+        """
+        if memory is None:
+            # Style-only conditioning: a single memory slot holding the style
+            memory = self.style_projection(style).unsqueeze(1)
+        if memory_mask is None:
+            memory_mask = torch.ones(memory.shape[:2], device=memory.device)
+        first_token_only = decoder_input_ids is None
+        if decoder_input_ids is None:
+            decoder_input_ids = torch.full(
+                (style.shape[0], 1), self.bos_token_id, device=style.device
+            )
+
+        x = self._embed(decoder_input_ids, style)
+        mask = self._memory_mask(memory_mask)
+        for layer in self._decoder_layers():
+            x = layer(x, layer.cross_attention.project_kv(memory), mask)
+        logits = self._logits(x)
+        return logits[:, 0] if first_token_only else logits
+
+    def init_cache(
+        self, memory: torch.Tensor, memory_mask: torch.Tensor, max_length: int
+    ) -> KVCache:
+        cross = [
+            layer.cross_attention.project_kv(memory) for layer in self._decoder_layers()
+        ]
+        return KVCache(
+            cross,
+            self._memory_mask(memory_mask),
+            self.num_heads,
+            self.head_dim,
+            max_length,
+        )
+
+    def step(
+        self, input_ids: torch.Tensor, style: torch.Tensor, cache: KVCache
+    ) -> torch.Tensor:
+        """``(B, vocab)`` logits after feeding one ``(B,)`` token per row"""
+        x = self._embed(input_ids[:, None], style, offset=len(cache))
+        for index, layer in enumerate(self._decoder_layers()):
+            x = layer(x, cache.cross[index], cache.memory_mask, cache, index)
+        cache.length += 1
+        return self._logits(x[:, 0])
+
+    @torch.no_grad()
+    def generate(
+        self,
+        style: torch.Tensor,
+        memory: Optional[torch.Tensor] = None,
+        memory_mask: Optional[torch.Tensor] = None,
+        max_length: Optional[int] = None,
+        num_beams: int = 1,
+        length_penalty: float = 1.0,
+    ) -> Tuple[torch.Tensor, torch.Tensor]:
+        """
+        Decode ``(sequences, scores)`` with greedy or beam search.
+
+        Sequences start with the BOS token and are right-padded with the pad
+        token after EOS; scores are summed log-probabilities (length
+        normalized for beam search). Finished sequences are removed from the
+        batch and the cache as soon as they end, so later steps only compute
+        the rows still decoding. With ``max_length`` 1 the result is the BOS
+        token alone.
+        """
+        if memory is None:
+            memory = self.style_projection(style).unsqueeze(1)
+        if memory_mask is None:
+            memory_mask = torch.ones(memory.shape[:2], device=memory.device)
+        max_length = min(max_length or self.max_length, self.max_length)
+        if max_length < 1:
+            raise ValueError(f"max_length must be at least 1, got {max_length}")
+        # A BOS-only output leaves nothing to search over
+        if num_beams > 1 and max_length > 1:
+            return self._beam_search(
+                style, memory, memory_mask, max_length, num_beams, length_penalty
+            )
+        return self._greedy(style, memory, memory_mask, max_length)
+
+    def _greedy(
+        self,
+        style: torch.Tensor,
+        memory: torch.Tensor,
+        memory_mask: torch.Tensor,
+        max_length: int,
+    ) -> Tuple[torch.Tensor, torch.Tensor]:
+        batch_size = style.shape[0]
+        device = style.device
+        sequences = torch.full(
+            (batch_size, max_length), self.pad_token_id, dtype=torch.long, device=device
+        )
+        sequences[:, 0] = self.bos_token_id
+        scores = torch.zeros(batch_size, device=device)
+        cache = self.init_cache(memory, memory_mask, max_length)
+        # Original batch rows of the sequences still decoding
+        active = torch.arange(batch_size, device=device)
+        tokens = sequences[:, 0]
+
+        for position in range(1, max_length):
+            log_probs = torch.log_softmax(self.step(tokens, style, cache).float(), -1)
+            token_log_probs, tokens = log_probs.max(dim=-1)
+            sequences[active, position] = tokens
+            scores[active] += token_log_probs
+
+            running = tokens != self.eos_token_id
+            if not running.all():
+                if not running.any():
+                    break
+                keep = running.nonzero().squeeze(1)
+                active, tokens, style = active[keep], tokens[keep], style[keep]
+                cache.reorder(keep)
+        return sequences, scores
+
+    def _beam_search(
+        self,
+        style: torch.Tensor,
+        memory: torch.Tensor,
+        memory_mask: torch.Tensor,
+        max_length: int,
+        num_beams: int,
+        length_penalty: float,
+    ) -> Tuple[torch.Tensor, torch.Tensor]:
+        batch_size = style.shape[0]
+        device = style.device
+        # Rows are (batch item, beam) flattened item-major
+        expand = torch.arange(batch_size, device=device).repeat_interleave(num_beams)
+        style = style[expand]
+        cache = self.init_cache(memory[expand], memory_mask[expand], max_length)
+
+        beams = torch.full(
+            (batch_size * num_beams, 1),
+            self.bos_token_id,
+            dtype=torch.long,
+            device=device,
+        )
+        beam_scores = torch.zeros(batch_size, num_beams, device=device)
+        # Only the first beam is live initially so the beams don't all coincide
+        beam_scores[:, 1:] = float("-inf")
+        hypotheses = [_Hypotheses(num_beams, length_penalty) for _ in range(batch_size)]
+        # Original batch items still decoding
+        active = list(range(batch_size))
+
+        for position in range(1, max_length):
+            log_probs = torch.log_softmax(
+                self.step(beams[:, -1], style, cache).float(), -1
+            )
+            vocab_size = log_probs.shape[-1]
+            candidates = (beam_scores.view(-1, 1) + log_probs).view(len(active), -1)
+            # 2 * num_beams candidates leave enough non-EOS ones to continue
+            top_scores, top_ids = candidates.topk(2 * num_beams, dim=1)
+            top_beams, top_tokens = top_ids // vocab_size, top_ids % vocab_size
+
+            next_rows, next_tokens, next_scores, still_active = [], [], [], []
+            for slot, item in enumerate(active):
+                chosen = 0
+                for score, beam, token in zip(
+                    top_scores[slot].tolist(),
+                    top_beams[slot].tolist(),
+                    top_tokens[slot].tolist(),
+                ):
+                    row = slot * num_beams + beam
+                    if token == self.eos_token_id:
+                        hypotheses[item].add(
+                            torch.cat([beams[row], beams.new_tensor([token])]), score
+                        )
+                    else:
+                        next_rows.append(row)
+                        next_tokens.append(token)
+                        next_scores.append(score)
+                        chosen += 1
+                    if chosen == num_beams:
+                        break
+                best_running = next_scores[-num_beams]
+                if hypotheses[item].is_done(best_running, position + 1):
+                    # Drop this item's beams from the batch
+                    del next_rows[-num_beams:], next_tokens[-num_beams:]
+                    del next_scores[-num_beams:]
+                else:
+                    still_active.append(item)
+
+            if position == max_length - 1 or not still_active:
+                # Out of length: running beams compete with finished ones
+                for slot, item in enumerate(still_active):
+                    for beam in range(num_beams):
+                        index = slot * num_beams + beam
+                        tokens = torch.cat(
+                            [
+                                beams[next_rows[index]],
+                                beams.new_tensor([next_tokens[index]]),
+                            ]
+                        )
+                        hypotheses[item].add(tokens, next_scores[index])
+                break
+
+            rows = torch.tensor(next_rows, device=device)
+            beams = torch.cat(
+                [beams[rows], torch.tensor(next_tokens, device=device)[:, None]], dim=1
+            )
+            beam_scores = torch.tensor(next_scores, device=device).view(-1, num_beams)
+            style = style[rows]
+            cache.reorder(rows)
+            active = still_active
+
+        sequences = torch.full(
+            (batch_size, max_length), self.pad_token_id, dtype=torch.long, device=device
+        )
+        scores = torch.empty(batch_size, device=device)
+        for item, hypothesis in enumerate(hypotheses):
+            score, tokens = hypothesis.beams[0]
+            sequences[item, : len(tokens)] = tokens
+            scores[item] = score
+        return sequences, scores
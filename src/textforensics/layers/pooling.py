@@ -0,0 +1,24 @@
+"""Pooling layers for TextForensics models"""
+
+from typing import Optional
+
+import torch
+import torch.nn as nn
+
+
+class AttentionPooling(nn.Module):
+    """Learned attention-weighted average over a set of vectors"""
+
+    def __init__(self, hidden_size: int) -> None:
+        super().__init__()
+        self.score = nn.Linear(hidden_size, 1)
+
+    def forward(
+        self, hidden_states: torch.Tensor, mask: Optional[torch.Tensor] = None
+    ) -> torch.Tensor:
+        """Pool ``(batch, items, hidden)`` to ``(batch, hidden)``, ignoring masked items"""
+        scores = self.score(hidden_states).squeeze(-1)
+        if mask is not None:
+            scores = scores.masked_fill(~mask.bool(), torch.finfo(scores.dtype).min)
+        weights = torch.softmax(scores, dim=-1)
+        return torch.einsum("bn,bnh->bh", weights, hidden_states)
@@ -1 +1,32 @@
-# Custom losses will be implemented here
+"""TextForensics Losses Package"""
+
+from typing import TYPE_CHECKING
+
+from .._lazy import attach
+
+if TYPE_CHECKING:
+    from .multi_task import (
+        TASK_LABEL_KEYS,
+        MultiTaskLoss,
+        build_loss,
+        build_task_losses,
+        present_tasks,
+    )
+
+_ATTRIBUTES = {
+    "MultiTaskLoss": ".multi_task",
+    "TASK_LABEL_KEYS": ".multi_task",
+    "build_loss": ".multi_task",
+    "build_task_losses": ".multi_task",
+    "present_tasks": ".multi_task",
+}
+
+__getattr__, __dir__ = attach(__name__, _ATTRIBUTES)
+
+__all__ = [
+    "MultiTaskLoss",
+    "TASK_LABEL_KEYS",
+    "build_loss",
+    "build_task_losses",
+    "present_tasks",
+]
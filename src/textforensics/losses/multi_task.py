@@ -0,0 +1,173 @@
+"""Per-task losses and their combination for multi-task training"""
+
+import importlib
+from typing import Any, Dict, List, Mapping, Optional, Sequence
+
+import torch
+import torch.distributed as dist
+import torch.nn as nn
+
+METHODS = ("weighted_sum", "uncertainty_weighting", "adaptive")
+
+# Batch key holding each task's targets; a head only runs when its key is present
+TASK_LABEL_KEYS = {
+    "style_classification": "labels",
+    "anomaly_detection": "anomaly_labels",
+    "similarity_scoring": "similarity_labels",
+    "style_transfer": "decoder_labels",
+}
+
+
+def build_loss(spec: Mapping[str, Any]) -> nn.Module:
+    """
+    Instantiate a ``conf/training/loss`` entry such as
+    ``{"_target_": "torch.nn.CrossEntropyLoss", "ignore_index": -100}``.
+
+    ``null`` arguments are left at the loss's default, and ``weight`` or
+    ``pos_weight`` lists become tensors.
+    """
+    kwargs = {k: v for k, v in spec.items() if k != "_target_" and v is not None}
+    for key in ("weight", "pos_weight"):
+        if key in kwargs:
+            kwargs[key] = torch.tensor(kwargs[key], dtype=torch.float32)
+    module_name, _, class_name = spec["_target_"].rpartition(".")
+    loss_class = getattr(importlib.import_module(module_name), class_name)
+    loss: nn.Module = loss_class(**kwargs)
+    return loss
+
+
+def build_task_losses(loss_config: Mapping[str, Any]) -> Dict[str, nn.Module]:
+    """One loss module per entry of ``task_losses``"""
+    return {
+        task: build_loss(spec)
+        for task, spec in (loss_config.get("task_losses") or {}).items()
+    }
+
+
+class MultiTaskLoss(nn.Module):
+    """
+    Combine per-task losses into one training objective.
+
+    ``weighted_sum`` adds ``w_t * loss_t`` with the configured task weights.
+    ``uncertainty_weighting`` learns a log-variance ``s_t`` per task
+    (Kendall et al., 2018) and adds ``w_t * (exp(-s_t) * loss_t + s_t) / 2``,
+    so tasks with noisier losses are down-weighted; its parameters have to
+    be optimized together with the model. ``adaptive`` is Dynamic Weight
+    Average (Liu et al., 2019): after every epoch each task's weight is
+    scaled by ``num_tasks * softmax(r / temperature)``, where ``r_t`` is the
+    ratio of the task's mean loss over the last two epochs, so tasks whose
+    loss stops falling get more weight.
+
+    Only the tasks present in the ``losses`` passed to ``forward`` are
+    combined, which is what task-grouped batches produce.
+    """
+
+    # Registered buffers; declared so they type as tensors, not Tensor | Module
+    task_weights: torch.Tensor
+    adaptive_weights: torch.Tensor
+    _epoch_sums: torch.Tensor
+    _epoch_counts: torch.Tensor
+
+    def __init__(
+        self,
+        tasks: Sequence[str],
+        task_weights: Optional[Mapping[str, float]] = None,
+        method: str = "weighted_sum",
+        temperature: float = 1.0,
+    ) -> None:
+        super().__init__()
+        if method not in METHODS:
+            raise ValueError(f"Unknown loss combination method: {method}")
+        if temperature <= 0:
+            raise ValueError(f"temperature must be positive, got {temperature}")
+        self.tasks = list(tasks)
+        self.method = method
+        self.temperature = temperature
+        self._index = {task: i for i, task in enumerate(self.tasks)}
+
+        weights = [float((task_weights or {}).get(task, 1.0)) for task in self.tasks]
+        self.register_buffer("task_weights", torch.tensor(weights))
+        self.register_buffer("adaptive_weights", torch.ones(len(self.tasks)))
+        self.log_vars = (
+            nn.Parameter(torch.zeros(len(self.tasks)))
+            if method == "uncertainty_weighting"
+            else None
+        )
+        # Running loss sums of the current epoch and mean losses of the last one
+        self.register_buffer(
+            "_epoch_sums", torch.zeros(len(self.tasks)), persistent=False
+        )
+        self.register_buffer(
+            "_epoch_counts", torch.zeros(len(self.tasks)), persistent=False
+        )
+        self._previous_means: Optional[torch.Tensor] = None
+
+    @classmethod
+    def from_config(
+        cls, loss_config: Mapping[str, Any], tasks: Sequence[str]
+    ) -> "MultiTaskLoss":
+        """Build from ``conf/training/loss/multi_task.yaml``"""
+        combination = loss_config.get("combination") or {}
+        return cls(
+            tasks,
+            task_weights=loss_config.get("task_weights"),
+            method=combination.get("method", "weighted_sum"),
+            temperature=combination.get("temperature", 1.0),
+        )
+
+    def weights(self) -> Dict[str, float]:
+        """Effective weight of every task, for logging"""
+        weights = self.task_weights * self.adaptive_weights
+        if self.log_vars is not None:
+            weights = weights * 0.5 * torch.exp(-self.log_vars.detach())
+        return dict(zip(self.tasks, weights.tolist()))
+
+    def forward(self, losses: Mapping[str, torch.Tensor]) -> torch.Tensor:
+        total: Optional[torch.Tensor] = None
+        for task, loss in losses.items():
+            i = self._index[task]
+            if self.log_vars is not None:
+                log_var = self.log_vars[i]
+                term = (
+                    self.task_weights[i] * 0.5 * (torch.exp(-log_var) * loss + log_var)
+                )
+            else:
+                term = self.task_weights[i] * self.adaptive_weights[i] * loss
+            if self.method == "adaptive" and self.training:
+                self._epoch_sums[i] += loss.detach().float()
+                self._epoch_counts[i] += 1
+            total = term if total is None else total + term
+        if total is None:
+            raise ValueError("No task losses to combine")
+        return total
+
+    def step_epoch(self) -> None:
+        """Update the ``adaptive`` weights from the epoch's mean task losses"""
+        if self.method != "adaptive":
+            return
+        sums, counts = self._epoch_sums.clone(), self._epoch_counts.clone()
+        if dist.is_available() and dist.is_initialized():
+            dist.all_reduce(sums)
+            dist.all_reduce(counts)
+        means = torch.where(counts > 0, sums / counts.clamp(min=1), torch.nan)
+
+        if self._previous_means is not None:
+            ratios = means / self._previous_means
+            # Tasks not seen in both epochs keep a neutral ratio
+            ratios = torch.where(
+                torch.isfinite(ratios), ratios, torch.ones_like(ratios)
+            )
+            self.adaptive_weights.copy_(
+                len(self.tasks) * torch.softmax(ratios / self.temperature, dim=0)
+            )
+        self._previous_means = means
+        self._epoch_sums.zero_()
+        self._epoch_counts.zero_()
+
+    def extra_repr(self) -> str:
+        return f"tasks={self.tasks}, method={self.method}"
+
+
+def present_tasks(batch: Mapping[str, Any], tasks: Sequence[str]) -> List[str]:
+    """The ``tasks`` whose labels are in ``batch``"""
+    return [task for task in tasks if TASK_LABEL_KEYS.get(task, task) in batch]
@@ -1,13 +1,35 @@
 """TextForensics Models Package"""
 
-# Base classes
-from .base import BaseTextForensicsModel, TextForensicsConfig
+from typing import TYPE_CHECKING
 
-# Core models
-from .unified_model import TextForensicsUnifiedModel
+from .._lazy import attach
+
+if TYPE_CHECKING:
+    # Base classes
+    from .base import BaseTextForensicsModel, TextForensicsConfig
+
+    # Output selection
+    from .outputs import GENERATIVE_TASKS, OutputSpec, scoring_tasks
+
+    # Core models
+    from .unified_model import TextForensicsUnifiedModel
+
+_ATTRIBUTES = {
+    "BaseTextForensicsModel": ".base",
+    "TextForensicsConfig": ".base",
+    "GENERATIVE_TASKS": ".outputs",
+    "OutputSpec": ".outputs",
+    "scoring_tasks": ".outputs",
+    "TextForensicsUnifiedModel": ".unified_model",
+}
+
+__getattr__, __dir__ = attach(__name__, _ATTRIBUTES)
 
 __all__ = [
+    "GENERATIVE_TASKS",
     "BaseTextForensicsModel",
+    "OutputSpec",
     "TextForensicsConfig",
     "TextForensicsUnifiedModel",
+    "scoring_tasks",
 ]
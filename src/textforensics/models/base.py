@@ -1,7 +1,7 @@
 """Base model class for TextForensics models"""
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 import torch
 from transformers import PretrainedConfig, PreTrainedModel
@@ -23,7 +23,12 @@ class TextForensicsConfig(PretrainedConfig):
         attention_probs_dropout_prob: float = 0.1,
         max_position_embeddings: int = 512,
         style_encoder_dim: int = 768,
+        window_stride: int = 384,
+        window_pooling: str = "mean",
+        early_exit_layers: Optional[List[int]] = None,
+        early_exit_threshold: float = 0.9,
         task_heads: Optional[Dict[str, Any]] = None,
+        text_preprocessing: Optional[Dict[str, bool]] = None,
         **kwargs: Any,
     ) -> None:
         super().__init__(**kwargs)
@@ -37,7 +42,42 @@ class TextForensicsConfig(PretrainedConfig):
         self.attention_probs_dropout_prob = attention_probs_dropout_prob
         self.max_position_embeddings = max_position_embeddings
         self.style_encoder_dim = style_encoder_dim
+        self.window_stride = window_stride
+        self.window_pooling = window_pooling
+        self.early_exit_layers = list(early_exit_layers or [])
+        self.early_exit_threshold = early_exit_threshold
         self.task_heads = task_heads or {}
+        # Text normalization applied before tokenization in training
+        self.text_preprocessing = text_preprocessing or {}
+
+    @classmethod
+    def from_model_config(
+        cls, model_config: Any, **overrides: Any
+    ) -> "TextForensicsConfig":
+        """Build a config from a ``conf/model/*.yaml`` entry"""
+        from omegaconf import OmegaConf
+
+        architecture = model_config.architecture
+        kwargs: Dict[str, Any] = {
+            "hidden_size": architecture.hidden_size,
+            "num_hidden_layers": architecture.num_hidden_layers,
+            "num_attention_heads": architecture.num_attention_heads,
+            "intermediate_size": architecture.intermediate_size,
+            "hidden_dropout_prob": architecture.hidden_dropout_prob,
+            "attention_probs_dropout_prob": architecture.attention_probs_dropout_prob,
+            "style_encoder_dim": model_config.style_encoder.output_dim,
+            "task_heads": OmegaConf.to_container(model_config.task_heads, resolve=True),
+        }
+        long_document = model_config.get("long_document")
+        if long_document is not None:
+            kwargs["window_stride"] = long_document.window_stride
+            kwargs["window_pooling"] = long_document.pooling
+        early_exit = model_config.get("early_exit")
+        if early_exit is not None and early_exit.get("enabled", False):
+            kwargs["early_exit_layers"] = list(early_exit.layers)
+            kwargs["early_exit_threshold"] = early_exit.threshold
+        kwargs.update(overrides)
+        return cls(**kwargs)
 
 
 class BaseTextForensicsModel(PreTrainedModel, ABC):
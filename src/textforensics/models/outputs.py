@@ -0,0 +1,32 @@
+"""Output selection for TextForensics models"""
+
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Sequence
+
+# Heads that generate text; they only run when requested by name
+GENERATIVE_TASKS = ("style_transfer",)
+
+
+def scoring_tasks(tasks: Iterable[str]) -> List[str]:
+    """``tasks`` without the generative heads"""
+    return [task for task in tasks if task not in GENERATIVE_TASKS]
+
+
+@dataclass(frozen=True)
+class OutputSpec:
+    """
+    Selects what a forward pass computes and returns.
+
+    ``tasks`` lists the task heads to run (``None`` runs every enabled
+    scoring head, i.e. all but ``GENERATIVE_TASKS``; an empty sequence runs
+    none). The boolean flags choose which shared
+    tensors are kept in the result; tensors that are not requested are
+    released as soon as they are no longer needed. ``early_exit_logits``
+    adds the logits of every early-exit classifier, stacked along dim 0.
+    """
+
+    tasks: Optional[Sequence[str]] = None
+    style_embeddings: bool = True
+    sequence_output: bool = False
+    pooled_output: bool = False
+    early_exit_logits: bool = False
@@ -1,12 +1,14 @@
 """TextForensics Unified Model Implementation"""
 
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Sequence, cast
 
 import torch
 import torch.nn as nn
 from transformers import BertConfig, BertModel
 
+from ..layers import AttentionPooling, StyleTransferDecoder
 from .base import BaseTextForensicsModel, TextForensicsConfig
+from .outputs import OutputSpec, scoring_tasks
 
 
 class TextForensicsUnifiedModel(BaseTextForensicsModel):
@@ -41,10 +43,24 @@ class TextForensicsUnifiedModel(BaseTextForensicsModel):
             nn.LayerNorm(config.style_encoder_dim),
         )
 
+        # Pooling of window embeddings for long documents
+        if config.window_pooling == "attention":
+            self.window_pooler: Optional[nn.Module] = AttentionPooling(
+                config.style_encoder_dim
+            )
+        elif config.window_pooling == "mean":
+            self.window_pooler = None
+        else:
+            raise ValueError(f"Unknown window_pooling: {config.window_pooling}")
+
         # Task heads (will be populated based on config)
         self.task_heads = nn.ModuleDict()
         self._build_task_heads(config.task_heads)
 
+        # Early-exit classifiers on intermediate encoder layers
+        self.exit_heads = nn.ModuleDict()
+        self._build_exit_heads(config)
+
         # Initialize weights
         self.post_init()
 
@@ -89,8 +105,24 @@ class TextForensicsUnifiedModel(BaseTextForensicsModel):
         return nn.Sequential(*layers)
 
     def _build_generation_head(self, config: Dict[str, Any]) -> nn.Module:
-        """Build generation head (placeholder for now)"""
-        return nn.Linear(self.config.style_encoder_dim, config["vocab_size"])
+        """Build style transfer decoder"""
+        return StyleTransferDecoder(
+            vocab_size=config.get("vocab_size", self.config.vocab_size),
+            hidden_size=self.config.hidden_size,
+            style_dim=self.config.style_encoder_dim,
+            num_layers=config.get("decoder_layers", 6),
+            num_heads=config.get(
+                "num_attention_heads", self.config.num_attention_heads
+            ),
+            intermediate_size=config.get(
+                "intermediate_size", self.config.intermediate_size
+            ),
+            max_length=config.get("max_length", self.config.max_position_embeddings),
+            dropout=config.get("dropout", self.config.hidden_dropout_prob),
+            bos_token_id=config.get("bos_token_id", 101),
+            eos_token_id=config.get("eos_token_id", 102),
+            pad_token_id=config.get("pad_token_id", 0),
+        )
 
     def _build_binary_classification_head(self, config: Dict[str, Any]) -> nn.Module:
         """Build binary classification head"""
@@ -106,48 +138,305 @@ class TextForensicsUnifiedModel(BaseTextForensicsModel):
         """Build similarity scoring head"""
         return nn.Identity()  # Use style embeddings directly
 
+    def _build_exit_heads(self, config: TextForensicsConfig) -> None:
+        """Attach a small classifier to each configured encoder layer"""
+        if not config.early_exit_layers:
+            return
+        if "style_classification" not in self.task_heads:
+            raise ValueError("Early exit needs the style_classification head")
+
+        num_classes = config.task_heads["style_classification"]["num_classes"]
+        for layer in config.early_exit_layers:
+            if not 1 <= layer < config.num_hidden_layers:
+                raise ValueError(
+                    f"Early-exit layer {layer} must be in "
+                    f"[1, {config.num_hidden_layers - 1}]"
+                )
+            self.exit_heads[str(layer)] = nn.Sequential(
+                nn.Linear(config.hidden_size, config.hidden_size),
+                nn.Tanh(),
+                nn.Dropout(config.hidden_dropout_prob),
+                nn.Linear(config.hidden_size, num_classes),
+            )
+
+    def _resolve_tasks(self, tasks: Optional[Sequence[str]]) -> List[str]:
+        """Validate requested task names against the enabled heads"""
+        if tasks is None:
+            return scoring_tasks(self.task_heads.keys())
+
+        unknown = [t for t in tasks if t not in self.task_heads]
+        if unknown:
+            raise ValueError(f"Task heads not enabled: {unknown}")
+        return list(tasks)
+
     def forward(
         self,
         input_ids: torch.Tensor,
         attention_mask: Optional[torch.Tensor] = None,
         task: Optional[str] = None,
+        output_spec: Optional[OutputSpec] = None,
         **kwargs: Any,
     ) -> Dict[str, torch.Tensor]:
-        """Forward pass through the unified model"""
+        """
+        Forward pass through the unified model.
+
+        Without an ``output_spec`` every shared tensor is returned, together
+        with the output of ``task`` (or of all scoring heads if ``task`` is not
+        set; the style transfer decoder only runs when named).
+        """
+        if output_spec is None:
+            output_spec = OutputSpec(
+                tasks=[task] if task and task in self.task_heads else None,
+                sequence_output=True,
+                pooled_output=True,
+            )
+        tasks = self._resolve_tasks(output_spec.tasks)
+        if output_spec.early_exit_logits and not self.exit_heads:
+            raise ValueError(
+                "early_exit_logits requested, but config.early_exit_layers is empty"
+            )
 
         # Get backbone representations
         outputs = self.backbone(
-            input_ids=input_ids, attention_mask=attention_mask, return_dict=True
+            input_ids=input_ids,
+            attention_mask=attention_mask,
+            output_hidden_states=output_spec.early_exit_logits,
+            return_dict=True,
+        )
+        early_exit_logits = None
+        if output_spec.early_exit_logits:
+            # hidden_states[i] is the output of encoder layer i (0 = embeddings)
+            early_exit_logits = torch.stack(
+                [
+                    head(outputs.hidden_states[int(layer)][:, 0])
+                    for layer, head in self.exit_heads.items()
+                ]
+            )
+        pooled_output = outputs.pooler_output
+        sequence_output = (
+            outputs.last_hidden_state if output_spec.sequence_output else None
         )
+        # The decoder cross-attends to the encoder output
+        memory = outputs.last_hidden_state if "style_transfer" in tasks else None
+        # Drop the (B x L x H) hidden states unless they were requested
+        del outputs
 
         # Extract style embeddings
-        sequence_output = outputs.last_hidden_state
-        pooled_output = outputs.pooler_output
         style_embeddings = self.style_encoder(pooled_output)
 
-        results = {
-            "style_embeddings": style_embeddings,
-            "sequence_output": sequence_output,
-            "pooled_output": pooled_output,
-        }
+        results: Dict[str, torch.Tensor] = {}
+        if output_spec.style_embeddings:
+            results["style_embeddings"] = style_embeddings
+        if sequence_output is not None:
+            results["sequence_output"] = sequence_output
+        if output_spec.pooled_output:
+            results["pooled_output"] = pooled_output
+        if early_exit_logits is not None:
+            results["early_exit_logits"] = early_exit_logits
+        del pooled_output
 
-        # Apply task-specific heads
-        if task and task in self.task_heads:
-            task_output = self.task_heads[task](style_embeddings)
-            results[f"{task}_output"] = task_output
-        else:
-            # Apply all enabled task heads
-            for task_name, task_head in self.task_heads.items():
-                task_output = task_head(style_embeddings)
-                results[f"{task_name}_output"] = task_output
+        # Apply requested task heads
+        if "style_transfer" in tasks:
+            # Teacher-forced logits, or first-token logits without targets
+            results["style_transfer_output"] = self.task_heads["style_transfer"](
+                style_embeddings,
+                memory,
+                attention_mask,
+                kwargs.get("decoder_input_ids"),
+            )
+        results.update(
+            self.score_embeddings(
+                style_embeddings, [t for t in tasks if t != "style_transfer"]
+            )
+        )
 
         return results
 
+    def score_embeddings(
+        self, style_embeddings: torch.Tensor, tasks: Optional[Sequence[str]] = None
+    ) -> Dict[str, torch.Tensor]:
+        """
+        Run scoring heads on precomputed style embeddings.
+
+        Every head except the style transfer decoder only reads the style
+        embedding, so cached embeddings can be scored without the backbone.
+        """
+        tasks = self._resolve_tasks(tasks)
+        if "style_transfer" in tasks:
+            raise ValueError("style_transfer needs the encoder output")
+        return {
+            f"{task}_output": self.task_heads[task](style_embeddings) for task in tasks
+        }
+
+    @staticmethod
+    def _additive_mask(
+        attention_mask: torch.Tensor, dtype: torch.dtype
+    ) -> torch.Tensor:
+        """Broadcastable ``(B, 1, 1, L)`` mask for calling encoder layers directly"""
+        mask = attention_mask[:, None, None, :].to(dtype)
+        return (1.0 - mask) * torch.finfo(dtype).min
+
+    @torch.no_grad()
+    def classify_early_exit(
+        self,
+        input_ids: torch.Tensor,
+        attention_mask: Optional[torch.Tensor] = None,
+        threshold: Optional[float] = None,
+    ) -> Dict[str, torch.Tensor]:
+        """
+        Style classification that stops each sample at its first confident exit.
+
+        Encoder layers run one at a time. At every exit layer, samples whose
+        top softmax probability reaches ``threshold`` take that exit's logits
+        and leave the batch; the remaining samples continue with a smaller
+        batch, trimmed to their own longest (right-padded) sequence. Samples
+        that never exit go through the full model and the
+        ``style_classification`` head.
+
+        Returns ``style_classification_output`` logits and ``exit_layers``,
+        the number of encoder layers each sample used.
+        """
+        threshold = self.config.early_exit_threshold if threshold is None else threshold
+        if attention_mask is None:
+            attention_mask = torch.ones_like(input_ids)
+        num_layers = self.config.num_hidden_layers
+        batch_size = input_ids.shape[0]
+
+        head = self.task_heads["style_classification"]
+        num_classes = self.config.task_heads["style_classification"]["num_classes"]
+        logits = torch.empty(
+            (batch_size, num_classes),
+            device=input_ids.device,
+            dtype=self.backbone.embeddings.word_embeddings.weight.dtype,
+        )
+        exit_layers = torch.full(
+            (batch_size,), num_layers, dtype=torch.long, device=input_ids.device
+        )
+        # Positions in the original batch of the samples still running
+        active = torch.arange(batch_size, device=input_ids.device)
+
+        hidden_states = self.backbone.embeddings(input_ids=input_ids)
+        extended_mask = self._additive_mask(attention_mask, hidden_states.dtype)
+        for index, layer_module in enumerate(self.backbone.encoder.layer):
+            hidden_states = layer_module(hidden_states, extended_mask)
+            if isinstance(hidden_states, tuple):
+                hidden_states = hidden_states[0]
+
+            key = str(index + 1)
+            if key not in self.exit_heads:
+                continue
+
+            exit_logits = self.exit_heads[key](hidden_states[:, 0])
+            confidence = torch.softmax(exit_logits.float(), dim=-1).amax(dim=-1)
+            done = confidence >= threshold
+            if not done.any():
+                continue
+
+            logits[active[done]] = exit_logits[done].to(logits.dtype)
+            exit_layers[active[done]] = index + 1
+            keep = ~done
+            if not keep.any():
+                return {
+                    "style_classification_output": logits,
+                    "exit_layers": exit_layers,
+                }
+            active = active[keep]
+            attention_mask = attention_mask[keep]
+            # Drop padding columns no remaining sample needs
+            width = int(attention_mask.sum(dim=1).max())
+            attention_mask = attention_mask[:, :width]
+            hidden_states = hidden_states[keep, :width]
+            extended_mask = self._additive_mask(attention_mask, hidden_states.dtype)
+
+        pooled_output = self.backbone.pooler(hidden_states)
+        logits[active] = head(self.style_encoder(pooled_output)).to(logits.dtype)
+        return {"style_classification_output": logits, "exit_layers": exit_layers}
+
+    @torch.no_grad()
+    def transfer_style(
+        self,
+        input_ids: torch.Tensor,
+        attention_mask: Optional[torch.Tensor] = None,
+        target_style: Optional[torch.Tensor] = None,
+        max_length: Optional[int] = None,
+        num_beams: int = 1,
+        length_penalty: float = 1.0,
+    ) -> Dict[str, torch.Tensor]:
+        """
+        Rewrite the input towards ``target_style`` with the decoder head.
+
+        ``target_style`` is a ``(B, style_dim)`` or ``(style_dim,)`` style
+        embedding; by default each input keeps its own style. The encoder
+        runs once, then the decoder generates incrementally with a key/value
+        cache, greedily or with beam search when ``num_beams > 1``.
+
+        Returns ``sequences`` (BOS-prefixed, right-padded token ids) and
+        their ``scores``.
+        """
+        if "style_transfer" not in self.task_heads:
+            raise ValueError("Task heads not enabled: ['style_transfer']")
+        if attention_mask is None:
+            attention_mask = torch.ones_like(input_ids)
+        outputs = self.forward(
+            input_ids,
+            attention_mask,
+            output_spec=OutputSpec(tasks=(), sequence_output=True),
+        )
+        style = outputs["style_embeddings"]
+        if target_style is not None:
+            style = target_style.to(style.dtype).expand_as(style)
+        decoder = cast(StyleTransferDecoder, self.task_heads["style_transfer"])
+        sequences, scores = decoder.generate(
+            style,
+            outputs["sequence_output"],
+            attention_mask,
+            max_length=max_length,
+            num_beams=num_beams,
+            length_penalty=length_penalty,
+        )
+        return {"sequences": sequences, "scores": scores}
+
     def get_style_embeddings(
         self, input_ids: torch.Tensor, attention_mask: Optional[torch.Tensor] = None
     ) -> torch.Tensor:
         """Extract style embeddings"""
-        outputs = self.backbone(
-            input_ids=input_ids, attention_mask=attention_mask, return_dict=True
+        outputs = self.forward(
+            input_ids, attention_mask, output_spec=OutputSpec(tasks=())
+        )
+        return outputs["style_embeddings"]
+
+    def pool_windows(
+        self,
+        window_embeddings: torch.Tensor,
+        document_index: torch.Tensor,
+        num_documents: int,
+    ) -> torch.Tensor:
+        """
+        Combine window embeddings into one embedding per document.
+
+        Row ``i`` of ``window_embeddings`` belongs to document
+        ``document_index[i]``; every document must have at least one window.
+        """
+        if self.window_pooler is None:
+            totals = window_embeddings.new_zeros(
+                (num_documents, window_embeddings.shape[-1])
+            )
+            totals.index_add_(0, document_index, window_embeddings)
+            counts = torch.bincount(document_index, minlength=num_documents)
+            return totals / counts.unsqueeze(-1).to(totals.dtype)
+
+        # Scatter windows into a (documents, max windows, dim) grid for pooling
+        counts = torch.bincount(document_index, minlength=num_documents)
+        order = torch.argsort(document_index, stable=True)
+        starts = torch.cumsum(counts, 0) - counts
+        sorted_index = document_index[order]
+        slots = torch.arange(len(order), device=order.device) - starts[sorted_index]
+
+        grid = window_embeddings.new_zeros(
+            (num_documents, int(counts.max()), window_embeddings.shape[-1])
         )
-        return self.style_encoder(outputs.pooler_output)
+        mask = torch.zeros(grid.shape[:2], dtype=torch.bool, device=grid.device)
+        grid[sorted_index, slots] = window_embeddings[order]
+        mask[sorted_index, slots] = True
+        pooled: torch.Tensor = self.window_pooler(grid, mask)
+        return pooled
@@ -0,0 +1,40 @@
+"""Sliding-window splitting of long token sequences"""
+
+from typing import List, Sequence
+
+
+def sliding_windows(
+    input_ids: Sequence[int], window_size: int, stride: int
+) -> List[List[int]]:
+    """
+    Split a tokenized document into overlapping windows.
+
+    ``input_ids`` is expected to start with ``[CLS]`` and end with ``[SEP]``.
+    The content in between is cut into chunks of ``window_size - 2`` tokens
+    starting every ``stride`` tokens, and each chunk is wrapped in the
+    document's own ``[CLS]``/``[SEP]``. The last window is aligned to the end
+    of the document; with ``stride <= window_size - 2`` consecutive windows
+    overlap or touch, so no tokens are dropped. Larger strides would skip
+    tokens and are rejected.
+    """
+    if window_size < 3:
+        raise ValueError("window_size must leave room for [CLS] and [SEP]")
+    if stride < 1:
+        raise ValueError("stride must be positive")
+    if stride > window_size - 2:
+        raise ValueError(
+            f"stride {stride} would skip tokens between windows of "
+            f"{window_size - 2} content tokens"
+        )
+
+    cls_id, sep_id = input_ids[0], input_ids[-1]
+    content = list(input_ids[1:-1])
+    span = window_size - 2
+
+    if len(content) <= span:
+        return [[cls_id] + content + [sep_id]]
+
+    starts = list(range(0, len(content) - span + 1, stride))
+    if starts[-1] + span < len(content):
+        starts.append(len(content) - span)
+    return [[cls_id] + content[s : s + span] + [sep_id] for s in starts]
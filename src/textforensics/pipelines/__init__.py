@@ -1,7 +1,33 @@
 """TextForensics Pipelines Package"""
 
-from .training import TrainingPipeline
+from typing import TYPE_CHECKING
+
+from .._lazy import attach
+
+if TYPE_CHECKING:
+    from .analysis import BulkAnalyzer
+    from .distillation import DistillationPipeline
+    from .distributed import launch_distributed
+    from .inference import InferencePipeline
+    from .plagiarism import PlagiarismDetector
+    from .training import TrainingPipeline
+
+_ATTRIBUTES = {
+    "BulkAnalyzer": ".analysis",
+    "DistillationPipeline": ".distillation",
+    "InferencePipeline": ".inference",
+    "PlagiarismDetector": ".plagiarism",
+    "TrainingPipeline": ".training",
+    "launch_distributed": ".distributed",
+}
+
+__getattr__, __dir__ = attach(__name__, _ATTRIBUTES)
 
 __all__ = [
+    "BulkAnalyzer",
+    "DistillationPipeline",
+    "InferencePipeline",
+    "PlagiarismDetector",
     "TrainingPipeline",
+    "launch_distributed",
 ]
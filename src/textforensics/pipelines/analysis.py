@@ -0,0 +1,251 @@
+"""Offline bulk analysis of document dumps with a process pool"""
+
+import csv
+import json
+import logging
+import multiprocessing as mp
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterator, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger("textforensics")
+
+Document = Tuple[str, str]
+LOG_INTERVAL_S = 30.0
+
+# Per-process pipeline, loaded once by ``_init_worker``
+_pipeline: Any = None
+_include_embeddings = False
+
+
+def read_documents(
+    path: Path, text_field: str = "text", id_field: Optional[str] = None
+) -> Iterator[Document]:
+    """
+    Stream ``(id, text)`` pairs from a JSONL or CSV file.
+
+    Documents without ``id_field`` are identified as ``<file>:<line>``.
+    """
+    path = Path(path)
+    if path.suffix == ".csv":
+        csv.field_size_limit(sys.maxsize)
+        with open(path, newline="", encoding="utf-8") as f:
+            for line, row in enumerate(csv.DictReader(f)):
+                doc_id = row.get(id_field) if id_field else None
+                yield str(doc_id or f"{path.name}:{line}"), row[text_field]
+    elif path.suffix in (".jsonl", ".json", ".ndjson"):
+        with open(path, encoding="utf-8") as f:
+            for line, raw in enumerate(f):
+                if not raw.strip():
+                    continue
+                record = json.loads(raw)
+                doc_id = record.get(id_field) if id_field else None
+                yield str(doc_id or f"{path.name}:{line}"), record[text_field]
+    else:
+        raise ValueError(f"Unsupported input format: {path}")
+
+
+def _init_worker(
+    model_path: str,
+    threads: int,
+    batch_size: int,
+    tasks: Optional[List[str]],
+    quantize: bool,
+    include_embeddings: bool,
+) -> None:
+    import torch
+
+    from .inference import InferencePipeline
+
+    global _pipeline, _include_embeddings
+    torch.set_num_threads(threads)
+    _pipeline = InferencePipeline.from_pretrained(
+        model_path, quantize=quantize, batch_size=batch_size, tasks=tasks
+    )
+    _include_embeddings = include_embeddings
+
+
+def _analyze_chunk(documents: List[Document]) -> List[str]:
+    """Score one chunk in a worker and return its JSONL lines"""
+    import torch
+
+    outputs = _pipeline.predict([text for _, text in documents])
+    lines = []
+    for row, (doc_id, _) in enumerate(documents):
+        result: Dict[str, Any] = {"id": doc_id}
+        if "style_classification_output" in outputs:
+            logits = outputs["style_classification_output"][row].float()
+            probabilities = torch.softmax(logits, dim=-1)
+            result["label"] = int(probabilities.argmax())
+            result["probabilities"] = [round(p, 6) for p in probabilities.tolist()]
+        if "anomaly_detection_output" in outputs:
+            result["anomaly_score"] = float(outputs["anomaly_detection_output"][row])
+        if _include_embeddings and "style_embeddings" in outputs:
+            result["style_embedding"] = outputs["style_embeddings"][row].tolist()
+        lines.append(json.dumps(result))
+    return lines
+
+
+class BulkAnalyzer:
+    """
+    Score document dumps with a pool of model-loading worker processes.
+
+    Inputs are streamed in chunks of ``chunk_size`` documents; at most
+    ``max_pending`` chunks are in flight, so memory stays bounded regardless
+    of corpus size. Results are appended to a JSONL file strictly in input
+    order. After every chunk, the output is flushed and a progress file
+    (``<output>.progress.json``) records how many documents and bytes are
+    complete; a rerun with the same settings truncates any partial tail and
+    resumes after the last completed chunk.
+    """
+
+    def __init__(
+        self,
+        model_path: str,
+        num_workers: int = 1,
+        threads_per_worker: Optional[int] = None,
+        batch_size: int = 32,
+        chunk_size: int = 256,
+        max_pending: Optional[int] = None,
+        tasks: Optional[Sequence[str]] = None,
+        quantize: bool = False,
+        include_embeddings: bool = False,
+        text_field: str = "text",
+        id_field: Optional[str] = None,
+    ) -> None:
+        self.model_path = model_path
+        self.num_workers = num_workers
+        self.threads_per_worker = threads_per_worker or max(
+            1, (os.cpu_count() or 1) // num_workers
+        )
+        self.batch_size = batch_size
+        self.chunk_size = chunk_size
+        self.max_pending = max_pending or 2 * num_workers
+        self.tasks = list(tasks) if tasks is not None else None
+        self.quantize = quantize
+        self.include_embeddings = include_embeddings
+        self.text_field = text_field
+        self.id_field = id_field
+
+    def _settings(self, inputs: Sequence[Path]) -> Dict[str, Any]:
+        """Everything that must match for a run to be resumed"""
+        return {
+            "inputs": [str(Path(p).resolve()) for p in inputs],
+            "model_path": str(Path(self.model_path).resolve()),
+            "tasks": self.tasks,
+            "quantize": self.quantize,
+            "include_embeddings": self.include_embeddings,
+            "text_field": self.text_field,
+            "id_field": self.id_field,
+        }
+
+    def _documents(self, inputs: Sequence[Path]) -> Iterator[Document]:
+        for path in inputs:
+            yield from read_documents(path, self.text_field, self.id_field)
+
+    def _chunks(self, documents: Iterator[Document]) -> Iterator[List[Document]]:
+        while True:
+            chunk = list(islice(documents, self.chunk_size))
+            if not chunk:
+                return
+            yield chunk
+
+    def run(
+        self, inputs: Sequence[Path], output: Path, resume: bool = True
+    ) -> Dict[str, Any]:
+        """Analyze every document in ``inputs`` and write results to ``output``"""
+        output = Path(output)
+        progress_path = output.with_name(output.name + ".progress.json")
+        settings = self._settings(inputs)
+
+        done, offset = 0, 0
+        if resume and progress_path.exists() and output.exists():
+            progress = json.loads(progress_path.read_text())
+            if progress["settings"] != settings:
+                raise ValueError(
+                    f"{progress_path} was written with different settings; "
+                    "rerun without resume to start over"
+                )
+            done, offset = progress["documents"], progress["bytes"]
+            if output.stat().st_size < offset:
+                raise ValueError(f"{output} is shorter than its recorded progress")
+            logger.info(f"Resuming after {done} documents")
+
+        output.parent.mkdir(parents=True, exist_ok=True)
+        # Record the starting point before anything is written
+        self._write_progress(progress_path, settings, done, offset)
+        mode = "r+b" if offset else "wb"
+        start = last_log = time.perf_counter()
+        processed = 0
+
+        with (
+            open(output, mode) as out,
+            ProcessPoolExecutor(
+                max_workers=self.num_workers,
+                mp_context=mp.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(
+                    self.model_path,
+                    self.threads_per_worker,
+                    self.batch_size,
+                    self.tasks,
+                    self.quantize,
+                    self.include_embeddings,
+                ),
+            ) as executor,
+        ):
+            # Drop results written after the last recorded checkpoint
+            out.seek(offset)
+            out.truncate()
+
+            documents = islice(self._documents(inputs), done, None)
+            pending: Deque[Tuple[Future, int]] = deque()
+
+            def write_oldest() -> None:
+                nonlocal done, processed
+                future, count = pending.popleft()
+                lines = future.result()
+                out.write(("\n".join(lines) + "\n").encode("utf-8"))
+                out.flush()
+                os.fsync(out.fileno())
+                done += count
+                processed += count
+                self._write_progress(progress_path, settings, done, out.tell())
+
+            for chunk in self._chunks(documents):
+                pending.append((executor.submit(_analyze_chunk, chunk), len(chunk)))
+                if len(pending) >= self.max_pending:
+                    write_oldest()
+                if time.perf_counter() - last_log > LOG_INTERVAL_S:
+                    last_log = time.perf_counter()
+                    logger.info(
+                        f"{done} documents analyzed "
+                        f"({processed / (last_log - start):.1f} docs/sec)"
+                    )
+            while pending:
+                write_oldest()
+
+        elapsed = time.perf_counter() - start
+        return {
+            "documents": done,
+            "processed": processed,
+            "elapsed": elapsed,
+            "docs_per_sec": processed / elapsed if elapsed > 0 else 0.0,
+            "output": str(output),
+        }
+
+    @staticmethod
+    def _write_progress(
+        path: Path, settings: Dict[str, Any], documents: int, num_bytes: int
+    ) -> None:
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "w") as f:
+            json.dump(
+                {"settings": settings, "documents": documents, "bytes": num_bytes}, f
+            )
+        os.replace(tmp_path, path)
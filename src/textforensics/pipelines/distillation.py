@@ -0,0 +1,385 @@
+"""Knowledge distillation of compact student models"""
+
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple, cast
+
+import numpy as np
+import torch
+import torch.distributed as dist
+import torch.nn as nn
+import torch.nn.functional as F
+from omegaconf import DictConfig, OmegaConf
+from torch.utils.data import Dataset
+
+from ..data import LengthBucketBatchSampler, PaddingCollator, TokenShardDataset
+from ..data.preprocessing import resolve_path
+from ..data.shards import read_manifest
+from ..index.cache import model_fingerprint
+from ..models.outputs import OutputSpec
+from ..utils.checkpointing import load_weights
+from .training import TrainingPipeline
+
+if TYPE_CHECKING:
+    from ..models.unified_model import TextForensicsUnifiedModel
+
+# Teacher outputs used as targets, keyed by the model output they come from
+TEACHER_OUTPUTS = {
+    "style_embeddings": "style_embeddings",
+    "logits": "style_classification_output",
+    "anomaly": "anomaly_detection_output",
+}
+DEFAULT_LOSS_WEIGHTS = {
+    "hard_labels": 0.5,
+    "logits": 1.0,
+    "style_embeddings": 1.0,
+    "anomaly": 0.5,
+}
+
+
+class TeacherTargetDataset(Dataset):
+    """Token shards paired with cached teacher outputs, row for row"""
+
+    def __init__(
+        self, dataset: TokenShardDataset, targets: Dict[str, np.ndarray]
+    ) -> None:
+        self.dataset = dataset
+        self.targets = targets
+        self.pad_token_id = dataset.pad_token_id
+
+    @property
+    def lengths(self) -> np.ndarray:
+        return self.dataset.lengths
+
+    def __len__(self) -> int:
+        return len(self.dataset)
+
+    def __getitem__(self, index: int) -> Dict[str, torch.Tensor]:
+        example = self.dataset[index]
+        for name, values in self.targets.items():
+            example[f"teacher_{name}"] = torch.from_numpy(np.array(values[index]))
+        return example
+
+
+class DistillationPipeline(TrainingPipeline):
+    """
+    Train a small student model against a trained teacher.
+
+    The student is the teacher's config with the ``distillation.student``
+    overrides (fewer layers, smaller hidden size...) and can be initialized
+    from evenly spaced teacher layers. Teacher ``style_embeddings`` and
+    task-head outputs are computed once per split, stored as ``.npy`` files
+    under ``distillation.teacher_cache_dir`` keyed by the teacher's
+    fingerprint, and read memory-mapped during training. The loss is a
+    weighted sum of the terms in ``distillation.loss_weights``:
+
+    - ``hard_labels``: cross-entropy with the true author labels
+    - ``logits``: temperature-scaled KL divergence to the teacher's logits
+    - ``style_embeddings``: one minus cosine similarity to the teacher's
+    - ``anomaly``: mean squared error to the teacher's anomaly scores
+    """
+
+    def __init__(self, config: DictConfig) -> None:
+        self.distill_config = config.distillation
+        self.loss_weights: Dict[str, float] = {
+            **DEFAULT_LOSS_WEIGHTS,
+            **self.distill_config.get("loss_weights", {}),
+        }
+        self.temperature = float(self.distill_config.get("temperature", 2.0))
+        super().__init__(config)
+        self.teacher.to(self.device)
+
+    def _build_model(self) -> "TextForensicsUnifiedModel":
+        """Load the teacher and build the student from its config"""
+        from ..models.base import TextForensicsConfig
+        from ..models.unified_model import TextForensicsUnifiedModel
+
+        teacher_path = resolve_path(self.distill_config.teacher_path)
+        self.teacher = TextForensicsUnifiedModel.from_pretrained(str(teacher_path))
+        self.teacher.eval().requires_grad_(False)
+
+        overrides = cast(
+            Dict[str, Any],
+            OmegaConf.to_container(self.distill_config.student, resolve=True),
+        )
+        student_config = TextForensicsConfig.from_dict(
+            {**self.teacher.config.to_dict(), **overrides}
+        )
+        student = TextForensicsUnifiedModel(student_config)
+        if self.distill_config.get("init_from_teacher", True):
+            self._init_from_teacher(student)
+
+        self.logger.info(
+            f"Teacher: {self.teacher.config.num_hidden_layers} layers, "
+            f"{sum(p.numel() for p in self.teacher.parameters()) / 1e6:.1f}M "
+            f"parameters; student: {student_config.num_hidden_layers} layers, "
+            f"{sum(p.numel() for p in student.parameters()) / 1e6:.1f}M parameters"
+        )
+        return student
+
+    def _init_from_teacher(self, student: "TextForensicsUnifiedModel") -> None:
+        """Copy matching weights, taking evenly spaced teacher encoder layers"""
+        teacher_layers = self.teacher.config.num_hidden_layers
+        student_layers = student.config.num_hidden_layers
+        layer_map = torch.linspace(0, teacher_layers - 1, student_layers).round().long()
+
+        teacher_state = self.teacher.state_dict()
+        student_state = student.state_dict()
+        copied = 0
+        for name, tensor in student_state.items():
+            source = name
+            parts = name.split(".")
+            if parts[:3] == ["backbone", "encoder", "layer"]:
+                parts[3] = str(int(layer_map[int(parts[3])]))
+                source = ".".join(parts)
+            if source in teacher_state and teacher_state[source].shape == tensor.shape:
+                tensor.copy_(teacher_state[source])
+                copied += 1
+        self.logger.info(
+            f"Initialized {copied}/{len(student_state)} student tensors from "
+            f"teacher layers {layer_map.tolist()}"
+        )
+
+    def _build_dataset(self, path: Path) -> TeacherTargetDataset:
+        """Pair a split's shards with teacher outputs, computing them once"""
+        dataset = TokenShardDataset(path)
+        manifest = read_manifest(path) or {}
+        fingerprint = model_fingerprint(
+            self.teacher, shards=manifest.get("fingerprint")
+        )
+        cache_dir = (
+            resolve_path(self.distill_config.teacher_cache_dir)
+            / fingerprint
+            / path.name
+        )
+
+        if self.is_main_process and not (cache_dir / "done.json").exists():
+            self._write_teacher_outputs(dataset, cache_dir)
+        if self.distributed:
+            dist.barrier()
+
+        targets = {
+            name: np.load(cache_dir / f"{name}.npy", mmap_mode="r")
+            for name in json.loads((cache_dir / "done.json").read_text())["outputs"]
+        }
+        return TeacherTargetDataset(dataset, targets)
+
+    @torch.no_grad()
+    def _write_teacher_outputs(
+        self, dataset: TokenShardDataset, cache_dir: Path
+    ) -> None:
+        """Run the teacher over ``dataset`` once and store its outputs"""
+        start = time.perf_counter()
+        device = torch.device(
+            "cuda" if torch.cuda.is_available() and not self.distributed else "cpu"
+        )
+        self.teacher.to(device)
+
+        tasks = [
+            task
+            for task in ("style_classification", "anomaly_detection")
+            if task in self.teacher.task_heads
+        ]
+        spec = OutputSpec(tasks=tasks)
+        sampler = LengthBucketBatchSampler(
+            dataset.lengths,
+            batch_size=self.config.data.dataloader.batch_size,
+            shuffle=False,
+        )
+        collate = PaddingCollator(dataset.pad_token_id)
+
+        tmp_dir = cache_dir.with_name(cache_dir.name + ".tmp")
+        if tmp_dir.exists():
+            shutil.rmtree(tmp_dir)
+        tmp_dir.mkdir(parents=True)
+        arrays: Dict[str, np.memmap] = {}
+
+        for batch_indices in sampler:
+            batch = collate([dataset[i] for i in batch_indices])
+            outputs = self.teacher(
+                input_ids=batch["input_ids"].to(device),
+                attention_mask=batch["attention_mask"].to(device),
+                output_spec=spec,
+            )
+            for name, output in TEACHER_OUTPUTS.items():
+                if output not in outputs:
+                    continue
+                values = outputs[output].float().cpu().numpy()
+                if name not in arrays:
+                    arrays[name] = np.lib.format.open_memmap(
+                        tmp_dir / f"{name}.npy",
+                        mode="w+",
+                        dtype=np.float32,
+                        shape=(len(dataset),) + values.shape[1:],
+                    )
+                arrays[name][batch_indices] = values
+
+        for array in arrays.values():
+            array.flush()
+        with open(tmp_dir / "done.json", "w") as f:
+            json.dump({"outputs": sorted(arrays), "num_examples": len(dataset)}, f)
+        if cache_dir.exists():
+            shutil.rmtree(cache_dir)
+        os.replace(tmp_dir, cache_dir)
+        self.teacher.to("cpu")
+        self.logger.info(
+            f"Cached teacher outputs for {len(dataset)} examples in "
+            f"{time.perf_counter() - start:.1f}s: {cache_dir}"
+        )
+
+    def _compute_loss(
+        self, batch: Dict[str, torch.Tensor], model: Optional[nn.Module] = None
+    ) -> Tuple[torch.Tensor, Optional[torch.Tensor]]:
+        """
+        Weighted sum of the configured distillation terms.
+
+        Batches without teacher targets, such as those of the extra
+        multi-task datasets, get the plain training loss of their task.
+        """
+        if not any(f"teacher_{name}" in batch for name in TEACHER_OUTPUTS):
+            return super()._compute_loss(batch, model)
+        model = model or self.model
+        weights = self.loss_weights
+        tasks = ["style_classification"]
+        if "teacher_anomaly" in batch and weights["anomaly"]:
+            tasks.append("anomaly_detection")
+        outputs = model(
+            input_ids=batch["input_ids"],
+            attention_mask=batch["attention_mask"],
+            output_spec=OutputSpec(tasks=tasks),
+        )
+        logits = outputs["style_classification_output"]
+
+        hard_loss = self.loss_functions["style_classification"](logits, batch["labels"])
+        components = {"hard_labels": hard_loss}
+        if "teacher_logits" in batch and weights["logits"]:
+            t = self.temperature
+            # Scaled by t^2 so gradients keep their magnitude across temperatures
+            components["logits"] = (t * t) * F.kl_div(
+                F.log_softmax(logits.float() / t, dim=-1),
+                F.log_softmax(batch["teacher_logits"] / t, dim=-1),
+                log_target=True,
+                reduction="batchmean",
+            )
+        if "teacher_style_embeddings" in batch and weights["style_embeddings"]:
+            cosine = F.cosine_similarity(
+                outputs["style_embeddings"].float(),
+                batch["teacher_style_embeddings"],
+                dim=-1,
+            )
+            components["style_embeddings"] = (1.0 - cosine).mean()
+        if "anomaly_detection" in tasks:
+            components["anomaly"] = F.mse_loss(
+                outputs["anomaly_detection_output"].float(), batch["teacher_anomaly"]
+            )
+
+        loss = weights["hard_labels"] * hard_loss
+        for name, term in components.items():
+            if name != "hard_labels":
+                loss = loss + weights[name] * term
+        self.loss_components = {k: v.detach() for k, v in components.items()}
+        return loss, logits
+
+    @torch.no_grad()
+    def _evaluate_student(self, max_batches: int = 20) -> Dict[str, float]:
+        """Quality retention and speedup of the student on validation data"""
+        self.model.eval()
+        student_correct, teacher_correct, num_examples = 0, 0, 0
+        cosine_total = 0.0
+        teacher_time, student_time = 0.0, 0.0
+        spec = OutputSpec(tasks=["style_classification"])
+
+        for step, batch in enumerate(self.val_loader):
+            if "teacher_logits" not in batch:
+                continue
+            batch = {k: v.to(self.device) for k, v in batch.items()}
+            inputs = {
+                "input_ids": batch["input_ids"],
+                "attention_mask": batch["attention_mask"],
+                "output_spec": spec,
+            }
+            if step < max_batches:
+                start = time.perf_counter()
+                self.teacher(**inputs)
+                teacher_time += time.perf_counter() - start
+
+            start = time.perf_counter()
+            outputs = self.model(**inputs)
+            if step < max_batches:
+                student_time += time.perf_counter() - start
+
+            labels = batch["labels"]
+            predictions = outputs["style_classification_output"].argmax(dim=-1)
+            student_correct += int((predictions == labels).sum())
+            teacher_predictions = batch["teacher_logits"].argmax(dim=-1)
+            teacher_correct += int((teacher_predictions == labels).sum())
+            cosine_total += float(
+                F.cosine_similarity(
+                    outputs["style_embeddings"].float(),
+                    batch["teacher_style_embeddings"],
+                    dim=-1,
+                ).sum()
+            )
+            num_examples += len(labels)
+
+        teacher_accuracy = teacher_correct / max(num_examples, 1)
+        student_accuracy = student_correct / max(num_examples, 1)
+        return {
+            "teacher_accuracy": teacher_accuracy,
+            "student_accuracy": student_accuracy,
+            "accuracy_retention": (
+                student_accuracy / teacher_accuracy if teacher_accuracy else 0.0
+            ),
+            "embedding_cosine": cosine_total / max(num_examples, 1),
+            "speedup": teacher_time / student_time if student_time else 0.0,
+            "parameter_ratio": sum(p.numel() for p in self.teacher.parameters())
+            / sum(p.numel() for p in self.model.parameters()),
+        }
+
+    def _save_student(self) -> Optional[Path]:
+        """Save the student with the teacher's tokenizer for serving"""
+        output_dir = self.distill_config.get("output_dir")
+        if output_dir is None:
+            return None
+        from transformers import AutoTokenizer
+
+        output_dir = resolve_path(output_dir)
+        self.model.save_pretrained(str(output_dir))
+        teacher_path = resolve_path(self.distill_config.teacher_path)
+        try:
+            AutoTokenizer.from_pretrained(teacher_path).save_pretrained(output_dir)
+        except (OSError, ValueError):
+            self.logger.warning(f"No tokenizer found at {teacher_path}")
+        self.logger.info(f"Saved student model: {output_dir}")
+        return output_dir
+
+    def _restore_best_student(self, checkpoint: Optional[Path]) -> None:
+        """Load the best checkpointed weights; the last epoch may be worse"""
+        if checkpoint is None:
+            return
+        self.model.load_state_dict(load_weights(checkpoint))
+        self.logger.info(f"Restored best student weights: {checkpoint}")
+
+    def run(self) -> Dict[str, Any]:
+        """
+        Train the student, then report retention and speedup.
+
+        The report and the saved student use the best checkpoint rather than
+        the weights of the last epoch, which early stopping leaves behind.
+        """
+        results = super().run()
+        if not self.is_main_process:
+            return results
+
+        self._restore_best_student(results.get("best_checkpoint"))
+        report = self._evaluate_student()
+        self.logger.info(
+            "Student vs teacher: "
+            + ", ".join(f"{name}={value:.3f}" for name, value in report.items())
+        )
+        results.update(report)
+        results["student_path"] = self._save_student()
+        return results
@@ -0,0 +1,100 @@
+"""Multi-process data-parallel training over the gloo backend"""
+
+import os
+import socket
+from typing import Any, Dict, Optional
+
+import torch
+import torch.distributed as dist
+import torch.multiprocessing as mp
+from omegaconf import DictConfig, OmegaConf
+
+from ..data.preprocessing import LAUNCH_DIR_ENV, launch_dir
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        port: int = s.getsockname()[1]
+        return port
+
+
+def _worker(
+    rank: int,
+    world_size: int,
+    config_container: Dict[str, Any],
+    port: int,
+    threads_per_process: int,
+    launch_directory: str,
+    result_queue: Any,
+) -> None:
+    """Entry point of one data-parallel training process"""
+    from .distillation import DistillationPipeline
+    from .training import TrainingPipeline
+
+    # Workers share the parent's working directory but not its Hydra context,
+    # so relative config paths need the launch directory passed explicitly
+    os.environ[LAUNCH_DIR_ENV] = launch_directory
+    os.environ["MASTER_ADDR"] = "127.0.0.1"
+    os.environ["MASTER_PORT"] = str(port)
+    # Split the host's cores between ranks instead of oversubscribing them
+    torch.set_num_threads(threads_per_process)
+
+    dist.init_process_group("gloo", rank=rank, world_size=world_size)
+    try:
+        config = OmegaConf.create(config_container)
+        if OmegaConf.select(config, "pipeline.type") == "distillation":
+            pipeline: TrainingPipeline = DistillationPipeline(config)
+        else:
+            pipeline = TrainingPipeline(config)
+        results = pipeline.run()
+        if rank == 0:
+            result_queue.put(results)
+    finally:
+        dist.destroy_process_group()
+
+
+def launch_distributed(
+    config: DictConfig,
+    num_processes: Optional[int] = None,
+    threads_per_process: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    Run ``TrainingPipeline`` (or ``DistillationPipeline`` when
+    ``pipeline.type`` is ``distillation``) in ``num_processes`` CPU workers.
+
+    Workers join a gloo process group; each rank trains on its own shard of
+    the batches and DDP all-reduces gradients. The config is resolved up
+    front, and relative paths are resolved against the launch directory,
+    because Hydra's resolvers and original cwd are not available in spawned
+    workers.
+    Returns the results reported by rank 0.
+    """
+    compute = OmegaConf.select(config, "infrastructure.compute.compute", default={})
+    parallelism = compute.get("parallelism", {}) if compute else {}
+    num_processes = num_processes or parallelism.get("num_processes", 1)
+    threads_per_process = threads_per_process or max(
+        1, (os.cpu_count() or 1) // num_processes
+    )
+
+    config_container = OmegaConf.to_container(config, resolve=True)
+    context = mp.get_context("spawn")
+    result_queue = context.SimpleQueue()
+
+    mp.start_processes(
+        _worker,
+        args=(
+            num_processes,
+            config_container,
+            _free_port(),
+            threads_per_process,
+            str(launch_dir()),
+            result_queue,
+        ),
+        nprocs=num_processes,
+        join=True,
+        start_method="spawn",
+    )
+
+    results: Dict[str, Any] = result_queue.get()
+    return results
@@ -0,0 +1,429 @@
+"""Inference Pipeline for TextForensics"""
+
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import torch
+import torch.nn as nn
+
+from ..data.tokenization import BatchTokenizer, TextNormalizer
+from ..index.cache import EmbeddingCache
+from ..models.outputs import OutputSpec, scoring_tasks
+from ..models.windows import sliding_windows
+
+if TYPE_CHECKING:
+    from ..serving.metrics import InferenceMetrics
+
+
+class InferencePipeline:
+    """
+    Batched inference pipeline for TextForensics models.
+
+    Raw texts are tokenized without padding, sorted into length buckets and
+    padded only up to the longest sequence of their own batch. Results are
+    scattered back so that row ``i`` of every output belongs to ``texts[i]``.
+
+    Texts are normalized like the training data (the model config's
+    ``text_preprocessing``, unless a ``normalizer`` is given) and tokenized
+    through a ``BatchTokenizer``; with ``tokenize_workers > 1``, large calls
+    are tokenized across that many processes.
+
+    ``tasks`` defaults to every head except the generative ones, so that
+    ``predict`` never runs the style transfer decoder; ``transfer_style``
+    is the only entry point for generation.
+    """
+
+    def __init__(
+        self,
+        model: nn.Module,
+        tokenizer: Any,
+        batch_size: int = 32,
+        max_length: int = 512,
+        max_tokens_per_batch: Optional[int] = None,
+        tasks: Optional[Sequence[str]] = None,
+        device: Optional[torch.device] = None,
+        embedding_cache: Optional[EmbeddingCache] = None,
+        metrics: Optional["InferenceMetrics"] = None,
+        normalizer: Optional[TextNormalizer] = None,
+        tokenize_workers: int = 1,
+    ) -> None:
+        # A unified model or an exported artifact; both expose the same methods
+        self.model: Any = model
+        self.tokenizer = tokenizer
+        self.batch_size = batch_size
+        self.max_length = max_length
+        self.max_tokens_per_batch = max_tokens_per_batch
+        self.tasks = list(tasks) if tasks is not None else self._scoring_tasks(model)
+        self.device = device or next(model.parameters()).device
+        self.embedding_cache = embedding_cache
+        self.metrics = metrics
+
+        if normalizer is None:
+            normalizer = TextNormalizer.from_config(
+                getattr(getattr(model, "config", None), "text_preprocessing", None)
+            )
+        self.batch_tokenizer = BatchTokenizer(
+            tokenizer, normalizer, max_length, num_workers=tokenize_workers
+        )
+
+        self.pad_token_id = getattr(tokenizer, "pad_token_id", None) or 0
+        self.model.to(self.device)
+        self.model.eval()
+
+    @staticmethod
+    def _scoring_tasks(model: nn.Module) -> Optional[List[str]]:
+        """Enabled heads of ``model`` minus the generative ones"""
+        heads = getattr(model, "task_heads", None)
+        if heads is None:
+            heads = getattr(model, "exported_tasks", None)
+        if heads is None:
+            return None
+        return scoring_tasks(heads)
+
+    @classmethod
+    def from_pretrained(
+        cls, pretrained_model_name_or_path: str, quantize: bool = False, **kwargs: Any
+    ) -> "InferencePipeline":
+        """
+        Load model and tokenizer saved with ``save_pretrained``.
+
+        With ``quantize`` the fp32 checkpoint is converted to a dynamic int8
+        model after loading, and the pipeline runs on CPU.
+        """
+        from transformers import AutoTokenizer
+
+        from ..models.unified_model import TextForensicsUnifiedModel
+
+        model = TextForensicsUnifiedModel.from_pretrained(pretrained_model_name_or_path)
+        if quantize:
+            from ..serving.quantization import quantize_dynamic_int8
+
+            model = quantize_dynamic_int8(model)
+            kwargs["device"] = torch.device("cpu")
+        tokenizer = AutoTokenizer.from_pretrained(pretrained_model_name_or_path)
+        return cls(model, tokenizer, **kwargs)
+
+    @classmethod
+    def from_exported(
+        cls,
+        path: str,
+        warmup_buckets: Optional[Sequence[Tuple[int, int]]] = None,
+        **kwargs: Any,
+    ) -> "InferencePipeline":
+        """Load a compiled artifact written by ``export_model`` and warm it up"""
+        from transformers import AutoTokenizer
+
+        from ..serving.export import ExportedModel
+
+        model = ExportedModel.load(path, warmup_buckets=warmup_buckets)
+        tokenizer = AutoTokenizer.from_pretrained(path)
+        return cls(model, tokenizer, device=torch.device("cpu"), **kwargs)
+
+    def _tokenize(self, texts: Sequence[str]) -> List[List[int]]:
+        """Tokenize texts without padding"""
+        start = time.perf_counter()
+        input_ids = self.batch_tokenizer(texts)
+        if self.metrics is not None:
+            self.metrics.observe_tokenize(time.perf_counter() - start, len(texts))
+        return input_ids
+
+    def _make_batches(self, lengths: Sequence[int]) -> List[List[int]]:
+        """Group sample indices of similar length into batches"""
+        order = sorted(range(len(lengths)), key=lambda i: lengths[i], reverse=True)
+
+        batches: List[List[int]] = []
+        current: List[int] = []
+        for index in order:
+            # Longest sample comes first, so it sets the padded width
+            width = lengths[current[0]] if current else lengths[index]
+            too_many_tokens = (
+                self.max_tokens_per_batch is not None
+                and current
+                and width * (len(current) + 1) > self.max_tokens_per_batch
+            )
+            if len(current) >= self.batch_size or too_many_tokens:
+                batches.append(current)
+                current = []
+            current.append(index)
+
+        if current:
+            batches.append(current)
+        return batches
+
+    def _pad(
+        self, sequences: Sequence[Sequence[int]]
+    ) -> Tuple[torch.Tensor, torch.Tensor]:
+        """Pad sequences to the longest one in the batch"""
+        width = max(len(seq) for seq in sequences)
+        input_ids = torch.full(
+            (len(sequences), width), self.pad_token_id, dtype=torch.long
+        )
+        attention_mask = torch.zeros((len(sequences), width), dtype=torch.long)
+
+        for row, seq in enumerate(sequences):
+            input_ids[row, : len(seq)] = torch.tensor(seq, dtype=torch.long)
+            attention_mask[row, : len(seq)] = 1
+
+        return input_ids, attention_mask
+
+    def _run_batch(
+        self, input_ids: torch.Tensor, attention_mask: torch.Tensor
+    ) -> Dict[str, torch.Tensor]:
+        """Run the model on a single padded batch"""
+        # Per-token outputs have batch-dependent widths and are not requested
+        outputs: Dict[str, torch.Tensor] = self.model(
+            input_ids=input_ids,
+            attention_mask=attention_mask,
+            output_spec=OutputSpec(tasks=self.tasks),
+        )
+        return outputs
+
+    def _run_bucketed(
+        self,
+        sequences: Sequence[Sequence[int]],
+        run_batch: Callable[[torch.Tensor, torch.Tensor], Dict[str, torch.Tensor]],
+    ) -> Dict[str, torch.Tensor]:
+        """Run ``run_batch`` over length buckets, gathering rows in input order"""
+        lengths = [len(seq) for seq in sequences]
+
+        results: Dict[str, torch.Tensor] = {}
+        with torch.inference_mode():
+            for batch_indices in self._make_batches(lengths):
+                input_ids, attention_mask = self._pad(
+                    [sequences[i] for i in batch_indices]
+                )
+                start = time.perf_counter()
+                outputs = run_batch(
+                    input_ids.to(self.device), attention_mask.to(self.device)
+                )
+
+                index = torch.tensor(batch_indices, dtype=torch.long)
+                for name, value in outputs.items():
+                    value = value.cpu()
+                    if name not in results:
+                        results[name] = value.new_empty(
+                            (len(sequences),) + tuple(value.shape[1:])
+                        )
+                    results[name].index_copy_(0, index, value)
+                # Measured after the device-to-host copies, which synchronize
+                if self.metrics is not None:
+                    self.metrics.observe_batch(
+                        time.perf_counter() - start,
+                        len(batch_indices),
+                        input_ids.shape[1],
+                        sum(lengths[i] for i in batch_indices),
+                    )
+
+        return results
+
+    def predict(self, texts: Sequence[str]) -> Dict[str, torch.Tensor]:
+        """
+        Run inference on raw texts, returning outputs in input order.
+
+        With an ``embedding_cache``, texts whose style embedding is cached
+        skip tokenization and the backbone; only the task heads run on them.
+        """
+        if not texts:
+            return {}
+        if self.embedding_cache is None or not self._heads_read_embeddings():
+            return self._run_bucketed(self._tokenize(texts), self._run_batch)
+        return self._predict_cached(texts, self.embedding_cache)
+
+    def _heads_read_embeddings(self) -> bool:
+        """Whether every requested head can run on a cached style embedding"""
+        return (
+            hasattr(self.model, "score_embeddings")
+            and self.tasks is not None
+            and scoring_tasks(self.tasks) == self.tasks
+        )
+
+    def _predict_cached(
+        self, texts: Sequence[str], cache: EmbeddingCache
+    ) -> Dict[str, torch.Tensor]:
+        cached = cache.get_many(texts)
+        misses = [i for i, embedding in enumerate(cached) if embedding is None]
+        hits = [(i, e) for i, e in enumerate(cached) if e is not None]
+        parts: List[Tuple[List[int], Dict[str, torch.Tensor]]] = []
+
+        # Encode each distinct missing text once
+        unique_texts = list(dict.fromkeys(texts[i] for i in misses))
+        if unique_texts:
+            outputs = self._run_bucketed(self._tokenize(unique_texts), self._run_batch)
+            cache.put_many(unique_texts, outputs["style_embeddings"].float().numpy())
+            position = {text: row for row, text in enumerate(unique_texts)}
+            rows = torch.tensor([position[texts[i]] for i in misses], dtype=torch.long)
+            parts.append((misses, {k: v[rows] for k, v in outputs.items()}))
+
+        if hits:
+            dtype = next(self.model.parameters()).dtype
+            embeddings = torch.stack([torch.from_numpy(e) for _, e in hits])
+            embeddings = embeddings.to(self.device, dtype=dtype)
+            with torch.inference_mode():
+                outputs = self.model.score_embeddings(embeddings, self.tasks)
+            outputs["style_embeddings"] = embeddings
+            parts.append(
+                ([i for i, _ in hits], {k: v.cpu() for k, v in outputs.items()})
+            )
+
+        results: Dict[str, torch.Tensor] = {}
+        for indices, part in parts:
+            index = torch.tensor(indices, dtype=torch.long)
+            for name, value in part.items():
+                if name not in results:
+                    results[name] = value.new_empty((len(texts),) + value.shape[1:])
+                results[name].index_copy_(0, index, value.to(results[name].dtype))
+        return results
+
+    def predict_early_exit(
+        self, texts: Sequence[str], threshold: Optional[float] = None
+    ) -> Dict[str, torch.Tensor]:
+        """
+        Style classification with confidence-based early exit.
+
+        Returns ``style_classification_output`` logits and ``exit_layers``
+        (encoder layers used per text), in input order.
+        """
+        if not texts:
+            return {}
+
+        def run_batch(
+            input_ids: torch.Tensor, attention_mask: torch.Tensor
+        ) -> Dict[str, torch.Tensor]:
+            outputs: Dict[str, torch.Tensor] = self.model.classify_early_exit(
+                input_ids, attention_mask, threshold=threshold
+            )
+            return outputs
+
+        return self._run_bucketed(self._tokenize(texts), run_batch)
+
+    def embed(self, texts: Sequence[str]) -> torch.Tensor:
+        """
+        Compute style embeddings for raw texts, in input order.
+
+        With an ``embedding_cache``, cached texts skip tokenization and the
+        backbone entirely; only misses are encoded and then stored.
+        """
+        if self.embedding_cache is None:
+            return self._embed_uncached(texts)
+
+        cached = self.embedding_cache.get_many(texts)
+        misses = [i for i, embedding in enumerate(cached) if embedding is None]
+        # Encode each distinct missing text once
+        unique_texts = list(dict.fromkeys(texts[i] for i in misses))
+
+        computed: Dict[str, torch.Tensor] = {}
+        if unique_texts:
+            embeddings = self._embed_uncached(unique_texts)
+            self.embedding_cache.put_many(unique_texts, embeddings.float().numpy())
+            computed = dict(zip(unique_texts, embeddings.float()))
+
+        rows = [
+            computed[texts[i]] if embedding is None else torch.from_numpy(embedding)
+            for i, embedding in enumerate(cached)
+        ]
+        return torch.stack(rows) if rows else torch.empty(0)
+
+    def _embed_uncached(self, texts: Sequence[str]) -> torch.Tensor:
+        def run_batch(
+            input_ids: torch.Tensor, attention_mask: torch.Tensor
+        ) -> Dict[str, torch.Tensor]:
+            embeddings = self.model.get_style_embeddings(input_ids, attention_mask)
+            return {"style_embeddings": embeddings}
+
+        if not texts:
+            return torch.empty(0)
+        outputs = self._run_bucketed(self._tokenize(texts), run_batch)
+        return outputs["style_embeddings"]
+
+    def embed_long(
+        self,
+        texts: Sequence[str],
+        window_size: Optional[int] = None,
+        stride: Optional[int] = None,
+    ) -> torch.Tensor:
+        """
+        Compute one style embedding per document of arbitrary length.
+
+        Each document is tokenized in full and split into overlapping windows
+        of ``window_size`` tokens (``max_length`` by default) starting every
+        ``stride`` tokens (the model's ``window_stride`` by default), which
+        must not exceed ``window_size - 2`` so that no tokens are skipped.
+        Windows of all documents share length-bucketed batches, so cost scales
+        with the total number of tokens rather than the number of documents.
+        The window embeddings are then pooled per document by the model.
+        """
+        if not texts:
+            return torch.empty(0)
+        window_size = window_size or self.max_length
+        stride = stride or int(self.model.config.window_stride)
+
+        encoded = self.batch_tokenizer(texts, truncation=False)
+
+        windows: List[List[int]] = []
+        document_index: List[int] = []
+        for doc, input_ids in enumerate(encoded):
+            doc_windows = sliding_windows(input_ids, window_size, stride)
+            windows.extend(doc_windows)
+            document_index.extend([doc] * len(doc_windows))
+
+        def run_batch(
+            input_ids: torch.Tensor, attention_mask: torch.Tensor
+        ) -> Dict[str, torch.Tensor]:
+            embeddings = self.model.get_style_embeddings(input_ids, attention_mask)
+            return {"style_embeddings": embeddings}
+
+        window_embeddings = self._run_bucketed(windows, run_batch)["style_embeddings"]
+        with torch.inference_mode():
+            pooled: torch.Tensor = self.model.pool_windows(
+                window_embeddings.to(self.device),
+                torch.tensor(document_index, device=self.device),
+                len(texts),
+            )
+        return pooled.cpu()
+
+    def transfer_style(
+        self,
+        texts: Sequence[str],
+        target_texts: Optional[Sequence[str]] = None,
+        max_length: Optional[int] = None,
+        num_beams: Optional[int] = None,
+        length_penalty: Optional[float] = None,
+    ) -> List[str]:
+        """
+        Rewrite ``texts`` with the style transfer decoder.
+
+        With ``target_texts``, every text is rewritten towards their mean
+        style embedding; otherwise each text keeps its own style. Decoding
+        settings default to the ``style_transfer`` head config.
+        """
+        if not texts:
+            return []
+        head_config = self.model.config.task_heads.get("style_transfer", {})
+        num_beams = num_beams or head_config.get("num_beams", 1)
+        if length_penalty is None:
+            length_penalty = head_config.get("length_penalty", 1.0)
+        target_style = None
+        if target_texts:
+            target_style = self.embed(target_texts).mean(dim=0).to(self.device)
+
+        def run_batch(
+            input_ids: torch.Tensor, attention_mask: torch.Tensor
+        ) -> Dict[str, torch.Tensor]:
+            outputs: Dict[str, torch.Tensor] = self.model.transfer_style(
+                input_ids,
+                attention_mask,
+                target_style=target_style,
+                max_length=max_length,
+                num_beams=num_beams,
+                length_penalty=length_penalty,
+            )
+            return outputs
+
+        sequences = self._run_bucketed(self._tokenize(texts), run_batch)["sequences"]
+        decoded: List[str] = self.tokenizer.batch_decode(
+            sequences.tolist(), skip_special_tokens=True
+        )
+        return decoded
+
+    def __call__(self, texts: Sequence[str]) -> Dict[str, torch.Tensor]:
+        return self.predict(texts)
@@ -1,12 +1,36 @@
 """Training Pipeline for TextForensics"""
 
-from typing import Any, Dict
+import contextlib
+import logging
+import os
+import time
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple, cast
 
 import torch
+import torch.distributed as dist
 import torch.nn as nn
-from omegaconf import DictConfig
+import torch.nn.functional as F
+from omegaconf import DictConfig, OmegaConf
+from torch.nn.parallel import DistributedDataParallel
+from torch.utils.data import ConcatDataset, DataLoader, Dataset
 
-from ..utils import setup_logging
+from ..data import (
+    LengthBucketBatchSampler,
+    MultiTaskBatchSampler,
+    PaddingCollator,
+    TaskDataset,
+    TextNormalizer,
+    TokenShardDataset,
+    preprocess_corpus,
+)
+from ..data.preprocessing import resolve_path
+from ..losses import TASK_LABEL_KEYS, MultiTaskLoss, build_task_losses, present_tasks
+from ..models.outputs import OutputSpec
+from ..utils import CheckpointManager, build_telemetry_writer, setup_logging
+
+if TYPE_CHECKING:
+    from ..models.unified_model import TextForensicsUnifiedModel
 
 
 class TrainingPipeline:
@@ -14,55 +38,613 @@ class TrainingPipeline:
 
     def __init__(self, config: DictConfig):
         self.config = config
-        self.logger = setup_logging(config)
+
+        # Data-parallel rank, set when launched through ``launch_distributed``
+        self.distributed = dist.is_available() and dist.is_initialized()
+        self.rank = dist.get_rank() if self.distributed else 0
+        self.world_size = dist.get_world_size() if self.distributed else 1
+        self.is_main_process = self.rank == 0
+
+        # Only rank 0 writes logs; other ranks report warnings and errors
+        if self.is_main_process:
+            self.logger = setup_logging(config)
+        else:
+            self.logger = logging.getLogger("textforensics")
+            self.logger.setLevel(logging.WARNING)
 
         # Initialize model
         self.model = self._build_model()
 
-        # Initialize data loaders (placeholder)
+        # Initialize data loaders
         self.train_loader, self.val_loader = self._build_dataloaders()
 
+        # Initialize loss functions (learned loss weights join the optimizer)
+        self.loss_functions = self._build_loss_functions()
+
         # Initialize optimizer and scheduler
         self.optimizer = self._build_optimizer()
         self.scheduler = self._build_scheduler()
 
-        # Initialize loss functions
-        self.loss_functions = self._build_loss_functions()
+        # Setup device (gloo data-parallel workers run on CPU)
+        use_cuda = torch.cuda.is_available() and not self.distributed
+        self.device = torch.device("cuda" if use_cuda else "cpu")
+        # PreTrainedModel.to is wrapped in a decorator mypy cannot see through
+        cast(nn.Module, self.model).to(self.device)
+        self.multi_task_loss.to(self.device)
+        for loss_function in self.loss_functions.values():
+            loss_function.to(self.device)
+
+        # Mixed precision, gradient accumulation and checkpointing
+        self._setup_compute()
+
+        # Gradients are all-reduced through DDP when running data-parallel
+        self.train_model: nn.Module = self.model
+        if self.distributed:
+            # Heads without labels in a batch get no gradient
+            self.train_model = DistributedDataParallel(
+                self.model, find_unused_parameters=True
+            )
+
+        # Checkpoints are written by rank 0 only
+        self.checkpoint_manager = (
+            self._build_checkpoint_manager() if self.is_main_process else None
+        )
 
-        # Setup device
-        self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
-        self.model.to(self.device)
+        # Per-step telemetry stream, one file per rank
+        self.telemetry = build_telemetry_writer(config, self.rank, self.world_size)
+        self.telemetry_every = OmegaConf.select(
+            config, "pipeline.logging.telemetry.every_n_steps", default=1
+        )
+        # Detached per-task loss terms of the last ``_compute_loss`` call
+        self.loss_components: Dict[str, torch.Tensor] = {}
 
         # Initialize tracking
         self.current_epoch = 0
+        self.global_step = 0
         self.best_val_loss = float("inf")
         self.patience_counter = 0
 
-    def _build_model(self) -> nn.Module:
+    def _compute_config(self) -> DictConfig:
+        """Settings from ``conf/infrastructure/compute/*.yaml``"""
+        compute: DictConfig = OmegaConf.select(
+            self.config, "infrastructure.compute.compute", default=None
+        ) or OmegaConf.create({})
+        return compute
+
+    def _setup_compute(self) -> None:
+        """Configure autocast, gradient accumulation and gradient checkpointing"""
+        compute = self._compute_config()
+
+        self.use_autocast = bool(compute.get("mixed_precision", False))
+        precision = compute.get("precision", "bf16")
+        self.autocast_dtype = torch.float16 if precision == "fp16" else torch.bfloat16
+        if self.device.type == "cpu" and self.autocast_dtype == torch.float16:
+            # CPU autocast is only fast for bfloat16
+            self.logger.warning("fp16 autocast is not supported on CPU, using bf16")
+            self.autocast_dtype = torch.bfloat16
+
+        # Loss scaling is only needed for fp16; bf16 has fp32's exponent range
+        self.grad_scaler = torch.amp.GradScaler(
+            self.device.type,
+            enabled=self.use_autocast and self.autocast_dtype == torch.float16,
+        )
+
+        self.accumulation_steps = max(
+            1, int(compute.get("memory", {}).get("gradient_accumulation_steps", 1))
+        )
+
+        gradient_checkpointing = OmegaConf.select(
+            self.config, "model.initialization.gradient_checkpointing", default=False
+        ) or compute.get("training", {}).get("gradient_checkpointing", False)
+        if gradient_checkpointing:
+            self.model.backbone.gradient_checkpointing_enable()
+
+        self.logger.info(
+            f"autocast={self.use_autocast} "
+            f"({str(self.autocast_dtype).replace('torch.', '')}), "
+            f"gradient_accumulation_steps={self.accumulation_steps}, "
+            f"gradient_checkpointing={bool(gradient_checkpointing)}"
+        )
+
+    def _autocast(self) -> torch.autocast:
+        return torch.autocast(
+            self.device.type, dtype=self.autocast_dtype, enabled=self.use_autocast
+        )
+
+    def _build_model(self) -> "TextForensicsUnifiedModel":
         """Build model from config"""
         # Placeholder - would use hydra.utils.instantiate in real implementation
         from ..models.base import TextForensicsConfig
         from ..models.unified_model import TextForensicsUnifiedModel
 
-        config = TextForensicsConfig()
+        model_config = self.config.get("model")
+        if model_config is None:
+            return TextForensicsUnifiedModel(TextForensicsConfig())
+
+        overrides = {}
+        data_config = self.config.get("data")
+        if data_config is not None:
+            # Saved with the model so inference normalizes texts the same way
+            normalizer = TextNormalizer.from_config(data_config.preprocessing)
+            overrides["text_preprocessing"] = normalizer.to_dict()
+        config = TextForensicsConfig.from_model_config(model_config, **overrides)
         return TextForensicsUnifiedModel(config)
 
+    def _build_dataset(self, path: Path) -> Dataset:
+        """
+        Dataset over one split's token shards.
+
+        Overrides may wrap the shards, but the result has to keep their
+        ``lengths`` and ``pad_token_id`` for bucketing and padding.
+        """
+        return TokenShardDataset(path)
+
     def _build_dataloaders(self) -> tuple:
-        """Build data loaders from config"""
-        # Placeholder implementation
-        return None, None
+        """Build data loaders over pre-tokenized shards in ``data.cache_dir``"""
+        data_config = self.config.get("data")
+        if data_config is None:
+            return None, None
+
+        # Rank 0 tokenizes; the other ranks wait and then read its shards
+        seed = self.config.get("seed", 42)
+        if self.is_main_process:
+            cache_dir = preprocess_corpus(data_config, seed=seed)
+        if self.distributed:
+            dist.barrier()
+        if not self.is_main_process:
+            cache_dir = preprocess_corpus(data_config, seed=seed)
+        train_dataset: Any = self._build_dataset(cache_dir / "train")
+        val_dataset: Any = self._build_dataset(cache_dir / "validation")
+
+        loader_config = data_config.dataloader
+        # Pad each batch only to its own longest example
+        collate_fn = PaddingCollator(train_dataset.pad_token_id, pad_to_multiple_of=8)
+        loader_kwargs = {
+            "num_workers": loader_config.num_workers,
+            "pin_memory": loader_config.pin_memory and torch.cuda.is_available(),
+            "collate_fn": collate_fn,
+        }
+
+        def train_batches(dataset: Any) -> LengthBucketBatchSampler:
+            return LengthBucketBatchSampler(
+                dataset.lengths,
+                batch_size=loader_config.batch_size,
+                shuffle=loader_config.shuffle,
+                drop_last=loader_config.drop_last,
+                seed=seed,
+                num_replicas=self.world_size,
+                rank=self.rank,
+            )
+
+        def val_batches(dataset: Any) -> LengthBucketBatchSampler:
+            return LengthBucketBatchSampler(
+                dataset.lengths,
+                batch_size=loader_config.batch_size,
+                shuffle=False,
+                seed=seed,
+                num_replicas=self.world_size,
+                rank=self.rank,
+            )
+
+        task_datasets = self._build_task_datasets()
+        if not task_datasets:
+            train_loader = DataLoader(
+                train_dataset,
+                batch_sampler=train_batches(train_dataset),
+                **loader_kwargs,
+            )
+            val_loader = DataLoader(
+                val_dataset, batch_sampler=val_batches(val_dataset), **loader_kwargs
+            )
+            return train_loader, val_loader
+
+        # Task-grouped batches over the corpus and every extra task's data
+        train_sets: Dict[str, Any] = {"style_classification": train_dataset}
+        val_sets: Dict[str, Any] = {"style_classification": val_dataset}
+        for task, (task_train, task_val) in task_datasets.items():
+            train_sets[task], val_sets[task] = task_train, task_val
+        sampling = OmegaConf.select(
+            self.config, "training.strategy.sampling", default=None
+        ) or OmegaConf.create({})
+        train_sampler = MultiTaskBatchSampler(
+            {task: train_batches(d) for task, d in train_sets.items()},
+            [len(d) for d in train_sets.values()],
+            method=sampling.get("method", "proportional"),
+            temperature=sampling.get("temperature", 1.0),
+            num_batches=sampling.get("num_batches"),
+            seed=seed,
+        )
+        val_sampler = MultiTaskBatchSampler(
+            {task: val_batches(d) for task, d in val_sets.items()},
+            [len(d) for d in val_sets.values()],
+            seed=seed,
+        )
+        self.logger.info(
+            "Multi-task batches per epoch: "
+            + ", ".join(
+                f"{task}={p:.1%}"
+                for task, p in zip(train_sampler.tasks, train_sampler.probabilities)
+            )
+        )
 
-    def _build_optimizer(self):
+        train_loader = DataLoader(
+            ConcatDataset(list(train_sets.values())),
+            batch_sampler=train_sampler,
+            **loader_kwargs,
+        )
+        val_loader = DataLoader(
+            ConcatDataset(list(val_sets.values())),
+            batch_sampler=val_sampler,
+            **loader_kwargs,
+        )
+        return train_loader, val_loader
+
+    def _build_task_datasets(self) -> Dict[str, Tuple[Dataset, Dataset]]:
+        """
+        Train and validation data of the tasks trained besides style
+        classification, from ``training.strategy.tasks``.
+
+        Configured tasks read token shards whose labels are the task's
+        per-text targets. Subclasses can add pair or sequence tasks
+        (``similarity_scoring``, ``style_transfer``) by returning datasets
+        that yield the batch keys of ``TASK_LABEL_KEYS``.
+        """
+        tasks = OmegaConf.select(self.config, "training.strategy.tasks", default=None)
+        datasets: Dict[str, Tuple[Dataset, Dataset]] = {}
+        for task, task_config in (tasks or {}).items():
+            if not task_config.get("enabled", True):
+                continue
+            if task != "anomaly_detection":
+                raise ValueError(
+                    f"{task} has no per-text shard format; provide its data by "
+                    "overriding _build_task_datasets"
+                )
+            if task not in self.model.task_heads:
+                raise ValueError(f"Task {task} is configured but its head is disabled")
+            train_split, val_split = (
+                TaskDataset(
+                    TokenShardDataset(resolve_path(task_config[split])),
+                    TASK_LABEL_KEYS[task],
+                    dtype=torch.float32,
+                )
+                for split in ("train", "validation")
+            )
+            datasets[task] = (train_split, val_split)
+        return datasets
+
+    def _build_optimizer(self) -> torch.optim.Optimizer:
         """Build optimizer from config"""
-        return torch.optim.AdamW(self.model.parameters(), lr=5e-5)
+        parameters = list(self.model.parameters())
+        parameters += list(self.multi_task_loss.parameters())
+        return torch.optim.AdamW(parameters, lr=5e-5)
 
-    def _build_scheduler(self):
+    def _build_scheduler(self) -> torch.optim.lr_scheduler.LRScheduler:
         """Build learning rate scheduler from config"""
         return torch.optim.lr_scheduler.CosineAnnealingLR(self.optimizer, T_max=10)
 
     def _build_loss_functions(self) -> Dict[str, nn.Module]:
-        """Build loss functions for each task"""
-        return {"classification": nn.CrossEntropyLoss()}
+        """Build per-task losses and their combination from ``training.loss``"""
+        self.early_exit_loss_weight = OmegaConf.select(
+            self.config, "model.early_exit.loss_weight", default=0.5
+        )
+        loss_config = OmegaConf.select(self.config, "training.loss", default=None)
+        loss_settings = (
+            cast(Dict[str, Any], OmegaConf.to_container(loss_config, resolve=True))
+            if loss_config
+            else {}
+        )
+        loss_functions = build_task_losses(loss_settings)
+        loss_functions.setdefault("style_classification", nn.CrossEntropyLoss())
+
+        # A task is trainable when the model has its head and it has a loss
+        tasks = [task for task in self.model.task_heads if task in loss_functions]
+        self.multi_task_loss = MultiTaskLoss.from_config(loss_settings, tasks)
+        return loss_functions
+
+    def _compute_loss(
+        self, batch: Dict[str, torch.Tensor], model: Optional[nn.Module] = None
+    ) -> Tuple[torch.Tensor, Optional[torch.Tensor]]:
+        """
+        Forward a batch and return ``(loss, logits)``.
+
+        Only the heads whose labels are in the batch run, and their losses
+        are combined by ``self.multi_task_loss``. ``logits`` are the style
+        classification logits, or ``None`` for batches without style labels.
+        """
+        model = model or self.model
+        tasks = present_tasks(batch, self.multi_task_loss.tasks)
+        classify = "style_classification" in tasks
+        train_exits = classify and len(self.model.exit_heads) > 0
+
+        input_ids, attention_mask = batch["input_ids"], batch["attention_mask"]
+        num_rows = len(input_ids)
+        if "similarity_scoring" in tasks:
+            if "style_transfer" in tasks:
+                raise ValueError(
+                    "similarity_scoring and style_transfer batches must be separate"
+                )
+            # Both texts of every pair go through a single forward pass
+            input_ids, attention_mask = self._stack_pairs(batch)
+
+        outputs = model(
+            input_ids=input_ids,
+            attention_mask=attention_mask,
+            output_spec=OutputSpec(
+                tasks=tasks,
+                style_embeddings=False,
+                early_exit_logits=train_exits,
+            ),
+            decoder_input_ids=batch.get("decoder_input_ids"),
+        )
+
+        task_losses: Dict[str, torch.Tensor] = {}
+        logits = None
+        if classify:
+            logits = outputs["style_classification_output"][:num_rows]
+            task_losses["style_classification"] = self.loss_functions[
+                "style_classification"
+            ](logits, batch["labels"])
+        if "anomaly_detection" in tasks:
+            probabilities = outputs["anomaly_detection_output"][:num_rows].squeeze(-1)
+            labels = batch["anomaly_labels"].to(probabilities.dtype)
+            loss_function = self.loss_functions["anomaly_detection"]
+            if isinstance(loss_function, nn.BCEWithLogitsLoss):
+                # The head ends in a sigmoid; recover its logits
+                probabilities = torch.logit(probabilities.float(), eps=1e-6)
+                labels = labels.float()
+            task_losses["anomaly_detection"] = loss_function(probabilities, labels)
+        if "similarity_scoring" in tasks:
+            embeddings = outputs["similarity_scoring_output"].float()
+            first, second = embeddings[:num_rows], embeddings[num_rows:]
+            metric = self.model.config.task_heads["similarity_scoring"].get(
+                "metric", "cosine"
+            )
+            if metric == "cosine":
+                scores = F.cosine_similarity(first, second, dim=-1)
+            else:
+                scores = (first * second).sum(dim=-1)
+            task_losses["similarity_scoring"] = self.loss_functions[
+                "similarity_scoring"
+            ](scores, batch["similarity_labels"].float())
+        if "style_transfer" in tasks:
+            transfer_logits = outputs["style_transfer_output"]
+            task_losses["style_transfer"] = self.loss_functions["style_transfer"](
+                transfer_logits.flatten(0, 1), batch["decoder_labels"].flatten()
+            )
+
+        loss = self.multi_task_loss(task_losses)
+        self.loss_components = {k: v.detach() for k, v in task_losses.items()}
+
+        if train_exits:
+            # Every exit classifier learns the same labels as the final head
+            exit_logits = outputs["early_exit_logits"][:, :num_rows]
+            exit_loss = self.loss_functions["style_classification"](
+                exit_logits.flatten(0, 1),
+                batch["labels"].repeat(exit_logits.shape[0]),
+            )
+            loss = loss + self.early_exit_loss_weight * exit_loss
+            self.loss_components["early_exit"] = exit_loss.detach()
+        return loss, logits
+
+    @staticmethod
+    def _stack_pairs(
+        batch: Dict[str, torch.Tensor],
+    ) -> Tuple[torch.Tensor, torch.Tensor]:
+        """``input_ids`` rows followed by ``pair_input_ids`` rows, padded alike"""
+        first, second = batch["input_ids"], batch["pair_input_ids"]
+        first_mask, second_mask = batch["attention_mask"], batch["pair_attention_mask"]
+        width = max(first.shape[1], second.shape[1])
+
+        def widen(tensor: torch.Tensor) -> torch.Tensor:
+            return F.pad(tensor, (0, width - tensor.shape[1]))
+
+        input_ids = torch.cat([widen(first), widen(second)])
+        attention_mask = torch.cat([widen(first_mask), widen(second_mask)])
+        return input_ids, attention_mask
+
+    def _train_epoch(self) -> Dict[str, float]:
+        """Run one training epoch and report throughput"""
+        self.model.train()
+        self.multi_task_loss.train()
+        batch_sampler = self.train_loader.batch_sampler
+        if isinstance(batch_sampler, (LengthBucketBatchSampler, MultiTaskBatchSampler)):
+            batch_sampler.set_epoch(self.current_epoch)
+
+        log_every = self.config.pipeline.get("logging", {}).get("log_every_n_steps", 50)
+        total_loss, num_steps = 0.0, 0
+        num_tokens, num_slots = 0, 0
+        start_time = time.perf_counter()
+
+        num_batches = len(self.train_loader)
+        self.optimizer.zero_grad(set_to_none=True)
+
+        batches = iter(self.train_loader)
+        for step in range(num_batches):
+            # Time blocked on the loader, vs. the rest of the step in compute
+            step_start = time.perf_counter()
+            batch = next(batches, None)
+            if batch is None:
+                break
+            data_wait = time.perf_counter() - step_start
+
+            # Count real vs padded tokens before the batch leaves the host
+            batch_tokens = int(batch["attention_mask"].sum())
+            batch_slots = batch["attention_mask"].numel()
+            num_tokens += batch_tokens
+            num_slots += batch_slots
+            batch = {k: v.to(self.device, non_blocking=True) for k, v in batch.items()}
+
+            # The last group of the epoch may hold fewer micro-batches
+            group_start = step - step % self.accumulation_steps
+            group_size = min(self.accumulation_steps, num_batches - group_start)
+            is_update_step = step + 1 == group_start + group_size
+            # Skip the gradient all-reduce on micro-batches that do not step
+            sync_context = (
+                self.train_model.no_sync()
+                if isinstance(self.train_model, DistributedDataParallel)
+                and not is_update_step
+                else contextlib.nullcontext()
+            )
+            with sync_context:
+                with self._autocast():
+                    loss, _ = self._compute_loss(batch, self.train_model)
+                # Average gradients over the micro-batches of one optimizer step
+                self.grad_scaler.scale(loss / group_size).backward()
+
+            if is_update_step:
+                if self.distributed:
+                    self._all_reduce_loss_weight_grads()
+                self.grad_scaler.step(self.optimizer)
+                self.grad_scaler.update()
+                self.optimizer.zero_grad(set_to_none=True)
+
+            total_loss += loss.item()
+            num_steps += 1
+            self.global_step += 1
+
+            # ``loss.item()`` synchronized the device, so the step is complete
+            if self.telemetry is not None and step % self.telemetry_every == 0:
+                self._write_step_telemetry(
+                    step,
+                    time.perf_counter() - step_start,
+                    data_wait,
+                    len(batch["input_ids"]),
+                    batch_tokens,
+                    batch_slots,
+                    loss.item(),
+                )
+
+            if (step + 1) % log_every == 0:
+                elapsed = time.perf_counter() - start_time
+                self.logger.info(
+                    f"step {step + 1}: loss={total_loss / num_steps:.4f} "
+                    f"tokens/sec={num_tokens / elapsed:.0f}"
+                )
+
+        self.scheduler.step()
+        self.multi_task_loss.step_epoch()
+        elapsed = time.perf_counter() - start_time
+        return {
+            "train_loss": total_loss / max(num_steps, 1),
+            "epoch_time": elapsed,
+            "tokens_per_sec": num_tokens / elapsed if elapsed > 0 else 0.0,
+            "padding_ratio": 1.0 - num_tokens / num_slots if num_slots else 0.0,
+        }
+
+    def _all_reduce_loss_weight_grads(self) -> None:
+        """Average learned loss-weight gradients, which DDP does not cover"""
+        for parameter in self.multi_task_loss.parameters():
+            if parameter.grad is None:
+                parameter.grad = torch.zeros_like(parameter)
+            dist.all_reduce(parameter.grad)
+            parameter.grad /= self.world_size
+
+    def _write_step_telemetry(
+        self,
+        step: int,
+        step_time: float,
+        data_wait: float,
+        num_samples: int,
+        num_tokens: int,
+        num_slots: int,
+        loss: float,
+    ) -> None:
+        """Append one ``step`` record to the telemetry stream"""
+        assert self.telemetry is not None
+        self.telemetry.write(
+            "step",
+            pid=os.getpid(),
+            rank=self.rank,
+            epoch=self.current_epoch,
+            step=step,
+            global_step=self.global_step,
+            step_time=step_time,
+            data_wait=data_wait,
+            compute_time=step_time - data_wait,
+            samples=num_samples,
+            tokens=num_tokens,
+            padded_tokens=num_slots,
+            samples_per_sec=num_samples / step_time,
+            tokens_per_sec=num_tokens / step_time,
+            loss=loss,
+            losses={k: v.item() for k, v in self.loss_components.items()},
+            lr=self.optimizer.param_groups[0]["lr"],
+            rss_mb=self.telemetry.rss_mb(),
+        )
+
+    @torch.no_grad()
+    def _validate(self) -> Dict[str, float]:
+        """Compute validation loss, accuracy and per-task losses"""
+        self.model.eval()
+        self.multi_task_loss.eval()
+        total_loss, num_correct, num_examples, num_classified = 0.0, 0, 0, 0
+        tasks = self.multi_task_loss.tasks
+        task_loss_sums = torch.zeros(len(tasks), dtype=torch.float64)
+        task_counts = torch.zeros(len(tasks), dtype=torch.float64)
+
+        for batch in self.val_loader:
+            batch = {k: v.to(self.device, non_blocking=True) for k, v in batch.items()}
+            with self._autocast():
+                loss, logits = self._compute_loss(batch)
+
+            batch_size = len(batch["input_ids"])
+            total_loss += loss.item() * batch_size
+            num_examples += batch_size
+            if logits is not None:
+                num_correct += int((logits.argmax(dim=-1) == batch["labels"]).sum())
+                num_classified += batch_size
+            for task, task_loss in self.loss_components.items():
+                if task in tasks:
+                    task_loss_sums[tasks.index(task)] += task_loss.item() * batch_size
+                    task_counts[tasks.index(task)] += batch_size
+
+        if self.distributed:
+            # Sum over all ranks so every rank sees the same global metrics
+            totals = torch.tensor(
+                [total_loss, num_correct, num_examples, num_classified],
+                dtype=torch.float64,
+            )
+            dist.all_reduce(totals)
+            total_loss, num_correct, num_examples, num_classified = totals.tolist()
+            dist.all_reduce(task_loss_sums)
+            dist.all_reduce(task_counts)
+
+        metrics = {
+            "val_loss": total_loss / max(num_examples, 1),
+            "val_accuracy": num_correct / max(num_classified, 1),
+        }
+        if len(tasks) > 1:
+            for task, loss_sum, count in zip(
+                tasks, task_loss_sums.tolist(), task_counts.tolist()
+            ):
+                if count:
+                    metrics[f"val_{task}_loss"] = loss_sum / count
+        return metrics
+
+    def _build_checkpoint_manager(self) -> Optional[CheckpointManager]:
+        """Top-k checkpointing driven by ``conf/pipeline/training.yaml``"""
+        checkpoint_dir = self.config.get("checkpoint_dir")
+        if checkpoint_dir is None:
+            return None
+        pipeline = self.config.get("pipeline", {})
+        return CheckpointManager(
+            checkpoint_dir,
+            monitor=pipeline.get("monitor_metric", "val_loss"),
+            mode=pipeline.get("monitor_mode", "min"),
+            save_top_k=pipeline.get("save_top_k", 1),
+            save_every_n_epochs=OmegaConf.select(
+                pipeline, "checkpoint.save_every_n_epochs", default=1
+            ),
+        )
+
+    def _should_stop(self) -> bool:
+        """Early-stopping decision, taken by rank 0 and shared with all ranks"""
+        stop = torch.tensor(
+            [int(self.patience_counter >= self.config.pipeline.patience)]
+        )
+        if self.distributed:
+            dist.broadcast(stop, src=0)
+        return bool(stop.item())
 
     def run(self) -> Dict[str, Any]:
         """Run the complete training pipeline"""
@@ -70,16 +652,68 @@ class TrainingPipeline:
         self.logger.info("Starting training pipeline...")
         self.logger.info(f"Training on device: {self.device}")
 
+        if self.train_loader is None or self.val_loader is None:
+            raise ValueError("TrainingPipeline needs a data config to run")
+
+        if self.telemetry is not None:
+            self.telemetry.write(
+                "start",
+                pid=os.getpid(),
+                rank=self.rank,
+                world_size=self.world_size,
+                device=str(self.device),
+                num_workers=self.train_loader.num_workers,
+                steps_per_epoch=len(self.train_loader),
+                accumulation_steps=self.accumulation_steps,
+            )
+
         # Training loop
         for epoch in range(self.config.pipeline.max_epochs):
             self.current_epoch = epoch
-
-            # Training phase - removed unused variable
-            # In real implementation, this would calculate actual training loss
             self.logger.info(f"Epoch {epoch + 1}/{self.config.pipeline.max_epochs}")
 
+            # Training phase
+            train_metrics = self._train_epoch()
+            self.logger.info(
+                f"train_loss={train_metrics['train_loss']:.4f} "
+                f"epoch_time={train_metrics['epoch_time']:.1f}s "
+                f"tokens/sec={train_metrics['tokens_per_sec']:.0f} "
+                f"padding_ratio={train_metrics['padding_ratio']:.1%}"
+            )
+
             # Validation phase
-            val_loss = 0.4  # Placeholder - would be actual validation loss
+            val_metrics = self._validate()
+            val_loss = val_metrics["val_loss"]
+            self.logger.info(
+                f"val_loss={val_loss:.4f} val_accuracy={val_metrics['val_accuracy']:.3f}"
+            )
+            if self.multi_task_loss.method != "weighted_sum":
+                weights = self.multi_task_loss.weights()
+                self.logger.info(
+                    "loss weights: "
+                    + " ".join(f"{task}={w:.3f}" for task, w in weights.items())
+                )
+
+            if self.telemetry is not None:
+                self.telemetry.write(
+                    "epoch",
+                    rank=self.rank,
+                    epoch=epoch,
+                    global_step=self.global_step,
+                    **train_metrics,
+                    **val_metrics,
+                )
+                self.telemetry.flush()
+
+            # Written in the background while the next epoch trains
+            if self.checkpoint_manager is not None:
+                self.checkpoint_manager.save(
+                    self.model,
+                    epoch,
+                    {**train_metrics, **val_metrics},
+                    optimizer=self.optimizer,
+                    scheduler=self.scheduler,
+                )
 
             # Early stopping check
             if val_loss < self.best_val_loss:
@@ -88,8 +722,23 @@ class TrainingPipeline:
             else:
                 self.patience_counter += 1
 
-            if self.patience_counter >= self.config.pipeline.patience:
+            if self._should_stop():
                 self.logger.info("Early stopping triggered")
                 break
 
-        return {"best_val_loss": self.best_val_loss, "final_epoch": self.current_epoch}
+        results: Dict[str, Any] = {
+            "best_val_loss": self.best_val_loss,
+            "final_epoch": self.current_epoch,
+        }
+        if self.checkpoint_manager is not None:
+            self.checkpoint_manager.close()
+            results["best_checkpoint"] = self.checkpoint_manager.best_checkpoint
+        if self.telemetry is not None:
+            self.telemetry.write(
+                "end",
+                rank=self.rank,
+                best_val_loss=self.best_val_loss,
+                final_epoch=self.current_epoch,
+            )
+            self.telemetry.close()
+        return results
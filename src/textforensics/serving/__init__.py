@@ -0,0 +1,37 @@
+"""TextForensics Serving Package"""
+
+from typing import TYPE_CHECKING
+
+from .._lazy import attach
+
+if TYPE_CHECKING:
+    from .batching import MicroBatcher
+    from .export import ExportedModel, export_model, is_exported
+    from .metrics import InferenceMetrics, MetricsRegistry, ModuleProfiler
+    from .quantization import quantize_dynamic_int8, serialized_size_mb
+
+_ATTRIBUTES = {
+    "ExportedModel": ".export",
+    "InferenceMetrics": ".metrics",
+    "MetricsRegistry": ".metrics",
+    "MicroBatcher": ".batching",
+    "ModuleProfiler": ".metrics",
+    "export_model": ".export",
+    "is_exported": ".export",
+    "quantize_dynamic_int8": ".quantization",
+    "serialized_size_mb": ".quantization",
+}
+
+__getattr__, __dir__ = attach(__name__, _ATTRIBUTES)
+
+__all__ = [
+    "ExportedModel",
+    "InferenceMetrics",
+    "MetricsRegistry",
+    "MicroBatcher",
+    "ModuleProfiler",
+    "export_model",
+    "is_exported",
+    "quantize_dynamic_int8",
+    "serialized_size_mb",
+]
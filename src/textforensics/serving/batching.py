@@ -0,0 +1,130 @@
+"""Async micro-batching for TextForensics serving"""
+
+import asyncio
+import logging
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger("textforensics")
+
+
+class MicroBatcher:
+    """
+    Merge concurrent requests into batched model calls.
+
+    Items submitted from any number of coroutines are placed on an asyncio
+    queue. A single background worker drains the queue into batches of at
+    most ``max_batch_size`` items, waiting no longer than ``max_wait_ms``
+    after the first item of a batch arrives, and runs ``process_fn`` on the
+    whole batch in a worker thread so the event loop keeps accepting requests.
+    """
+
+    def __init__(
+        self,
+        process_fn: Callable[[List[Any]], Sequence[Any]],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+    ) -> None:
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+
+        self.process_fn = process_fn
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+
+        self._queue: Optional["asyncio.Queue[Tuple[Any, asyncio.Future]]"] = None
+        self._worker: Optional["asyncio.Task[None]"] = None
+        # Items taken off the queue whose results have not been delivered yet
+        self._in_flight: List[Tuple[Any, asyncio.Future]] = []
+
+    @property
+    def running(self) -> bool:
+        return self._worker is not None and not self._worker.done()
+
+    async def start(self) -> None:
+        """Start the background batching worker"""
+        if self.running:
+            return
+        self._queue = asyncio.Queue()
+        self._worker = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Stop the worker and fail any requests still waiting"""
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+        # Cancelling the worker can interrupt a batch that already left the
+        # queue, either while it is being collected or while it is processed
+        pending, self._in_flight = self._in_flight, []
+        if self._queue is not None:
+            while not self._queue.empty():
+                pending.append(self._queue.get_nowait())
+        for _, future in pending:
+            if not future.done():
+                future.set_exception(RuntimeError("MicroBatcher stopped"))
+
+    async def submit(self, item: Any) -> Any:
+        """Queue a single item and wait for its result"""
+        if not self.running or self._queue is None:
+            raise RuntimeError("MicroBatcher is not running")
+
+        future: asyncio.Future = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, future))
+        return await future
+
+    async def _collect(self) -> List[Tuple[Any, asyncio.Future]]:
+        """Wait for one item, then gather more until the batch is full or stale"""
+        assert self._queue is not None
+        loop = asyncio.get_running_loop()
+
+        batch = self._in_flight = [await self._queue.get()]
+        deadline = loop.time() + self.max_wait_ms / 1000.0
+
+        while len(batch) < self.max_batch_size:
+            # Drain whatever is already queued without yielding
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+
+            timeout = deadline - loop.time()
+            if timeout <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+            except asyncio.TimeoutError:
+                break
+
+        return batch
+
+    async def _run(self) -> None:
+        """Background worker loop"""
+        while True:
+            self._in_flight = []
+            batch = await self._collect()
+            # Requests cancelled by their client no longer need a result
+            batch = [(item, future) for item, future in batch if not future.done()]
+            if not batch:
+                continue
+
+            items = [item for item, _ in batch]
+            try:
+                results = await asyncio.to_thread(self.process_fn, items)
+                if len(results) != len(items):
+                    raise RuntimeError(
+                        f"process_fn returned {len(results)} results "
+                        f"for {len(items)} items"
+                    )
+            except Exception as e:
+                logger.exception("Batched call failed")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
@@ -0,0 +1,231 @@
+"""Compiled, self-contained inference artifacts"""
+
+import json
+import logging
+import time
+from pathlib import Path
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+    cast,
+)
+
+import torch
+import torch.nn as nn
+
+from ..models.outputs import OutputSpec
+
+if TYPE_CHECKING:
+    from ..models.unified_model import TextForensicsUnifiedModel
+
+logger = logging.getLogger("textforensics")
+
+EXPORT_FILE = "export.json"
+FORMATS = {"torchscript": "model.pt", "torch_export": "model.pt2"}
+DEFAULT_WARMUP_BUCKETS = [(1, 64), (1, 128), (8, 128), (8, 256), (32, 256), (32, 512)]
+
+
+class _ExportWrapper(nn.Module):
+    """Fixed-signature view of the unified model returning a tuple of tensors"""
+
+    def __init__(self, model: nn.Module, output_spec: OutputSpec) -> None:
+        super().__init__()
+        self.model = model
+        self.output_spec = output_spec
+
+    def forward(
+        self, input_ids: torch.Tensor, attention_mask: torch.Tensor
+    ) -> Tuple[torch.Tensor, ...]:
+        outputs = self.model(
+            input_ids=input_ids,
+            attention_mask=attention_mask,
+            output_spec=self.output_spec,
+        )
+        return tuple(outputs.values())
+
+
+def export_model(
+    model: "TextForensicsUnifiedModel",
+    path: Union[str, Path],
+    tasks: Optional[Sequence[str]] = None,
+    tokenizer: Any = None,
+    export_format: str = "torchscript",
+    warmup_buckets: Optional[Sequence[Tuple[int, int]]] = None,
+) -> Path:
+    """
+    Write ``model`` with the selected task heads as a compiled artifact.
+
+    ``torchscript`` traces the model, freezes it and applies inference
+    graph optimizations; ``torch_export`` saves an ``ExportedProgram``. Both
+    keep batch size and sequence length dynamic. The artifact directory also
+    holds the model config, the tokenizer (if given) and the warmup buckets
+    used by ``ExportedModel.load``.
+    """
+    if export_format not in FORMATS:
+        raise ValueError(f"Unknown export format: {export_format}")
+
+    path = Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    # PreTrainedModel.to is wrapped in a decorator mypy cannot see through
+    cast(nn.Module, model).to("cpu").eval()
+    output_spec = OutputSpec(tasks=tasks)
+    wrapper = _ExportWrapper(model, output_spec).eval()
+
+    # Example input with padding so the traced graph keeps the masking path
+    input_ids = torch.randint(1, model.config.vocab_size, (2, 16))
+    attention_mask = torch.ones_like(input_ids)
+    attention_mask[1, 8:] = 0
+    with torch.no_grad():
+        output_names = list(
+            model(input_ids, attention_mask, output_spec=output_spec).keys()
+        )
+
+        if export_format == "torchscript":
+            traced = torch.jit.trace(wrapper, (input_ids, attention_mask), strict=False)
+            frozen = torch.jit.optimize_for_inference(torch.jit.freeze(traced))
+            torch.jit.save(frozen, str(path / FORMATS[export_format]))
+        else:
+            batch = torch.export.Dim("batch", max=4096)
+            seq_len = torch.export.Dim(
+                "seq_len", max=model.config.max_position_embeddings
+            )
+            dims = {0: batch, 1: seq_len}
+            program = torch.export.export(
+                wrapper,
+                (input_ids, attention_mask),
+                dynamic_shapes={"input_ids": dims, "attention_mask": dims},
+            )
+            torch.export.save(program, str(path / FORMATS[export_format]))
+
+    model.config.save_pretrained(path)
+    if tokenizer is not None:
+        tokenizer.save_pretrained(path)
+
+    metadata = {
+        "format": export_format,
+        "output_names": output_names,
+        "tasks": list(output_spec.tasks) if output_spec.tasks is not None else None,
+        "warmup_buckets": [list(b) for b in (warmup_buckets or DEFAULT_WARMUP_BUCKETS)],
+        "torch_version": torch.__version__,
+    }
+    with open(path / EXPORT_FILE, "w") as f:
+        json.dump(metadata, f, indent=2)
+    return path
+
+
+def is_exported(path: Union[str, Path]) -> bool:
+    """Whether ``path`` holds an artifact written by ``export_model``"""
+    return (Path(path) / EXPORT_FILE).exists()
+
+
+class ExportedModel(nn.Module):
+    """
+    Drop-in replacement for the unified model backed by a compiled artifact.
+
+    Returns the same output dictionary as ``TextForensicsUnifiedModel`` for
+    the heads selected at export time, so it can back an
+    ``InferencePipeline``. Runs on CPU.
+    """
+
+    def __init__(
+        self, compiled: Any, output_names: List[str], config: Any = None
+    ) -> None:
+        super().__init__()
+        self.compiled = compiled
+        self.output_names = output_names
+        self.config = config
+        self.cold_start: Dict[str, float] = {}
+
+    @property
+    def exported_tasks(self) -> List[str]:
+        return [
+            name[: -len("_output")]
+            for name in self.output_names
+            if name.endswith("_output")
+        ]
+
+    @classmethod
+    def load(
+        cls,
+        path: Union[str, Path],
+        warmup_buckets: Optional[Sequence[Tuple[int, int]]] = None,
+    ) -> "ExportedModel":
+        """
+        Load an artifact and warm it up on ``(batch, seq_len)`` buckets.
+
+        Buckets default to the ones stored at export time. Load and warmup
+        times are recorded in ``cold_start``.
+        """
+        from ..models.base import TextForensicsConfig
+
+        path = Path(path)
+        start = time.perf_counter()
+        with open(path / EXPORT_FILE) as f:
+            metadata = json.load(f)
+        artifact = str(path / FORMATS[metadata["format"]])
+        if metadata["format"] == "torchscript":
+            compiled = torch.jit.load(artifact, map_location="cpu")
+        else:
+            compiled = torch.export.load(artifact).module()
+        model = cls(
+            compiled,
+            metadata["output_names"],
+            TextForensicsConfig.from_pretrained(path),
+        )
+        model.cold_start["load_s"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        model.warmup(warmup_buckets or metadata["warmup_buckets"])
+        model.cold_start["warmup_s"] = time.perf_counter() - start
+        logger.info(
+            f"Loaded {metadata['format']} artifact in "
+            f"{model.cold_start['load_s']:.2f}s, "
+            f"warmed up in {model.cold_start['warmup_s']:.2f}s"
+        )
+        return model
+
+    def warmup(self, buckets: Sequence[Sequence[int]], repeats: int = 2) -> None:
+        """Run each ``(batch, seq_len)`` shape so first requests skip warmup"""
+        with torch.inference_mode():
+            for batch_size, seq_len in buckets:
+                input_ids = torch.ones((batch_size, seq_len), dtype=torch.long)
+                attention_mask = torch.ones_like(input_ids)
+                for _ in range(repeats):
+                    self.compiled(input_ids, attention_mask)
+
+    def forward(
+        self,
+        input_ids: torch.Tensor,
+        attention_mask: Optional[torch.Tensor] = None,
+        output_spec: Optional[OutputSpec] = None,
+        **kwargs: Any,
+    ) -> Dict[str, torch.Tensor]:
+        if attention_mask is None:
+            attention_mask = torch.ones_like(input_ids)
+        outputs = dict(zip(self.output_names, self.compiled(input_ids, attention_mask)))
+        if output_spec is None:
+            return outputs
+
+        selected: Dict[str, torch.Tensor] = {}
+        if output_spec.style_embeddings:
+            selected["style_embeddings"] = outputs["style_embeddings"]
+        for task in output_spec.tasks if output_spec.tasks is not None else []:
+            key = f"{task}_output"
+            if key not in outputs:
+                raise ValueError(f"Task head not exported: {task}")
+            selected[key] = outputs[key]
+        if output_spec.tasks is None:
+            selected.update({k: v for k, v in outputs.items() if k.endswith("_output")})
+        return selected
+
+    def get_style_embeddings(
+        self, input_ids: torch.Tensor, attention_mask: Optional[torch.Tensor] = None
+    ) -> torch.Tensor:
+        """Extract style embeddings"""
+        return self.forward(input_ids, attention_mask)["style_embeddings"]
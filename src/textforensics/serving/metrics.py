@@ -0,0 +1,280 @@
+"""Opt-in serving metrics with Prometheus text exposition"""
+
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+LATENCY_BUCKETS = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)  # fmt: skip
+SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512)
+RATIO_BUCKETS = (0.0, 0.05, 0.1, 0.2, 0.3, 0.4, 0.5, 0.6, 0.8, 1.0)
+
+Labels = Tuple[Tuple[str, str], ...]
+
+
+def _format_labels(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+    pairs = list(labels) + ([extra] if extra else [])
+    if not pairs:
+        return ""
+    escaped = (
+        k
+        + '="'
+        + v.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+        + '"'
+        for k, v in pairs
+    )
+    return "{" + ",".join(escaped) + "}"
+
+
+def _format_value(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+
+class Counter:
+    """Monotonic counter, one series per label set"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str) -> None:
+        self.name = name
+        self.documentation = documentation
+        self._values: Dict[Labels, float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = dict(self._values)
+        return [
+            f"{self.name}{_format_labels(key)} {_format_value(value)}"
+            for key, value in sorted(values.items())
+        ]
+
+
+class Histogram:
+    """Cumulative-bucket histogram, one series per label set"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, buckets: Sequence[float]) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: per-bucket counts (last one is +Inf), sum, count
+        self._series: Dict[Labels, Tuple[List[int], List[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(sorted(labels.items()))
+        index = next(
+            (i for i, bound in enumerate(self.buckets) if value <= bound),
+            len(self.buckets),
+        )
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = ([0] * (len(self.buckets) + 1), [0.0])
+            series[0][index] += 1
+            series[1][0] += value
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            series = {k: (list(c), s[0]) for k, (c, s) in self._series.items()}
+        lines = []
+        for key, (counts, total) in sorted(series.items()):
+            cumulative = 0
+            bounds = [_format_value(b) for b in self.buckets] + ["+Inf"]
+            for bound, count in zip(bounds, counts):
+                cumulative += count
+                labels = _format_labels(key, ("le", bound))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_format_labels(key)} {_format_value(total)}")
+            lines.append(f"{self.name}_count{_format_labels(key)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Named metrics rendered together in the Prometheus text format"""
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def _get(self, cls: type, name: str, *args: Any) -> Any:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, *args)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric {name} already registered as {metric.kind}")
+            return metric
+
+    def counter(self, name: str, documentation: str) -> Counter:
+        counter: Counter = self._get(Counter, name, documentation)
+        return counter
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        histogram: Histogram = self._get(Histogram, name, documentation, buckets)
+        return histogram
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        lines = []
+        for metric in metrics:
+            lines.append(f"# HELP {metric.name} {metric.documentation}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+class InferenceMetrics:
+    """
+    Request-path measurements of an ``InferencePipeline``.
+
+    The pipeline calls these only when a ``metrics`` object is attached, so
+    an uninstrumented pipeline pays a single ``None`` check per batch.
+    """
+
+    def __init__(self, registry: MetricsRegistry) -> None:
+        self.registry = registry
+        self.tokenize_latency = registry.histogram(
+            "textforensics_tokenize_latency_seconds", "Tokenization time per call"
+        )
+        self.batch_latency = registry.histogram(
+            "textforensics_batch_latency_seconds", "Model time per padded batch"
+        )
+        self.batch_size = registry.histogram(
+            "textforensics_batch_size", "Texts per model batch", SIZE_BUCKETS
+        )
+        self.padding_ratio = registry.histogram(
+            "textforensics_batch_padding_ratio",
+            "Fraction of padding tokens per model batch",
+            RATIO_BUCKETS,
+        )
+        self.texts = registry.counter("textforensics_texts_total", "Texts tokenized")
+        self.tokens = registry.counter(
+            "textforensics_tokens_total", "Non-padding tokens processed"
+        )
+        self.padding_tokens = registry.counter(
+            "textforensics_padding_tokens_total", "Padding tokens processed"
+        )
+
+    def observe_tokenize(self, seconds: float, num_texts: int) -> None:
+        self.tokenize_latency.observe(seconds)
+        self.texts.inc(num_texts)
+
+    def observe_batch(
+        self, seconds: float, batch_size: int, width: int, num_tokens: int
+    ) -> None:
+        padded = batch_size * width
+        self.batch_latency.observe(seconds)
+        self.batch_size.observe(batch_size)
+        self.padding_ratio.observe(1.0 - num_tokens / padded if padded else 0.0)
+        self.tokens.inc(num_tokens)
+        self.padding_tokens.inc(padded - num_tokens)
+
+
+def default_profiled_modules(model: Any) -> List[str]:
+    """Backbone stages, encoder layers, style encoder and every task head"""
+    modules = dict(model.named_modules())
+    names = [
+        "backbone.embeddings",
+        "backbone.encoder",
+        "backbone.pooler",
+        "style_encoder",
+        "window_pooler",
+    ]
+    names += [n for n in modules if n.startswith("backbone.encoder.layer.")]
+    names += [n for n in modules if n.count(".") == 1 and n.startswith("task_heads.")]
+    names += [n for n in modules if n.count(".") == 1 and n.startswith("exit_heads.")]
+    return [n for n in names if n in modules and n.count(".") <= 3]
+
+
+class ModuleProfiler:
+    """
+    Latency histograms for submodules of a model via forward hooks.
+
+    ``enable`` registers a pre- and post-forward hook on the model itself
+    (reported as ``model``) and on each profiled submodule; ``disable``
+    removes them, so a disabled profiler costs nothing. On CUDA the device
+    is synchronized around every timed module, which serializes kernels,
+    so only enable it while investigating.
+    """
+
+    def __init__(
+        self,
+        model: Any,
+        registry: MetricsRegistry,
+        modules: Optional[Sequence[str]] = None,
+    ) -> None:
+        self.model = model
+        self.modules = list(modules) if modules is not None else None
+        self.latency = registry.histogram(
+            "textforensics_module_latency_seconds", "Forward time per model module"
+        )
+        self._handles: List[Any] = []
+        self._local = threading.local()
+
+    @property
+    def enabled(self) -> bool:
+        return bool(self._handles)
+
+    def _sync(self) -> None:
+        if self._cuda:
+            import torch
+
+            torch.cuda.synchronize()
+
+    def _hooks(self, name: str) -> Tuple[Any, Any]:
+        def pre_hook(module: Any, args: Any) -> None:
+            self._sync()
+            starts = self._local.__dict__.setdefault("starts", {})
+            starts.setdefault(name, []).append(time.perf_counter())
+
+        def post_hook(module: Any, args: Any, output: Any) -> None:
+            self._sync()
+            starts = self._local.__dict__.get("starts", {}).get(name)
+            # Empty when an outer pre-hook raised before this module started
+            if starts:
+                self.latency.observe(time.perf_counter() - starts.pop(), module=name)
+
+        return pre_hook, post_hook
+
+    def enable(self) -> None:
+        if self.enabled:
+            return
+        try:
+            device = next(self.model.parameters()).device
+            self._cuda = device.type == "cuda"
+        except (StopIteration, AttributeError):
+            self._cuda = False
+
+        modules = dict(self.model.named_modules())
+        names = self.modules
+        if names is None:
+            names = default_profiled_modules(self.model)
+        targets = [("model", self.model)] + [(n, modules[n]) for n in names]
+        for name, module in targets:
+            pre_hook, post_hook = self._hooks(name)
+            self._handles.append(module.register_forward_pre_hook(pre_hook))
+            # always_call pops the start even when forward raises, so a failed
+            # request does not leave a stale entry on the stack
+            self._handles.append(
+                module.register_forward_hook(post_hook, always_call=True)
+            )
+
+    def disable(self) -> None:
+        for handle in self._handles:
+            handle.remove()
+        self._handles = []
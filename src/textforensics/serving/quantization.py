@@ -0,0 +1,29 @@
+"""Dynamic int8 quantization for CPU inference"""
+
+import io
+
+import torch
+import torch.nn as nn
+
+
+def quantize_dynamic_int8(model: nn.Module) -> nn.Module:
+    """
+    Return a copy of ``model`` with every ``nn.Linear`` dynamically quantized.
+
+    Weights of the backbone, style encoder and task heads are stored as int8
+    and activations are quantized on the fly per batch, so no calibration
+    data is needed. Embeddings and LayerNorms stay in fp32. Quantized
+    modules only run on CPU.
+    """
+    from torch.ao.quantization import quantize_dynamic
+
+    model = model.to("cpu").eval()
+    quantized: nn.Module = quantize_dynamic(model, {nn.Linear}, dtype=torch.qint8)
+    return quantized
+
+
+def serialized_size_mb(model: nn.Module) -> float:
+    """Size of the model's ``state_dict`` as written by ``torch.save``"""
+    buffer = io.BytesIO()
+    torch.save(model.state_dict(), buffer)
+    return buffer.getbuffer().nbytes / 1024**2
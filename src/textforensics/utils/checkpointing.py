@@ -0,0 +1,276 @@
+"""Checkpoint management with safetensors weights and background writes"""
+
+import json
+import logging
+import os
+import shutil
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+import torch
+import torch.nn as nn
+
+logger = logging.getLogger("textforensics")
+
+WEIGHTS_FILE = "model.safetensors"
+TRAINING_STATE_FILE = "training_state.pt"
+META_FILE = "meta.json"
+INDEX_FILE = "checkpoints.json"
+
+
+def _cpu_copy(value: Any) -> Any:
+    """Detached CPU copy of every tensor in a (nested) state dict"""
+    if isinstance(value, torch.Tensor):
+        return value.detach().to("cpu", copy=True)
+    if isinstance(value, dict):
+        return {k: _cpu_copy(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return type(value)(_cpu_copy(v) for v in value)
+    return value
+
+
+def load_weights(
+    path: Union[str, Path], model: Optional[nn.Module] = None
+) -> Dict[str, torch.Tensor]:
+    """
+    Load safetensors weights memory-mapped.
+
+    ``path`` is a checkpoint directory or a ``.safetensors`` file. Tensors
+    are backed by the mapped file, so loading costs no copy and replicas on
+    one host share the page cache. With ``model``, the tensors are assigned
+    to its parameters directly instead of being copied into them.
+    """
+    from safetensors.torch import load_file
+
+    path = Path(path)
+    if path.is_dir():
+        path = path / WEIGHTS_FILE
+    state_dict = load_file(str(path), device="cpu")
+    if model is not None:
+        model.load_state_dict(state_dict, assign=True)
+    return state_dict
+
+
+class CheckpointManager:
+    """
+    Keep the best ``save_top_k`` checkpoints by a monitored metric.
+
+    Each checkpoint is a directory holding ``model.safetensors``, the
+    optimizer/scheduler state and a ``meta.json`` with epoch and metrics.
+    ``save`` snapshots the state to CPU and returns; the files are written by
+    a background thread into a temporary directory that is atomically
+    renamed into place. Only then does the checkpoint join the ranking, and
+    checkpoints that fell out of the top-k are deleted; a failed write is
+    re-raised by the next ``save`` (or ``wait``/``close``) and leaves the
+    kept checkpoints untouched. ``checkpoints.json`` lists the kept
+    checkpoints, best first.
+
+    ``save_top_k=-1`` keeps every checkpoint and ``0`` disables saving.
+    Checkpoints are only considered every ``save_every_n_epochs`` epochs.
+    """
+
+    def __init__(
+        self,
+        directory: Union[str, Path],
+        monitor: str = "val_loss",
+        mode: str = "min",
+        save_top_k: int = 1,
+        save_every_n_epochs: int = 1,
+        async_save: bool = True,
+    ) -> None:
+        if mode not in ("min", "max"):
+            raise ValueError(f"mode must be 'min' or 'max', got {mode!r}")
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.monitor = monitor
+        self.mode = mode
+        self.save_top_k = save_top_k
+        self.save_every_n_epochs = max(1, save_every_n_epochs)
+
+        self._executor = ThreadPoolExecutor(max_workers=1) if async_save else None
+        self._pending: List[Future] = []
+        # Checkpoints currently kept, best first
+        self._kept: List[Dict[str, Any]] = self._read_index()
+
+    def _read_index(self) -> List[Dict[str, Any]]:
+        index_path = self.directory / INDEX_FILE
+        if not index_path.exists():
+            return []
+        with open(index_path) as f:
+            entries: List[Dict[str, Any]] = json.load(f)["checkpoints"]
+        return [e for e in entries if (self.directory / e["name"]).exists()]
+
+    def _is_better(self, score: float, other: float) -> bool:
+        return score < other if self.mode == "min" else score > other
+
+    def _should_keep(self, score: float) -> bool:
+        if self.save_top_k < 0 or len(self._kept) < self.save_top_k:
+            return True
+        return self._is_better(score, self._kept[-1]["score"])
+
+    @property
+    def best_checkpoint(self) -> Optional[Path]:
+        """Directory of the best checkpoint saved so far"""
+        return self.directory / self._kept[0]["name"] if self._kept else None
+
+    def save(
+        self,
+        model: nn.Module,
+        epoch: int,
+        metrics: Dict[str, float],
+        optimizer: Optional[torch.optim.Optimizer] = None,
+        scheduler: Optional[Any] = None,
+    ) -> Optional[Path]:
+        """
+        Save a checkpoint if this epoch is due and it ranks in the top-k.
+
+        Returns the checkpoint directory, which exists once the background
+        write finishes, or ``None`` if nothing is saved.
+        """
+        if self.save_top_k == 0 or (epoch + 1) % self.save_every_n_epochs:
+            return None
+        # Rank against finished writes only, and surface a failed one here
+        self.wait()
+        score = float(metrics[self.monitor])
+        if not self._should_keep(score):
+            return None
+
+        name = f"epoch={epoch:04d}-{self.monitor}={score:.4f}"
+        # Snapshot now so training can keep updating the live tensors
+        weights = {k: v.contiguous() for k, v in _cpu_copy(model.state_dict()).items()}
+        training_state = {
+            "optimizer_state_dict": (
+                _cpu_copy(optimizer.state_dict()) if optimizer else None
+            ),
+            "scheduler_state_dict": scheduler.state_dict() if scheduler else None,
+        }
+        meta = {"epoch": epoch, "metrics": dict(metrics), "monitor": self.monitor}
+
+        entry = {"name": name, "score": score, "epoch": epoch}
+        args = (entry, weights, training_state, meta)
+        if self._executor is None:
+            self._write(*args)
+        else:
+            self._pending.append(self._executor.submit(self._write, *args))
+        return self.directory / name
+
+    def _write(
+        self,
+        entry: Dict[str, Any],
+        weights: Dict[str, torch.Tensor],
+        training_state: Dict[str, Any],
+        meta: Dict[str, Any],
+    ) -> None:
+        from safetensors.torch import save_file
+
+        final_dir = self.directory / entry["name"]
+        tmp_dir = self.directory / f".{entry['name']}.tmp"
+        if tmp_dir.exists():
+            shutil.rmtree(tmp_dir)
+        tmp_dir.mkdir()
+
+        try:
+            save_file(
+                weights,
+                str(tmp_dir / WEIGHTS_FILE),
+                metadata={"epoch": str(meta["epoch"])},
+            )
+            torch.save(training_state, tmp_dir / TRAINING_STATE_FILE)
+            with open(tmp_dir / META_FILE, "w") as f:
+                json.dump(meta, f, indent=2)
+        except BaseException:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+        if final_dir.exists():
+            shutil.rmtree(final_dir)
+        os.replace(tmp_dir, final_dir)
+
+        # Only a checkpoint that is on disk enters the ranking and evicts others
+        kept = sorted(
+            [*self._kept, entry],
+            key=lambda e: e["score"],
+            reverse=self.mode == "max",
+        )
+        removed = kept[self.save_top_k :] if self.save_top_k > 0 else []
+        kept = kept[: len(kept) - len(removed)]
+        self._write_index(kept)
+        self._kept = kept
+        for old in removed:
+            shutil.rmtree(self.directory / old["name"], ignore_errors=True)
+        logger.info(f"Saved checkpoint: {final_dir}")
+
+    def _write_index(self, index: List[Dict[str, Any]]) -> None:
+        tmp_path = self.directory / f".{INDEX_FILE}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(
+                {"monitor": self.monitor, "mode": self.mode, "checkpoints": index},
+                f,
+                indent=2,
+            )
+        os.replace(tmp_path, self.directory / INDEX_FILE)
+
+    def wait(self) -> None:
+        """Block until all background writes have finished, re-raising errors"""
+        pending, self._pending = self._pending, []
+        for future in pending:
+            future.result()
+
+    def close(self) -> None:
+        self.wait()
+        if self._executor is not None:
+            self._executor.shutdown()
+
+
+def save_checkpoint(
+    model: torch.nn.Module,
+    optimizer: torch.optim.Optimizer,
+    scheduler: Optional[torch.optim.lr_scheduler._LRScheduler],
+    epoch: int,
+    loss: float,
+    path: Path,
+) -> None:
+    """Save model checkpoint with full training state"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    checkpoint = {
+        "epoch": epoch,
+        "model_state_dict": model.state_dict(),
+        "optimizer_state_dict": optimizer.state_dict(),
+        "scheduler_state_dict": scheduler.state_dict() if scheduler else None,
+        "loss": loss,
+    }
+
+    torch.save(checkpoint, path)
+
+
+def load_checkpoint(
+    path: Path, model: Optional[torch.nn.Module] = None
+) -> Dict[str, Any]:
+    """
+    Load model checkpoint.
+
+    ``path`` is either a ``torch.save`` file or a checkpoint directory
+    written by ``CheckpointManager``, whose weights are memory-mapped.
+    """
+    path = Path(path)
+    if path.is_dir():
+        checkpoint: Dict[str, Any] = torch.load(
+            path / TRAINING_STATE_FILE, map_location="cpu"
+        )
+        with open(path / META_FILE) as f:
+            meta = json.load(f)
+        checkpoint.update(
+            epoch=meta["epoch"],
+            metrics=meta["metrics"],
+            model_state_dict=load_weights(path, model),
+        )
+        return checkpoint
+
+    checkpoint = torch.load(path, map_location="cpu")
+
+    if model is not None:
+        model.load_state_dict(checkpoint["model_state_dict"])
+
+    return checkpoint
@@ -0,0 +1,99 @@
+"""Append-only JSONL telemetry stream for training runs"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Any, List, Optional, Union
+
+import psutil
+
+
+class TelemetryWriter:
+    """
+    Buffered, append-only JSON-lines writer.
+
+    ``write`` only serializes the record and appends it to an in-memory
+    buffer; the buffer goes to disk in one ``write`` call every
+    ``flush_interval`` seconds (or ``max_buffered`` records), so the training
+    loop never blocks on the file. Records are one JSON object per line with
+    a ``type`` and a wall-clock ``time`` field, which lets readers such as
+    ``scripts/monitoring/monitor_gpu.py`` tail the file while it grows.
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        flush_interval: float = 2.0,
+        max_buffered: int = 1000,
+    ) -> None:
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.flush_interval = flush_interval
+        self.max_buffered = max_buffered
+        self._file = open(self.path, "a", encoding="utf-8")
+        self._buffer: List[str] = []
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+        self._process = psutil.Process(os.getpid())
+
+    def rss_mb(self) -> float:
+        """Resident set size of the writing process in MiB"""
+        return float(self._process.memory_info().rss / 2**20)
+
+    def write(self, record_type: str, **fields: Any) -> None:
+        line = json.dumps(
+            {"type": record_type, "time": time.time(), **fields},
+            separators=(",", ":"),
+        )
+        with self._lock:
+            self._buffer.append(line)
+            due = time.monotonic() - self._last_flush >= self.flush_interval
+            if due or len(self._buffer) >= self.max_buffered:
+                self._flush_locked()
+
+    def _flush_locked(self) -> None:
+        if self._buffer and not self._file.closed:
+            self._file.write("\n".join(self._buffer) + "\n")
+            self._file.flush()
+        self._buffer = []
+        self._last_flush = time.monotonic()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush_locked()
+            self._file.close()
+
+    def __enter__(self) -> "TelemetryWriter":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def telemetry_path(
+    directory: Union[str, Path], rank: int = 0, world_size: int = 1
+) -> Path:
+    """``telemetry.jsonl`` in ``directory``, one file per rank when distributed"""
+    name = "telemetry.jsonl" if world_size == 1 else f"telemetry.rank{rank}.jsonl"
+    return Path(directory) / name
+
+
+def build_telemetry_writer(
+    config: Any, rank: int = 0, world_size: int = 1
+) -> Optional[TelemetryWriter]:
+    """Writer for ``pipeline.logging.telemetry``, or ``None`` when disabled"""
+    pipeline = config.get("pipeline", {}) or {}
+    settings = (pipeline.get("logging", {}) or {}).get("telemetry", {}) or {}
+    if not settings.get("enabled", False):
+        return None
+    directory = settings.get("dir") or config.get("log_dir", "logs")
+    return TelemetryWriter(
+        telemetry_path(directory, rank, world_size),
+        flush_interval=settings.get("flush_interval_s", 2.0),
+    )
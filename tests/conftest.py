@@ -28,3 +28,44 @@ def sample_config():
 def device():
     """Device for testing"""
     return torch.device("cuda" if torch.cuda.is_available() else "cpu")
+
+
+WORDS = ["the", "night", "was", "dark", "old", "house", "river", "silent"]
+
+
+@pytest.fixture(scope="session")
+def tiny_model_path(tmp_path_factory):
+    """A tiny saved model with scoring heads and a word-level tokenizer"""
+    from transformers import BertTokenizerFast
+
+    from textforensics.models import TextForensicsConfig, TextForensicsUnifiedModel
+
+    path = tmp_path_factory.mktemp("model")
+    vocab = ["[PAD]", "[UNK]", "[CLS]", "[SEP]", "[MASK]", *WORDS]
+    tokenizer = BertTokenizerFast(vocab={token: i for i, token in enumerate(vocab)})
+
+    torch.manual_seed(0)
+    config = TextForensicsConfig(
+        vocab_size=len(tokenizer),
+        hidden_size=32,
+        num_hidden_layers=1,
+        num_attention_heads=2,
+        intermediate_size=64,
+        task_heads={
+            "style_classification": {"num_classes": 3, "hidden_dims": [16]},
+            "anomaly_detection": {"hidden_dims": [16]},
+            "similarity_scoring": {},
+        },
+    )
+    TextForensicsUnifiedModel(config).eval().save_pretrained(path)
+    tokenizer.save_pretrained(path)
+    return str(path)
+
+
+@pytest.fixture
+def texts():
+    """Texts of varied length over the tiny model's vocabulary"""
+    return [
+        " ".join(WORDS[(i + j) % len(WORDS)] for j in range(2 + (i * 3) % 7))
+        for i in range(12)
+    ]
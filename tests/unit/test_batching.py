@@ -0,0 +1,106 @@
+"""Request micro-batching"""
+
+import asyncio
+import threading
+
+import pytest
+
+from textforensics.serving.batching import MicroBatcher
+
+
+async def _submit_all(batcher: MicroBatcher, items) -> list:
+    await batcher.start()
+    try:
+        return await asyncio.gather(
+            *(batcher.submit(item) for item in items), return_exceptions=True
+        )
+    finally:
+        await batcher.stop()
+
+
+def test_concurrent_requests_share_batches():
+    calls = []
+
+    def process(items):
+        calls.append(list(items))
+        return [item * 2 for item in items]
+
+    batcher = MicroBatcher(process, max_batch_size=4, max_wait_ms=50)
+    results = asyncio.run(_submit_all(batcher, range(10)))
+
+    assert results == [item * 2 for item in range(10)]
+    assert [len(call) for call in calls] == [4, 4, 2]
+    assert sorted(i for call in calls for i in call) == list(range(10))
+
+
+def test_lone_request_is_flushed_after_max_wait():
+    batcher = MicroBatcher(lambda items: items, max_batch_size=32, max_wait_ms=1)
+
+    async def run():
+        await batcher.start()
+        try:
+            return await asyncio.wait_for(batcher.submit("x"), timeout=1.0)
+        finally:
+            await batcher.stop()
+
+    assert asyncio.run(run()) == "x"
+
+
+def test_failed_batch_fails_its_requests_only():
+    def process(items):
+        if "bad" in items:
+            raise ValueError("bad input")
+        return items
+
+    async def run():
+        batcher = MicroBatcher(process, max_batch_size=2, max_wait_ms=50)
+        await batcher.start()
+        try:
+            failed = await asyncio.gather(
+                batcher.submit("ok"), batcher.submit("bad"), return_exceptions=True
+            )
+            return failed, await batcher.submit("later")
+        finally:
+            await batcher.stop()
+
+    failed, later = asyncio.run(run())
+    assert all(isinstance(result, ValueError) for result in failed)
+    assert later == "later"
+
+
+def test_wrong_result_count_is_an_error():
+    batcher = MicroBatcher(lambda items: items[:1], max_batch_size=2, max_wait_ms=50)
+    results = asyncio.run(_submit_all(batcher, ["a", "b"]))
+
+    assert all(isinstance(result, RuntimeError) for result in results)
+
+
+def test_submit_requires_running_batcher():
+    batcher = MicroBatcher(lambda items: items)
+
+    with pytest.raises(RuntimeError, match="not running"):
+        asyncio.run(batcher.submit("x"))
+
+
+def test_stop_fails_requests_of_the_batch_in_progress():
+    started, release = threading.Event(), threading.Event()
+
+    def process(items):
+        started.set()
+        release.wait(timeout=5)
+        return items
+
+    async def run():
+        batcher = MicroBatcher(process, max_batch_size=2, max_wait_ms=1)
+        await batcher.start()
+        requests = [asyncio.ensure_future(batcher.submit(i)) for i in range(3)]
+        # Stop while the first batch is blocked inside process_fn
+        await asyncio.to_thread(started.wait, 5)
+        await batcher.stop()
+        release.set()
+        return await asyncio.wait_for(
+            asyncio.gather(*requests, return_exceptions=True), timeout=1.0
+        )
+
+    results = asyncio.run(run())
+    assert all(isinstance(result, RuntimeError) for result in results)
@@ -0,0 +1,66 @@
+"""Resumable bulk analysis"""
+
+import json
+
+import pytest
+
+from textforensics.pipelines.analysis import BulkAnalyzer
+
+WORDS = ["the", "night", "was", "dark", "old", "house", "river", "silent"]
+
+
+@pytest.fixture
+def documents(tmp_path):
+    path = tmp_path / "docs.jsonl"
+    with open(path, "w") as f:
+        for i in range(22):
+            text = " ".join(WORDS[(i + j) % len(WORDS)] for j in range(3 + i % 5))
+            f.write(json.dumps({"id": f"doc{i}", "text": text}) + "\n")
+    return path
+
+
+def _analyzer(model_path, **kwargs) -> BulkAnalyzer:
+    return BulkAnalyzer(model_path, chunk_size=4, id_field="id", **kwargs)
+
+
+def test_run_resumes_after_last_recorded_chunk(tiny_model_path, documents, tmp_path):
+    output = tmp_path / "out.jsonl"
+    stats = _analyzer(tiny_model_path).run([documents], output)
+    expected = output.read_bytes()
+    lines = expected.decode().splitlines()
+    assert stats["documents"] == stats["processed"] == 22
+    assert [json.loads(line)["id"] for line in lines] == [f"doc{i}" for i in range(22)]
+
+    # Crash after two chunks, with part of the third already written
+    progress_path = tmp_path / "out.jsonl.progress.json"
+    progress = json.loads(progress_path.read_text())
+    offset = len("".join(line + "\n" for line in lines[:8]).encode())
+    progress.update(documents=8, bytes=offset)
+    progress_path.write_text(json.dumps(progress))
+    with open(output, "r+b") as f:
+        f.truncate(offset)
+        f.seek(offset)
+        f.write(b'{"id": "doc8", "lab')
+
+    stats = _analyzer(tiny_model_path).run([documents], output)
+    assert stats["documents"] == 22
+    assert stats["processed"] == 14
+    assert output.read_bytes() == expected
+    assert json.loads(progress_path.read_text())["bytes"] == len(expected)
+
+
+def test_resume_rejects_changed_settings(tiny_model_path, documents, tmp_path):
+    output = tmp_path / "out.jsonl"
+    output.write_text("")
+    (tmp_path / "out.jsonl.progress.json").write_text(
+        json.dumps(
+            {
+                "settings": _analyzer(tiny_model_path)._settings([documents]),
+                "documents": 0,
+                "bytes": 0,
+            }
+        )
+    )
+
+    with pytest.raises(ValueError, match="different settings"):
+        _analyzer(tiny_model_path, include_embeddings=True).run([documents], output)
@@ -0,0 +1,109 @@
+"""Top-k checkpoint retention"""
+
+import json
+
+import pytest
+import torch
+import torch.nn as nn
+
+from textforensics.utils import CheckpointManager, load_checkpoint
+
+
+def _checkpoint_dirs(directory) -> list:
+    return sorted(p.name for p in directory.iterdir() if p.is_dir())
+
+
+def _save_all(manager: CheckpointManager, model: nn.Module, scores) -> None:
+    for epoch, score in enumerate(scores):
+        manager.save(model, epoch, {"val_loss": score, "val_accuracy": -score})
+    manager.wait()
+
+
+def test_keeps_best_k_by_monitored_metric(tmp_path):
+    manager = CheckpointManager(tmp_path, save_top_k=2)
+    _save_all(manager, nn.Linear(4, 2), [0.5, 0.3, 0.4, 0.6, 0.2])
+    manager.close()
+
+    assert _checkpoint_dirs(tmp_path) == [
+        "epoch=0001-val_loss=0.3000",
+        "epoch=0004-val_loss=0.2000",
+    ]
+    with open(tmp_path / "checkpoints.json") as f:
+        index = json.load(f)
+    assert [entry["epoch"] for entry in index["checkpoints"]] == [4, 1]
+    assert manager.best_checkpoint == tmp_path / "epoch=0004-val_loss=0.2000"
+
+
+def test_max_mode_and_save_interval(tmp_path):
+    manager = CheckpointManager(
+        tmp_path,
+        monitor="val_accuracy",
+        mode="max",
+        save_top_k=1,
+        save_every_n_epochs=2,
+        async_save=False,
+    )
+    # Only epochs 1 and 3 are due; epoch 2 has the best score but is skipped
+    _save_all(manager, nn.Linear(4, 2), [0.5, 0.4, 0.1, 0.3])
+
+    assert _checkpoint_dirs(tmp_path) == ["epoch=0003-val_accuracy=-0.3000"]
+
+
+def test_reopened_manager_continues_ranking(tmp_path):
+    model = nn.Linear(4, 2)
+    _save_all(CheckpointManager(tmp_path, save_top_k=2), model, [0.5, 0.3])
+
+    manager = CheckpointManager(tmp_path, save_top_k=2)
+    assert manager.save(model, 2, {"val_loss": 0.9}) is None
+    manager.save(model, 3, {"val_loss": 0.4})
+    manager.close()
+
+    assert _checkpoint_dirs(tmp_path) == [
+        "epoch=0001-val_loss=0.3000",
+        "epoch=0003-val_loss=0.4000",
+    ]
+
+
+class _BrokenScheduler:
+    class _State:
+        def __reduce__(self):
+            raise RuntimeError("disk full")
+
+    def state_dict(self) -> dict:
+        return {"state": self._State()}
+
+
+def test_failed_write_keeps_ranking_and_raises_on_next_save(tmp_path):
+    model = nn.Linear(4, 2)
+    manager = CheckpointManager(tmp_path, save_top_k=1)
+    manager.save(model, 0, {"val_loss": 0.5})
+    manager.save(model, 1, {"val_loss": 0.1}, scheduler=_BrokenScheduler())
+
+    with pytest.raises(RuntimeError, match="disk full"):
+        manager.save(model, 2, {"val_loss": 0.3})
+    manager.close()
+
+    # The better but unwritten epoch 1 neither became best nor evicted epoch 0
+    assert _checkpoint_dirs(tmp_path) == ["epoch=0000-val_loss=0.5000"]
+    assert manager.best_checkpoint == tmp_path / "epoch=0000-val_loss=0.5000"
+    with open(tmp_path / "checkpoints.json") as f:
+        assert [entry["epoch"] for entry in json.load(f)["checkpoints"]] == [0]
+
+
+def test_load_checkpoint_directory(tmp_path):
+    model = nn.Linear(4, 2)
+    optimizer = torch.optim.SGD(model.parameters(), lr=0.1, momentum=0.9)
+    model(torch.randn(3, 4)).sum().backward()
+    optimizer.step()
+
+    manager = CheckpointManager(tmp_path)
+    path = manager.save(model, 0, {"val_loss": 1.0}, optimizer=optimizer)
+    manager.close()
+
+    restored = nn.Linear(4, 2)
+    checkpoint = load_checkpoint(path, restored)
+    assert checkpoint["epoch"] == 0
+    assert checkpoint["metrics"] == {"val_loss": 1.0}
+    for name, value in model.state_dict().items():
+        torch.testing.assert_close(restored.state_dict()[name], value)
+    assert checkpoint["optimizer_state_dict"]["state"]
@@ -0,0 +1,67 @@
+"""Early-exit style classification"""
+
+import pytest
+import torch
+
+from textforensics.models import (
+    OutputSpec,
+    TextForensicsConfig,
+    TextForensicsUnifiedModel,
+)
+
+
+def _model(**kwargs) -> TextForensicsUnifiedModel:
+    torch.manual_seed(0)
+    config = TextForensicsConfig(
+        vocab_size=50,
+        hidden_size=32,
+        num_hidden_layers=3,
+        num_attention_heads=2,
+        intermediate_size=64,
+        task_heads={"style_classification": {"num_classes": 3, "hidden_dims": [16]}},
+        **kwargs,
+    )
+    return TextForensicsUnifiedModel(config).eval()
+
+
+def _inputs():
+    input_ids = torch.randint(5, 50, (4, 9))
+    attention_mask = torch.ones_like(input_ids)
+    attention_mask[2:, 5:] = 0
+    return input_ids, attention_mask
+
+
+def test_exit_logits_need_exit_layers():
+    with pytest.raises(ValueError, match="early_exit_layers"):
+        _model()(*_inputs(), output_spec=OutputSpec(early_exit_logits=True))
+
+
+def test_exit_logits_are_stacked_per_layer():
+    outputs = _model(early_exit_layers=[1, 2])(
+        *_inputs(), output_spec=OutputSpec(early_exit_logits=True)
+    )
+    assert outputs["early_exit_logits"].shape == (2, 4, 3)
+
+
+def test_unreachable_threshold_matches_full_model():
+    model = _model(early_exit_layers=[1, 2])
+    input_ids, attention_mask = _inputs()
+
+    outputs = model.classify_early_exit(input_ids, attention_mask, threshold=1.1)
+    with torch.no_grad():
+        full = model(input_ids, attention_mask, task="style_classification")
+
+    assert (outputs["exit_layers"] == 3).all()
+    torch.testing.assert_close(
+        outputs["style_classification_output"],
+        full["style_classification_output"],
+        rtol=1e-4,
+        atol=1e-5,
+    )
+
+
+def test_zero_threshold_exits_at_first_layer():
+    outputs = _model(early_exit_layers=[1, 2]).classify_early_exit(
+        *_inputs(), threshold=0.0
+    )
+    assert (outputs["exit_layers"] == 1).all()
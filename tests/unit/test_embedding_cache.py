@@ -0,0 +1,120 @@
+"""Two-tier embedding cache and cached inference"""
+
+import numpy as np
+import pytest
+import torch
+
+from textforensics.index import EmbeddingCache, model_fingerprint
+
+
+def _vectors(n: int, dim: int = 8, seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).standard_normal((n, dim)).astype(np.float32)
+
+
+def test_memory_tier_counts_hits_and_evicts_lru():
+    cache = EmbeddingCache(dim=8, capacity=2)
+    vectors = _vectors(3)
+    cache.put_many(["a", "b"], vectors[:2])
+
+    got = cache.get_many(["a", "missing"])
+    np.testing.assert_array_equal(got[0], vectors[0])
+    assert got[1] is None
+
+    # "b" is now least recently used and makes room for "c"
+    cache.put_many(["c"], vectors[2:])
+    assert "a" in cache and "c" in cache and "b" not in cache
+    stats = cache.stats()
+    assert (stats["memory_hits"], stats["misses"]) == (1, 1)
+    assert stats["hit_rate"] == 0.5
+
+
+def test_disk_tier_survives_reopen(tmp_path):
+    vectors = _vectors(4)
+    EmbeddingCache(dim=8, fingerprint="m", capacity=1, path=tmp_path).put_many(
+        ["a", "b", "c", "a"], np.concatenate([vectors[:3], vectors[:1]])
+    )
+
+    cache = EmbeddingCache(dim=8, fingerprint="m", path=tmp_path)
+    got = cache.get_many(["a", "b", "c", "a"])
+    for embedding, expected in zip(got, [*vectors[:3], vectors[0]]):
+        np.testing.assert_array_equal(embedding, expected)
+    stats = cache.stats()
+    assert (stats["disk_hits"], stats["memory_hits"]) == (3, 1)
+    assert stats["disk_entries"] == 3
+
+
+def test_partial_disk_write_is_dropped(tmp_path):
+    cache = EmbeddingCache(dim=8, fingerprint="m", path=tmp_path)
+    cache.put_many(["a", "b"], _vectors(2))
+    # A vector appended without its key, as after a crash mid-write
+    cache._vectors.append(_vectors(1, seed=1))
+
+    reopened = EmbeddingCache(dim=8, fingerprint="m", path=tmp_path)
+    assert reopened.stats()["disk_entries"] == 2
+    reopened.put_many(["c"], _vectors(1, seed=2))
+    np.testing.assert_array_equal(
+        EmbeddingCache(dim=8, fingerprint="m", path=tmp_path).get_many(["c"])[0],
+        _vectors(1, seed=2)[0],
+    )
+
+
+def test_other_fingerprint_misses(tmp_path):
+    EmbeddingCache(dim=8, fingerprint="old", path=tmp_path).put_many(["a"], _vectors(1))
+
+    cache = EmbeddingCache(dim=8, fingerprint="new", path=tmp_path)
+    assert cache.get_many(["a"]) == [None]
+    assert "a" not in cache
+
+
+@pytest.fixture
+def model(tiny_model_path):
+    from textforensics.models import TextForensicsUnifiedModel
+
+    return TextForensicsUnifiedModel.from_pretrained(tiny_model_path).eval()
+
+
+def test_fingerprint_tracks_weights_and_settings(model):
+    fingerprint = model_fingerprint(model, max_length=128)
+
+    assert model_fingerprint(model, max_length=128) == fingerprint
+    assert model_fingerprint(model, max_length=64) != fingerprint
+    with torch.no_grad():
+        next(model.parameters())[0, 0] += 1.0
+    assert model_fingerprint(model, max_length=128) != fingerprint
+
+
+def test_fingerprint_of_quantized_model(model):
+    from textforensics.serving.quantization import quantize_dynamic_int8
+
+    fingerprint = model_fingerprint(model)
+    quantized = quantize_dynamic_int8(model)
+
+    assert model_fingerprint(quantized) == model_fingerprint(quantized)
+    assert model_fingerprint(quantized) != fingerprint
+
+
+@pytest.fixture
+def pipeline(tiny_model_path):
+    from textforensics.pipelines import InferencePipeline
+
+    return InferencePipeline.from_pretrained(tiny_model_path, batch_size=4)
+
+
+def test_cached_predict_matches_uncached(pipeline, texts):
+    expected = pipeline.predict(texts)
+
+    cache = EmbeddingCache(
+        dim=pipeline.model.config.style_encoder_dim,
+        fingerprint=model_fingerprint(pipeline.model),
+    )
+    pipeline.embedding_cache = cache
+    # Repeated texts are encoded once
+    first = pipeline.predict(texts[:5] + texts[:2])
+    assert cache.stats()["misses"] == 7 and len(cache) == 5
+
+    second = pipeline.predict(texts)
+    assert cache.stats()["memory_hits"] == 5
+    assert first.keys() == second.keys() == expected.keys()
+    for name, value in expected.items():
+        torch.testing.assert_close(second[name], value, rtol=1e-4, atol=1e-5)
+        torch.testing.assert_close(first[name][5:], value[:2], rtol=1e-4, atol=1e-5)
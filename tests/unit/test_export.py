@@ -0,0 +1,72 @@
+"""Compiled inference artifacts"""
+
+import pytest
+import torch
+
+from textforensics.models import TextForensicsUnifiedModel
+from textforensics.pipelines import InferencePipeline
+from textforensics.serving.export import ExportedModel, export_model, is_exported
+
+TASKS = ["style_classification", "anomaly_detection"]
+
+
+@pytest.fixture
+def model(tiny_model_path):
+    return TextForensicsUnifiedModel.from_pretrained(tiny_model_path).eval()
+
+
+@pytest.mark.parametrize("export_format", ["torchscript", "torch_export"])
+def test_reloaded_artifact_matches_eager_model(model, tmp_path, export_format):
+    export_model(
+        model,
+        tmp_path,
+        tasks=TASKS,
+        export_format=export_format,
+        warmup_buckets=[(1, 8), (2, 16)],
+    )
+    assert is_exported(tmp_path)
+
+    exported = ExportedModel.load(tmp_path)
+    assert exported.exported_tasks == TASKS
+    assert set(exported.cold_start) == {"load_s", "warmup_s"}
+
+    # A shape other than the traced (2, 16) example, with padding
+    input_ids = torch.randint(5, model.config.vocab_size, (3, 11))
+    attention_mask = torch.ones_like(input_ids)
+    attention_mask[1:, 6:] = 0
+    with torch.no_grad():
+        expected = model(input_ids, attention_mask)
+    outputs = exported(input_ids, attention_mask)
+    for name, value in outputs.items():
+        torch.testing.assert_close(value, expected[name], rtol=1e-4, atol=1e-5)
+
+
+def test_load_warms_up_stored_or_given_buckets(model, tmp_path, monkeypatch):
+    export_model(model, tmp_path, tasks=TASKS, warmup_buckets=[(1, 8), (2, 16)])
+    buckets = []
+    monkeypatch.setattr(
+        ExportedModel, "warmup", lambda self, b, repeats=2: buckets.append(list(b))
+    )
+
+    ExportedModel.load(tmp_path)
+    ExportedModel.load(tmp_path, warmup_buckets=[(4, 32)])
+    assert buckets == [[[1, 8], [2, 16]], [(4, 32)]]
+
+
+def test_exported_pipeline_matches_eager_pipeline(
+    model, tiny_model_path, tmp_path, texts
+):
+    from transformers import AutoTokenizer
+
+    tokenizer = AutoTokenizer.from_pretrained(tiny_model_path)
+    export_model(model, tmp_path, tasks=TASKS, tokenizer=tokenizer)
+
+    exported = InferencePipeline.from_exported(str(tmp_path), warmup_buckets=[(1, 8)])
+    eager = InferencePipeline(model, tokenizer, tasks=TASKS)
+    assert exported.tasks == TASKS
+
+    expected = eager.predict(texts)
+    outputs = exported.predict(texts)
+    assert outputs.keys() == expected.keys()
+    for name, value in expected.items():
+        torch.testing.assert_close(outputs[name], value, rtol=1e-4, atol=1e-5)
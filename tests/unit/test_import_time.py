@@ -0,0 +1,58 @@
+"""Import-time budget for the lightweight entry points"""
+
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+# Generous enough for slow CI machines, far below the cost of importing torch
+IMPORT_BUDGET_S = 1.0
+HEAVY_MODULES = ["torch", "transformers", "omegaconf", "numpy"]
+
+
+def _measure(statement: str) -> dict:
+    """Run ``statement`` in a fresh interpreter and report time and modules"""
+    script = (
+        "import json, sys, time\n"
+        "start = time.perf_counter()\n"
+        f"{statement}\n"
+        "elapsed = time.perf_counter() - start\n"
+        f"heavy = [m for m in {HEAVY_MODULES!r} if m in sys.modules]\n"
+        "print(json.dumps({'elapsed': elapsed, 'heavy': heavy}))\n"
+    )
+    env = {**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)}
+    result = subprocess.run(
+        [sys.executable, "-c", script],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+@pytest.mark.parametrize(
+    "statement",
+    [
+        "import textforensics",
+        "import textforensics.cli",
+        "import textforensics.models, textforensics.pipelines, textforensics.serving",
+        "import textforensics.utils",
+    ],
+)
+def test_import_is_lazy_and_within_budget(statement):
+    report = _measure(statement)
+    assert report["heavy"] == [], f"{statement!r} imported {report['heavy']}"
+    assert report["elapsed"] < IMPORT_BUDGET_S
+
+
+def test_public_names_resolve_on_access():
+    report = _measure(
+        "import textforensics\n"
+        "assert textforensics.__version__\n"
+        "assert 'TextForensicsConfig' in dir(textforensics)\n"
+        "textforensics.TextForensicsConfig"
+    )
+    assert "torch" in report["heavy"]
@@ -0,0 +1,62 @@
+"""Length-bucketed batch inference"""
+
+import pytest
+import torch
+
+from textforensics.pipelines import InferencePipeline
+
+
+@pytest.fixture
+def pipeline(tiny_model_path):
+    return InferencePipeline.from_pretrained(tiny_model_path, batch_size=3)
+
+
+def _sequences(lengths):
+    return [[10 + i] * length for i, length in enumerate(lengths)]
+
+
+def test_batches_group_similar_lengths(pipeline):
+    lengths = [5, 17, 2, 9, 17, 4, 11, 3]
+    pipeline.max_tokens_per_batch = 40
+    batches = pipeline._make_batches(lengths)
+
+    assert sorted(i for batch in batches for i in batch) == list(range(len(lengths)))
+    order = [lengths[i] for batch in batches for i in batch]
+    assert order == sorted(lengths, reverse=True)
+    for batch in batches:
+        assert len(batch) <= 3
+        assert lengths[batch[0]] * len(batch) <= 40
+
+
+def test_run_bucketed_restores_input_order(pipeline):
+    lengths = [5, 17, 2, 9, 17, 4, 11, 3]
+    widths = []
+
+    def run_batch(input_ids, attention_mask):
+        widths.append((input_ids.shape[1], int(attention_mask.sum(1).max())))
+        return {
+            "length": attention_mask.sum(1),
+            "marker": input_ids[:, 0],
+            "pair": torch.stack([input_ids[:, 0], attention_mask.sum(1)], dim=1),
+        }
+
+    results = pipeline._run_bucketed(_sequences(lengths), run_batch)
+
+    assert results["length"].tolist() == lengths
+    assert results["marker"].tolist() == [10 + i for i in range(len(lengths))]
+    assert results["pair"].tolist() == [
+        [10 + i, length] for i, length in enumerate(lengths)
+    ]
+    # Each batch is padded to its own longest sequence only
+    assert len(widths) == 3
+    assert all(width == longest for width, longest in widths)
+
+
+def test_predict_matches_one_text_at_a_time(pipeline, texts):
+    batched = pipeline.predict(texts)
+
+    pipeline.batch_size = 1
+    for i, text in enumerate(texts):
+        single = pipeline.predict([text])
+        for name, value in single.items():
+            torch.testing.assert_close(batched[name][i], value[0], rtol=1e-4, atol=1e-5)
@@ -0,0 +1,88 @@
+"""IVF and product-quantization index"""
+
+import numpy as np
+
+from textforensics.index import IVFIndex, ProductQuantizer
+
+
+def _clustered(num_vectors: int = 400, dim: int = 16, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    centers = rng.standard_normal((8, dim))
+    labels = rng.integers(len(centers), size=num_vectors)
+    x = centers[labels] + 0.3 * rng.standard_normal((num_vectors, dim))
+    return x.astype(np.float32)
+
+
+def _exact_top_k(x: np.ndarray, queries: np.ndarray, k: int) -> np.ndarray:
+    x = x / np.linalg.norm(x, axis=1, keepdims=True)
+    q = queries / np.linalg.norm(queries, axis=1, keepdims=True)
+    return np.argsort(-(q @ x.T), axis=1)[:, :k]
+
+
+def test_exhaustive_search_is_exact():
+    x = _clustered()
+    index = IVFIndex(x.shape[1], nlist=8, nprobe=8)
+    index.train(x)
+    index.add(x)
+
+    scores, ids = index.search(x[:20], k=5)
+    np.testing.assert_array_equal(ids, _exact_top_k(x, x[:20], 5))
+    assert (np.diff(scores, axis=1) <= 0).all()
+
+
+def test_search_returns_custom_ids_and_pads():
+    x = _clustered(num_vectors=40)
+    index = IVFIndex(x.shape[1], nlist=4, nprobe=4)
+    index.train(x)
+    index.add(x[:3], ids=np.array([100, 200, 300]))
+
+    scores, ids = index.search(x[:2], k=5)
+    assert set(ids[0, :3]) == {100, 200, 300}
+    assert (ids[:, 3:] == -1).all()
+    assert np.isneginf(scores[:, 3:]).all()
+
+
+def test_pq_codes_approximate_vectors():
+    x = _clustered(num_vectors=1000)
+    pq = ProductQuantizer(x.shape[1], num_subvectors=4, nbits=6)
+    pq.train(x)
+    codes = pq.encode(x)
+
+    assert codes.shape == (len(x), 4) and codes.dtype == np.uint8
+    error = np.linalg.norm(pq.decode(codes) - x) / np.linalg.norm(x)
+    assert error < 0.3
+    table = pq.inner_product_table(x[0])
+    np.testing.assert_allclose(
+        pq.score(table, codes), pq.decode(codes) @ x[0], rtol=1e-4, atol=1e-4
+    )
+
+
+def test_pq_index_recall():
+    x = _clustered(num_vectors=1000)
+    index = IVFIndex(x.shape[1], nlist=8, nprobe=8, pq_subvectors=16, pq_nbits=6)
+    index.train(x)
+    index.add(x)
+
+    _, ids = index.search(x[:50], k=10)
+    exact = _exact_top_k(x, x[:50], 10)
+    recall = np.mean([len(set(a) & set(b)) / 10 for a, b in zip(ids, exact)])
+    assert recall > 0.75
+    assert (ids[:, 0] == np.arange(50)).mean() > 0.9
+
+
+def test_disk_index_round_trip_drops_uncommitted_rows(tmp_path):
+    x = _clustered()
+    index = IVFIndex(x.shape[1], nlist=8, nprobe=2, pq_subvectors=4, path=tmp_path)
+    index.train(x)
+    index.add(x[:300])
+    expected = index.search(x[:10], k=5)
+
+    # Rows appended without a metadata update, as after a crash mid-add
+    index._data.append(index._data.array[:5])
+    index._ids.append(np.arange(5, dtype=np.int64))
+    index._lists.append(index._lists.array[:5])
+
+    loaded = IVFIndex.load(tmp_path)
+    assert len(loaded) == 300
+    for got, want in zip(loaded.search(x[:10], k=5), expected):
+        np.testing.assert_array_equal(got, want)
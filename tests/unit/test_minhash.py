@@ -0,0 +1,85 @@
+"""MinHash LSH candidate generation"""
+
+import itertools
+
+import numpy as np
+import pytest
+
+from textforensics.index.minhash import MinHashLSH, shingle_hashes
+
+WORDS = [
+    "the", "night", "was", "dark", "and", "I", "could", "not", "tell",
+    "whether", "old", "house", "they", "had", "left", "behind", "watching",
+    "us", "from", "hill", "above", "silent", "river",
+]  # fmt: skip
+
+
+def _corpus(num_texts: int = 60, seed: int = 0) -> list:
+    """Random texts plus lightly edited copies of some of them"""
+    rng = np.random.default_rng(seed)
+    texts = [" ".join(rng.choice(WORDS, size=40)) for _ in range(num_texts)]
+    for i in range(0, num_texts, 6):
+        words = texts[i].split()
+        words[rng.integers(len(words))] = "raven"
+        texts.append(" ".join(words))
+    return texts
+
+
+def _brute_force_pairs(lsh: MinHashLSH) -> set:
+    keys = lsh.band_keys(lsh.signatures)
+    empty = lsh.is_empty(lsh.signatures)
+    return {
+        (i, j)
+        for i, j in itertools.combinations(range(len(lsh)), 2)
+        if not empty[i] and not empty[j] and (keys[i] == keys[j]).any()
+    }
+
+
+def test_candidate_pairs_match_brute_force_band_collisions():
+    lsh = MinHashLSH(num_perm=64, threshold=0.5, shingle_size=3)
+    texts = _corpus()
+    lsh.add(texts)
+
+    pairs, estimates = lsh.candidate_pairs()
+
+    assert {tuple(p) for p in pairs.tolist()} == _brute_force_pairs(lsh)
+    assert (pairs[:, 0] < pairs[:, 1]).all()
+    expected = (lsh.signatures[pairs[:, 0]] == lsh.signatures[pairs[:, 1]]).mean(1)
+    np.testing.assert_allclose(estimates, expected)
+    # Every edited copy is found next to its original
+    found = {tuple(p) for p in pairs.tolist()}
+    for copy, original in enumerate(range(0, 60, 6), start=60):
+        assert (original, copy) in found
+
+
+def test_min_jaccard_filters_estimates():
+    lsh = MinHashLSH(num_perm=64, threshold=0.3, shingle_size=3)
+    lsh.add(_corpus())
+    _, estimates = lsh.candidate_pairs()
+    kept, kept_estimates = lsh.candidate_pairs(min_jaccard=0.8)
+
+    assert (kept_estimates >= 0.8).all()
+    assert len(kept) == int((estimates >= 0.8).sum())
+
+
+def test_texts_without_shingles_never_collide():
+    lsh = MinHashLSH(num_perm=64, threshold=0.5, shingle_size=3)
+    texts = ["", "   ", "?!", "...", "\n\t"] * 20 + ["the old house on the hill"] * 2
+    lsh.add(texts)
+
+    pairs, _ = lsh.candidate_pairs()
+
+    assert lsh.is_empty(lsh.signatures).sum() == 100
+    assert pairs.tolist() == [[100, 101]]
+    ids, _ = lsh.query("")
+    assert len(ids) == 0
+    ids, _ = lsh.query("the old house on the hill")
+    assert ids.tolist() == [100, 101]
+
+
+@pytest.mark.parametrize("char_level", [False, True])
+def test_identical_texts_have_identical_signatures(char_level):
+    lsh = MinHashLSH(num_perm=32, char_level=char_level)
+    text = "It was the raven, croaking on the sill"
+    assert len(shingle_hashes(text, char_level=char_level)) > 0
+    np.testing.assert_array_equal(lsh.signature(text), lsh.signature(text.upper()))
@@ -0,0 +1,31 @@
+"""Dynamic int8 quantization"""
+
+import torch
+import torch.nn as nn
+
+from textforensics.models import TextForensicsUnifiedModel
+from textforensics.pipelines import InferencePipeline
+from textforensics.serving.quantization import quantize_dynamic_int8, serialized_size_mb
+
+
+def test_quantized_model_agrees_with_fp32(tiny_model_path, texts):
+    fp32 = InferencePipeline.from_pretrained(tiny_model_path)
+    int8 = InferencePipeline.from_pretrained(tiny_model_path, quantize=True)
+    expected, outputs = fp32.predict(texts), int8.predict(texts)
+
+    assert outputs.keys() == expected.keys()
+    # Embeddings are compared by direction, head outputs elementwise
+    for name in ["style_embeddings", "similarity_scoring_output"]:
+        similarity = torch.cosine_similarity(outputs.pop(name), expected.pop(name))
+        assert similarity.min() > 0.99, name
+    for name, value in expected.items():
+        torch.testing.assert_close(outputs[name], value, rtol=0.05, atol=0.01)
+
+
+def test_quantization_replaces_linear_layers_of_a_copy(tiny_model_path):
+    model = TextForensicsUnifiedModel.from_pretrained(tiny_model_path)
+    quantized = quantize_dynamic_int8(model)
+
+    assert not any(type(m) is nn.Linear for m in quantized.modules())
+    assert any(type(m) is nn.Linear for m in model.modules())
+    assert serialized_size_mb(quantized) < serialized_size_mb(model)
@@ -0,0 +1,131 @@
+"""Length-bucketed and task-grouped batch samplers"""
+
+import itertools
+
+import numpy as np
+import pytest
+
+from textforensics.data.sampling import LengthBucketBatchSampler, MultiTaskBatchSampler
+
+
+def _lengths(n: int = 103, seed: int = 0) -> np.ndarray:
+    return np.random.default_rng(seed).integers(1, 200, size=n)
+
+
+@pytest.mark.parametrize("shuffle", [True, False])
+@pytest.mark.parametrize("drop_last", [True, False])
+@pytest.mark.parametrize("n", [0, 7, 103])
+def test_len_matches_batches(shuffle, drop_last, n):
+    sampler = LengthBucketBatchSampler(
+        _lengths(n),
+        batch_size=8,
+        shuffle=shuffle,
+        drop_last=drop_last,
+        bucket_size_multiplier=3,
+    )
+    batches = list(sampler)
+
+    assert len(batches) == len(sampler)
+    indices = [i for batch in batches for i in batch]
+    assert len(indices) == len(set(indices))
+    if not drop_last:
+        assert sorted(indices) == list(range(n))
+    else:
+        assert all(len(batch) == 8 for batch in batches)
+
+
+def test_batches_are_length_homogeneous():
+    lengths = _lengths()
+    # One bucket holds the whole dataset, so batches tile the sorted lengths
+    sampler = LengthBucketBatchSampler(lengths, batch_size=8, bucket_size_multiplier=20)
+    ranges = sorted((lengths[b].min(), lengths[b].max()) for b in sampler)
+
+    for (_, high), (low, _) in itertools.pairwise(ranges):
+        assert high <= low
+
+
+def test_set_epoch_reshuffles_deterministically():
+    sampler = LengthBucketBatchSampler(
+        _lengths(), batch_size=8, bucket_size_multiplier=2
+    )
+    first = list(sampler)
+    assert list(sampler) == first
+
+    sampler.set_epoch(1)
+    assert list(sampler) != first
+
+
+@pytest.mark.parametrize("drop_last", [True, False])
+def test_ranks_get_equal_shares(drop_last):
+    lengths = _lengths()
+    shards = [
+        list(
+            LengthBucketBatchSampler(
+                lengths,
+                batch_size=8,
+                drop_last=drop_last,
+                bucket_size_multiplier=2,
+                num_replicas=3,
+                rank=rank,
+            )
+        )
+        for rank in range(3)
+    ]
+
+    assert len({len(shard) for shard in shards}) == 1
+    indices = [i for shard in shards for batch in shard for i in batch]
+    if drop_last:
+        assert len(indices) == len(set(indices))
+    else:
+        assert set(indices) == set(range(len(lengths)))
+
+
+def _task_samplers(sizes, **kwargs) -> dict:
+    return {
+        f"task{i}": LengthBucketBatchSampler(_lengths(size, seed=i), 8, **kwargs)
+        for i, size in enumerate(sizes)
+    }
+
+
+def _task_of(batch, sizes) -> int:
+    bounds = np.cumsum(sizes)
+    tasks = {int(np.searchsorted(bounds, i, side="right")) for i in batch}
+    assert len(tasks) == 1
+    return tasks.pop()
+
+
+def test_proportional_sampling_covers_every_task_once():
+    sizes = [80, 24, 40]
+    sampler = MultiTaskBatchSampler(_task_samplers(sizes), sizes)
+    batches = list(sampler)
+
+    assert len(batches) == len(sampler) == 10 + 3 + 5
+    counts = np.bincount([_task_of(b, sizes) for b in batches], minlength=3)
+    assert counts.tolist() == [10, 3, 5]
+    assert sorted(i for batch in batches for i in batch) == list(range(sum(sizes)))
+
+
+def test_temperature_sampling_revisits_small_tasks():
+    sizes = [400, 16]
+    samplers = _task_samplers(sizes)
+    sampler = MultiTaskBatchSampler(
+        samplers, sizes, method="temperature", temperature=100.0, num_batches=60
+    )
+    tasks = [_task_of(b, sizes) for b in sampler]
+
+    assert len(tasks) == 60
+    # Flattened towards uniform, so the 2-batch task is drawn many times
+    assert tasks.count(1) > 10
+    np.testing.assert_allclose(sampler.probabilities, [0.5, 0.5], atol=0.02)
+
+
+def test_ranks_follow_the_same_task_sequence():
+    sizes = [80, 24, 40]
+    sequences = []
+    for rank in range(2):
+        samplers = _task_samplers(sizes, num_replicas=2, rank=rank)
+        sampler = MultiTaskBatchSampler(samplers, sizes, method="temperature")
+        sampler.set_epoch(3)
+        sequences.append([_task_of(b, sizes) for b in sampler])
+
+    assert sequences[0] == sequences[1]
@@ -0,0 +1,64 @@
+"""Blocked all-pairs similarity"""
+
+import numpy as np
+import pytest
+
+from textforensics.index.similarity import SimilarityEngine, SimilarityResult
+
+
+def _brute_force(x: np.ndarray, metric: str, temperature: float) -> np.ndarray:
+    if metric == "cosine":
+        x = x / np.linalg.norm(x, axis=1, keepdims=True)
+    return (x @ x.T) / temperature
+
+
+@pytest.mark.parametrize("metric", ["cosine", "dot"])
+def test_all_pairs_matches_brute_force(metric):
+    x = np.random.default_rng(0).standard_normal((53, 16)).astype(np.float32)
+    threshold, temperature, k = 0.2, 0.5, 5
+    engine = SimilarityEngine(
+        metric=metric, temperature=temperature, block_size=8, num_workers=2
+    )
+    result = engine.all_pairs(x, k=k, threshold=threshold)
+
+    scores = _brute_force(x, metric, temperature)
+    np.fill_diagonal(scores, -np.inf)
+    expected_ids = np.argsort(-scores, axis=1, kind="stable")[:, :k]
+    np.testing.assert_array_equal(result.topk_ids, expected_ids)
+    np.testing.assert_allclose(
+        result.topk_scores,
+        np.take_along_axis(scores, expected_ids, axis=1),
+        rtol=1e-5,
+        atol=1e-5,
+    )
+
+    rows, cols = np.nonzero(np.triu(scores * temperature >= threshold, k=1))
+    assert sorted(map(tuple, result.pairs.tolist())) == list(zip(rows, cols))
+    order = np.lexsort((result.pairs[:, 1], result.pairs[:, 0]))
+    np.testing.assert_allclose(
+        result.pair_scores[order], scores[rows, cols], rtol=1e-5, atol=1e-5
+    )
+
+
+def test_all_pairs_pads_short_rows():
+    x = np.random.default_rng(1).standard_normal((4, 8)).astype(np.float32)
+    result = SimilarityEngine(block_size=3).all_pairs(x, k=6)
+
+    assert result.topk_ids.shape == (4, 6)
+    assert (result.topk_ids[:, 3:] == -1).all()
+    assert np.isneginf(result.topk_scores[:, 3:]).all()
+    for row, ids in enumerate(result.topk_ids[:, :3]):
+        assert sorted(ids) == [i for i in range(4) if i != row]
+
+
+def test_all_pairs_written_to_disk_matches_memory(tmp_path):
+    x = np.random.default_rng(2).standard_normal((30, 8)).astype(np.float32)
+    engine = SimilarityEngine(block_size=7)
+    in_memory = engine.all_pairs(x, k=4, threshold=0.1)
+    engine.all_pairs(x, k=4, threshold=0.1, output=tmp_path)
+    loaded = SimilarityResult.load(tmp_path)
+
+    np.testing.assert_array_equal(loaded.topk_ids, in_memory.topk_ids)
+    np.testing.assert_array_equal(loaded.topk_scores, in_memory.topk_scores)
+    np.testing.assert_array_equal(loaded.pairs, in_memory.pairs)
+    np.testing.assert_array_equal(loaded.pair_scores, in_memory.pair_scores)
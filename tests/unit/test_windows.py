@@ -0,0 +1,33 @@
+"""Sliding-window splitting of long documents"""
+
+import pytest
+
+from textforensics.models.windows import sliding_windows
+
+CLS, SEP = 101, 102
+
+
+def _document(num_tokens: int) -> list:
+    return [CLS, *range(1000, 1000 + num_tokens), SEP]
+
+
+@pytest.mark.parametrize("stride", [1, 3, 7, 8])
+@pytest.mark.parametrize("num_tokens", [1, 8, 9, 50])
+def test_windows_cover_every_token(num_tokens, stride):
+    document = _document(num_tokens)
+    windows = sliding_windows(document, window_size=10, stride=stride)
+
+    assert all(len(w) <= 10 and w[0] == CLS and w[-1] == SEP for w in windows)
+    covered = {token for window in windows for token in window[1:-1]}
+    assert covered == set(document[1:-1])
+
+
+def test_last_window_is_aligned_to_the_end():
+    windows = sliding_windows(_document(50), window_size=10, stride=8)
+
+    assert [w[1] - 1000 for w in windows] == [0, 8, 16, 24, 32, 40, 42]
+
+
+def test_stride_beyond_window_is_rejected():
+    with pytest.raises(ValueError, match="skip tokens"):
+        sliding_windows(_document(50), window_size=10, stride=9)